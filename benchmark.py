@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Performance benchmark for GSE Detection v11
+机场GSE检测 v11 性能基准测试
+
+Runs on synthetic frames and generated clips only, so it needs nothing but the
+weights. Results are written as JSON and can be compared against a stored
+baseline to catch regressions before rolling out new weights.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.backends import load_model
+from utils.evaluation import latency_summary
+from utils.hashing import file_digest
+from utils.mot_io import MOTWriter
+import config
+
+
+def parse_resolution(text: str):
+    """Parse 'WIDTHxHEIGHT' into (width, height)"""
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected WIDTHxHEIGHT, got '{text}'")
+    return width, height
+
+
+def synthetic_frame(width: int, height: int, seed: int = 0, t: int = 0):
+    """
+    Draw an apron-like test frame: textured ground plus vehicle-sized blocks
+
+    Args:
+        width: Frame width
+        height: Frame height
+        seed: Scene layout seed
+        t: Time step; blocks drift with t so consecutive frames form a clip
+
+    Returns:
+        BGR uint8 image
+    """
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width, 3), 110, dtype=np.uint8)
+    frame += rng.integers(0, 25, (height, width, 1), dtype=np.uint8)
+
+    for i in range(12):
+        w = int(rng.uniform(0.03, 0.15) * width)
+        h = int(rng.uniform(0.03, 0.12) * height)
+        x = int((rng.uniform(0, 1) * width + t * (i % 5 - 2) * 3) % max(1, width - w))
+        y = int((rng.uniform(0, 1) * height + t * (i % 3 - 1) * 2) % max(1, height - h))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, -1)
+    return frame
+
+
+def synthetic_clip(width: int, height: int, frames: int, seed: int = 0):
+    """Consecutive synthetic frames with moving blocks"""
+    return [synthetic_frame(width, height, seed, t) for t in range(frames)]
+
+
+def _metric(value, unit: str, better: str = None):
+    # better: 'lower', 'higher', or None for informational metrics not compared
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+# Command-line entry points whose startup (imports + argparse) is timed
+ENTRY_POINTS = ('save_tracks.py', 'gen_draft_gt.py', 'quick_demo.py', 'quantize.py')
+
+
+def bench_startup(repeats: int = 3):
+    """Time `<script> --help` in a fresh interpreter (best of N runs)"""
+    root = Path(__file__).parent
+    metrics = {}
+    for script in ENTRY_POINTS:
+        seconds = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(root / script), '--help'], cwd=root,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            seconds.append(time.perf_counter() - start)
+        metrics[f'startup.{Path(script).stem}_s'] = _metric(min(seconds), 's', 'lower')
+    return metrics
+
+
+def bench_load(model_path: str, backend: str, precision: str):
+    """Time model construction and the first (warm-up) inference"""
+    start = time.perf_counter()
+    model = load_model(model_path, backend, precision=precision)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model(synthetic_frame(640, 360), imgsz=config.INPUT_SIZE, verbose=False)
+    first_s = time.perf_counter() - start
+
+    return model, {
+        'load.model_s': _metric(load_s, 's', 'lower'),
+        'load.first_inference_s': _metric(first_s, 's', 'lower'),
+    }
+
+
+def bench_latency(model, resolution, frames: int, warmup: int):
+    """Per-frame preprocess / inference / postprocess latency from Results.speed"""
+    width, height = resolution
+    clip = synthetic_clip(width, height, frames + warmup)
+    stages = {'preprocess': [], 'inference': [], 'postprocess': [], 'total': []}
+
+    for i, frame in enumerate(clip):
+        start = time.perf_counter()
+        result = model(frame, imgsz=config.INPUT_SIZE, verbose=False)[0]
+        total = time.perf_counter() - start
+        if i < warmup:
+            continue
+        for stage in ('preprocess', 'inference', 'postprocess'):
+            stages[stage].append(result.speed[stage] / 1000)
+        stages['total'].append(total)
+
+    metrics = {}
+    for stage, seconds in stages.items():
+        summary = latency_summary(seconds)
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            metrics[f'latency.{width}x{height}.{stage}.{key}'] = _metric(summary[key], 'ms', 'lower')
+    return metrics
+
+
+def bench_throughput(model, resolution, batch_size: int, frames: int, warmup: int):
+    """Frames per second with batch_size frames stacked into each forward pass"""
+    width, height = resolution
+    clip = synthetic_clip(width, height, batch_size)
+    iterations = max(2, frames // batch_size)
+
+    for _ in range(warmup):
+        model(clip, imgsz=config.INPUT_SIZE, verbose=False)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        model(clip, imgsz=config.INPUT_SIZE, verbose=False)
+    elapsed = time.perf_counter() - start
+
+    fps = batch_size * iterations / elapsed
+    return {f'throughput.{width}x{height}.batch{batch_size}.fps': _metric(fps, 'fps', 'higher')}
+
+
+def bench_tracking(model, resolution, frames: int, warmup: int):
+    """Per-frame cost of model.track (ByteTrack) over plain prediction on the same clip"""
+    width, height = resolution
+    clip = synthetic_clip(width, height, frames + warmup, seed=1)
+
+    def run(call):
+        seconds = []
+        for i, frame in enumerate(clip):
+            start = time.perf_counter()
+            call(frame)
+            if i >= warmup:
+                seconds.append(time.perf_counter() - start)
+        return np.mean(seconds)
+
+    predict_s = run(lambda f: model.predict(f, imgsz=config.INPUT_SIZE, conf=0.1, verbose=False))
+    track_s = run(lambda f: model.track(f, imgsz=config.INPUT_SIZE, conf=0.1, persist=True,
+                                        tracker="bytetrack.yaml", verbose=False))
+
+    return {
+        f'tracking.{width}x{height}.predict_ms': _metric(predict_s * 1000, 'ms', 'lower'),
+        f'tracking.{width}x{height}.track_ms': _metric(track_s * 1000, 'ms', 'lower'),
+        # Difference of two noisy means: reported, but compared through track_ms
+        f'tracking.{width}x{height}.overhead_ms': _metric((track_s - predict_s) * 1000, 'ms'),
+    }
+
+
+def bench_mot_write(rows: int, rows_per_frame: int = 50):
+    """MOT Challenge write throughput through MOTWriter"""
+    rng = np.random.default_rng(0)
+    frames = max(1, rows // rows_per_frame)
+    xywh = rng.uniform(0, 1000, (rows_per_frame, 4))
+    ids = np.arange(1, rows_per_frame + 1, dtype=np.int32)
+    conf = rng.uniform(0.1, 1, rows_per_frame)
+    cls = rng.integers(0, 4, rows_per_frame)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "bench_mot.txt"
+        start = time.perf_counter()
+        with MOTWriter(path) as writer:
+            for frame_idx in range(1, frames + 1):
+                writer.write_frame(frame_idx, xywh, ids, conf, cls)
+        elapsed = time.perf_counter() - start
+        size_mb = path.stat().st_size / 1e6
+
+    return {
+        'mot_write.rows_per_s': _metric(frames * rows_per_frame / elapsed, 'rows/s', 'higher'),
+        'mot_write.mb_per_s': _metric(size_mb / elapsed, 'MB/s', 'higher'),
+    }
+
+
+def environment(model_path: str, backend: str, precision: str):
+    """Describe the machine and software so reports can be compared fairly"""
+    import torch
+    import ultralytics
+
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'torch': torch.__version__,
+        'ultralytics': ultralytics.__version__,
+        'cuda': torch.cuda.is_available(),
+        'model': str(model_path),
+        'model_sha256': file_digest(model_path),
+        'backend': backend,
+        'precision': precision,
+        'input_size': config.INPUT_SIZE,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """
+    Compare metrics with a baseline report
+
+    Args:
+        results: Current report
+        baseline: Stored report
+        threshold: Relative change counted as a regression (0.1 = 10%)
+
+    Returns:
+        List of (name, baseline value, current value, relative change, regressed)
+        for metrics present in both reports
+    """
+    rows = []
+    for name, metric in results['metrics'].items():
+        base = baseline.get('metrics', {}).get(name)
+        if (metric['better'] is None or base is None or metric['value'] is None
+                or base['value'] in (None, 0)):
+            continue
+        change = (metric['value'] - base['value']) / abs(base['value'])
+        worse = change if metric['better'] == 'lower' else -change
+        rows.append((name, base['value'], metric['value'], change, worse > threshold))
+    return rows
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="GSE Detection v11 - Performance Benchmark",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmark.py --output bench.json
+  python benchmark.py --resolutions 1280x720 3840x2160 --batch-sizes 1 8
+  python benchmark.py --model weights/new.pt --baseline bench.json --threshold 0.1
+  python benchmark.py --backend onnx --output bench_onnx.json
+        """
+    )
+
+    parser.add_argument('--model', '-m', type=str, default=config.MODEL_PATH,
+                        help=f'Model weights (default: {config.MODEL_PATH})')
+    parser.add_argument('--backend', choices=['torch', 'onnx', 'openvino'], default=None,
+                        help=f'Inference backend (default: {config.BACKEND})')
+    parser.add_argument('--precision', choices=['fp32', 'int8'], default=None,
+                        help=f'Numeric precision (default: {config.PRECISION})')
+    parser.add_argument('--resolutions', type=parse_resolution, nargs='+',
+                        default=[(640, 360), (1280, 720), (1920, 1080)],
+                        help='Frame sizes as WIDTHxHEIGHT (default: 640x360 1280x720 1920x1080)')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4, 8],
+                        help='Batch sizes for the throughput test (default: 1 4 8)')
+    parser.add_argument('--frames', type=int, default=30,
+                        help='Measured frames per latency/throughput test (default: 30)')
+    parser.add_argument('--warmup', type=int, default=3,
+                        help='Unmeasured warm-up runs per test (default: 3)')
+    parser.add_argument('--track-frames', type=int, default=60,
+                        help='Clip length for the tracking overhead test (default: 60)')
+    parser.add_argument('--mot-rows', type=int, default=500000,
+                        help='Rows written in the MOT write test (default: 500000)')
+    parser.add_argument('--output', '-o', type=str, default=None,
+                        help='Write results as JSON to this path')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Baseline JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=config.BENCHMARK_REGRESSION_THRESHOLD,
+                        help=f'Relative slowdown counted as a regression '
+                             f'(default: {config.BENCHMARK_REGRESSION_THRESHOLD})')
+
+    args = parser.parse_args()
+
+    if args.frames < 1 or args.track_frames < 1 or args.warmup < 0:
+        parser.error("--frames and --track-frames must be >= 1, --warmup >= 0")
+    if any(b < 1 for b in args.batch_sizes):
+        parser.error("--batch-sizes must all be >= 1")
+
+    backend = args.backend or ("onnx" if args.precision == "int8" else config.BACKEND)
+    precision = args.precision or config.PRECISION
+
+    print(f"\n{'='*70}")
+    print(f"GSE Detection v11 - Benchmark ({backend}, {precision})")
+    print(f"{'='*70}\n")
+
+    metrics = {}
+
+    print("⏱️  CLI startup...")
+    metrics.update(bench_startup())
+
+    print("⏱️  Model load...")
+    model, load_metrics = bench_load(args.model, backend, precision)
+    metrics.update(load_metrics)
+
+    for resolution in args.resolutions:
+        print(f"⏱️  Latency {resolution[0]}x{resolution[1]}...")
+        metrics.update(bench_latency(model, resolution, args.frames, args.warmup))
+        for batch_size in args.batch_sizes:
+            print(f"⏱️  Throughput {resolution[0]}x{resolution[1]} batch {batch_size}...")
+            metrics.update(bench_throughput(model, resolution, batch_size, args.frames, args.warmup))
+
+    print(f"⏱️  Tracking overhead...")
+    metrics.update(bench_tracking(model, args.resolutions[0], args.track_frames, args.warmup))
+
+    print(f"⏱️  MOT write...")
+    metrics.update(bench_mot_write(args.mot_rows))
+
+    results = {'environment': environment(args.model, backend, precision), 'metrics': metrics}
+
+    print(f"\n📊 Results:")
+    for name, metric in metrics.items():
+        print(f"   {name:<52} {metric['value']:>12.2f} {metric['unit']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Saved to: {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.threshold)
+    regressions = [row for row in rows if row[4]]
+
+    print(f"\n📈 Compared with {args.baseline} ({len(rows)} metrics, threshold {args.threshold:.0%}):")
+    base_env = baseline.get('environment', {})
+    if base_env.get('processor') != results['environment']['processor']:
+        print(f"   ⚠️  Baseline was recorded on a different CPU ({base_env.get('processor')})")
+    for name, base, current, change, regressed in rows:
+        marker = "❌" if regressed else "  "
+        print(f"   {marker} {name:<52} {base:>10.2f} → {current:>10.2f} ({change:+.1%})")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
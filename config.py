@@ -10,7 +10,8 @@ GSE Detection v11 Model Configuration
 # Model path
 MODEL_PATH = "weights/gse_detection_v11.pt"
 
-# Input size for inference
+# Input size of exported models (ONNX/OpenVINO/INT8) and benchmarks; PyTorch
+# inference runs at the model's own size unless imgsz is passed explicitly
 INPUT_SIZE = 1280
 
 # Confidence threshold
@@ -19,6 +20,33 @@ CONFIDENCE_THRESHOLD = 0.25
 # IoU threshold for NMS
 IOU_THRESHOLD = 0.45
 
+# Run one blank inference right after loading a model, so the first real
+# frame does not pay for buffer allocation and layer fusion
+MODEL_WARMUP = False
+
+# ============================================================================
+# Backend Configuration
+# ============================================================================
+
+# Inference backend: "torch" (eager PyTorch), "onnx" (onnxruntime) or
+# "openvino" (OpenVINO IR). Non-torch backends export MODEL_PATH once and
+# cache the result next to the weights, keyed by a hash of the weights.
+BACKEND = "torch"
+
+# Export with dynamic input shapes (needed for varying batch or tile sizes
+# without letterboxing to INPUT_SIZE)
+EXPORT_DYNAMIC = False
+
+# Numeric precision: "fp32" or "int8" (INT8 runs on the onnx backend and is
+# built by quantize.py from calibration frames)
+PRECISION = "fp32"
+
+# Folder of representative apron frames used to calibrate INT8 activations
+CALIBRATION_DIR = "data/calibration"
+
+# Maximum calibration images (evenly subsampled from CALIBRATION_DIR)
+CALIBRATION_MAX_IMAGES = 300
+
 # ============================================================================
 # Class Configuration
 # ============================================================================
@@ -61,12 +89,173 @@ DEVICE = None  # Auto-detect optimal device
 # Tracking Configuration (Optional)
 # ============================================================================
 
-# ByteTrack parameters
+# ByteTrack parameters of the built-in tracker (utils/bytetrack.py, selected with
+# --tracker native; the ultralytics trackers read their own YAML configs)
 TRACK_THRESH = 0.45
 TRACK_BUFFER = 30
 MATCH_THRESH = 0.8
 FRAME_RATE = 30
 
+# ============================================================================
+# ROI / Tiled Inference Configuration
+# ============================================================================
+
+# Region of interest per camera: camera name -> list of polygons, each a list of
+# (x, y) vertices normalized to [0, 1] so they hold at any stream resolution.
+# Detections whose box center falls outside every polygon are discarded.
+# Example:
+#   CAMERA_ROIS = {
+#       "stand_12": [[(0.30, 0.45), (0.85, 0.45), (0.95, 1.0), (0.20, 1.0)]],
+#   }
+CAMERA_ROIS = {}
+
+# Tile edge length in pixels for tiled inference (each tile runs at this size)
+TILE_SIZE = 1280
+
+# Overlap between neighboring tiles as a fraction of TILE_SIZE
+TILE_OVERLAP = 0.2
+
+# ============================================================================
+# Motion Gating Configuration
+# ============================================================================
+
+# Fraction of changed thumbnail pixels that triggers a new inference
+MOTION_GATE_THRESHOLD = 0.002
+
+# Gray-level difference (0-255) for a thumbnail pixel to count as changed
+MOTION_GATE_PIXEL_DELTA = 25
+
+# Width of the grayscale thumbnail used for frame differencing
+MOTION_GATE_WIDTH = 160
+
+# Maximum consecutive frames without inference before one is forced
+MOTION_GATE_MAX_SKIP = 30
+
+# ============================================================================
+# Input Discovery Configuration
+# ============================================================================
+
+# Video file extensions searched by the batch scripts (matched in any case)
+VIDEO_EXTENSIONS = (".webm", ".mp4", ".avi", ".mov")
+
+# Cached directory listings (per directory: mtime, video files, subdirectories),
+# so reruns only re-list directories that changed. Empty string disables it.
+DISCOVERY_CACHE = "data/discovery_cache.json"
+
+# Content hashes of videos keyed by path, size and mtime, shared by the
+# output-directory manifests and the detection cache so that each video is
+# read once. Empty string keeps them in memory only.
+CONTENT_HASH_INDEX = "data/content_hashes.jsonl"
+
+# ============================================================================
+# Video Decode Configuration
+# ============================================================================
+
+# Decoder: "opencv" (cv2.VideoCapture), "pyav" (PyAV/FFmpeg with threaded
+# codec decoding, pip install av) or "auto" (pyav when installed)
+DECODE_BACKEND = "opencv"
+
+# Ask OpenCV's FFmpeg backend for hardware decoding (VAAPI/D3D11/...);
+# falls back to software decoding when no device is available
+DECODE_HW_ACCEL = False
+
+# PyAV codec threads (0: let FFmpeg choose)
+DECODE_THREADS = 0
+
+# Preallocated frame buffers reused by the OpenCV decoder (a decoded frame
+# stays valid for this many further reads)
+DECODE_POOL_SIZE = 4
+
+# Video metadata index (resolution, fps, frame count keyed by path, size and
+# mtime). Frame counts are replaced by the decoded count after a full pass,
+# since container headers (.webm) are often wrong. Empty string disables it.
+VIDEO_META_CACHE = "data/video_meta.jsonl"
+
+# ============================================================================
+# Detection Cache Configuration
+# ============================================================================
+# Per-video detections kept by save_tracks.py / gen_draft_gt.py, keyed by video
+# content hash, weights hash and input size. Reruns with another --conf or
+# --tracker replay them instead of decoding and running the model.
+# Empty string disables the cache.
+DETECTION_CACHE_DIR = "data/det_cache"
+# Confidence the model runs at while recording; replay serves any --conf at or above it
+DETECTION_CACHE_CONF = 0.05
+
+# ============================================================================
+# Output Configuration
+# ============================================================================
+
+# MOT annotation lines buffered in memory before each write to disk
+MOT_FLUSH_LINES = 10000
+
+# Frames per chunk in the columnar track store (*.tracks directories)
+TRACK_CHUNK_FRAMES = 1000
+
+# Frames between tracking checkpoints in save_tracks.py (0 disables)
+CHECKPOINT_INTERVAL = 1000
+
+# Manifest written to each output directory by batch runs: per video the
+# content hash, weights hash, conf threshold and tracker config of its
+# outputs, so reruns only process new or changed videos
+MANIFEST_NAME = ".gse_manifest.json"
+
+# ============================================================================
+# Metrics Configuration
+# ============================================================================
+
+# Prefix of exported Prometheus metric names (e.g. gse_stage_seconds_sum)
+METRICS_PREFIX = "gse"
+
+# ============================================================================
+# Inference Server Configuration
+# ============================================================================
+
+# serve.py HTTP address (localhost only; the API has no authentication)
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+
+# Dynamic batching: concurrent requests are stacked into one forward pass of
+# at most SERVE_MAX_BATCH frames, waiting up to SERVE_MAX_WAIT_MS after the
+# first frame for others to arrive
+SERVE_MAX_BATCH = 8
+SERVE_MAX_WAIT_MS = 10
+
+# Multi-camera streams (AsyncGSEDetector.stream): decoded frames buffered per
+# stream before inference; when the buffer is full the oldest frame is dropped
+STREAM_QUEUE_SIZE = 1
+
+# Frames older than this when their turn for inference comes are dropped, so a
+# stream that falls behind catches up instead of accumulating lag (0 disables)
+STREAM_MAX_LAG_MS = 500
+
+# ============================================================================
+# Live Stream Configuration
+# ============================================================================
+
+# Capture-to-result latency the live mode reports as exceeded. Latency is one
+# inference plus up to one frame interval; skipping frames cannot lower it
+LIVE_TARGET_LATENCY_MS = 500
+
+# Upper bound for the inference stride (frames arriving during one inference)
+LIVE_MAX_STRIDE = 10
+
+# Seconds without a frame before a live source counts as stalled and is reopened
+LIVE_STALL_TIMEOUT = 10.0
+
+# Seconds to wait between reconnect attempts
+LIVE_RECONNECT_DELAY = 2.0
+
+# Reconnect attempts in a row before giving up (0: retry forever)
+LIVE_MAX_RECONNECTS = 0
+
+# ============================================================================
+# Benchmark Configuration
+# ============================================================================
+
+# Relative slowdown against a baseline report that benchmark.py flags as a regression
+BENCHMARK_REGRESSION_THRESHOLD = 0.10
+
 # ============================================================================
 # Calibration Configuration (Optional)
 # ============================================================================
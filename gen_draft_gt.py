@@ -9,15 +9,26 @@
     python gen_draft_gt.py --video H:/GSE论文资料/实验/video_data/video.webm
 """
 
-import cv2
 import sys
+import time
 import argparse
-import os
+from contextlib import nullcontext
 from pathlib import Path
 from tqdm import tqdm
 
-from ultralytics import YOLO
 import config
+from utils.det_cache import DetectionRecorder, default_cache as default_det_cache, model_input_size
+from utils.discovery import find_videos
+from utils.instrumentation import METRICS, JsonlLog, configure as configure_metrics, video_record
+from utils.manifest import STATUS_LABELS_CN, Manifest, plan_videos, run_params
+from utils.model_registry import get_model
+from utils.mot_io import MOTWriter
+from utils.motion import MotionGate
+from utils.parallel import run_sharded, default_threads_per_worker
+from utils.track_store import TrackStoreWriter
+from utils.video_io import open_video
+from utils.video_meta import probe_video, record_frame_count
+from utils.tracking import FrameTracker
 
 
 class DraftGTGenerator:
@@ -26,23 +37,47 @@ class DraftGTGenerator:
     基于 YOLOv11 + ByteTrack 生成 MOT Challenge 格式的标注文件
     """
     
-    # MOT Challenge 标注格式
-    MOT_FORMAT = "{frame_idx},{track_id},{x1:.2f},{y1:.2f},{w:.2f},{h:.2f},{conf:.2f},{class_id},{dummy1},{dummy2}\n"
-    
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, progress=True, columnar=False, motion_gate=False,
+                 metrics_log=None, metrics_file=None, tracker="bytetrack.yaml", det_cache=True,
+                 classes=None):
         """
         初始化生成器
         
         Args:
             model_path: 模型路径，默认使用 config.MODEL_PATH
+            progress: 是否显示逐帧进度条 (多进程模式下关闭)
+            columnar: 是否同时输出列式二进制轨迹 (<标注文件名>.tracks 目录)
+            motion_gate: 画面静止时跳过推理，沿用上一帧的轨迹
+            metrics_log: 每个视频的分阶段耗时 JSON-lines 日志路径 (需启用 instrumentation)
+            metrics_file: 每个视频处理完后写入的 Prometheus 文本文件路径
+            tracker: 追踪器，ultralytics 配置 (bytetrack.yaml 等) 或 "native"
+                (utils/bytetrack.py 向量化 ByteTrack，参数取自 config.TRACK_*)
+            det_cache: 使用检测缓存 (config.DETECTION_CACHE_DIR)，同一视频/权重重跑时
+                不再推理，只按新的置信度阈值和追踪器重放缓存的检测框
+            classes: 只检测/追踪这些类别 ID (None 表示全部)；其他类别在推理内部
+                (NMS 之前) 即被排除
         """
         self.model_path = model_path or config.MODEL_PATH
+        self.progress = progress
+        self.columnar = columnar
+        self.motion_gate = motion_gate
+        self.tracker_cfg = tracker
+        self.det_cache = default_det_cache() if det_cache else None
+        self.classes = classes
+        self.metrics_log = JsonlLog(metrics_log) if metrics_log else None
+        self.metrics_file = metrics_file
+        
+        # 最近一次 process_video 的统计信息 (帧数, 检测数, 实际推理帧数, 分阶段耗时)
+        self.last_stats = {'frames': 0, 'detections': 0, 'inferred': 0, 'metrics': None}
         print(f"📦 加载模型: {self.model_path}")
-        self.model = YOLO(self.model_path)
+        # 同一进程内相同权重只加载一次 (ultralytics/torch 也在此时才导入)
+        self.model = get_model(self.model_path, backend="torch", precision="fp32")
         print(f"✅ 模型加载成功")
         
         # 类别映射
         self.class_names = self.model.names
+        # 推理尺寸 (检测缓存键的一部分)
+        self.imgsz = model_input_size(self.model)
         print(f"📊 检测类别: {list(self.class_names.values())}")
     
     def process_video(self, video_path, output_path=None, conf_threshold=0.1):
@@ -75,17 +110,15 @@ class DraftGTGenerator:
         print(f"📍 输入路径: {video_path}")
         print(f"📍 输出路径: {output_path}")
         
-        # 打开视频获取帧数和视频属性
-        cap = cv2.VideoCapture(str(video_path))
-        if not cap.isOpened():
+        # 打开视频获取帧数和视频属性 (解码器见 config.DECODE_BACKEND，帧缓冲循环复用)
+        try:
+            cap = open_video(video_path)
+        except IOError:
             print(f"❌ 错误: 无法打开视频: {video_path}")
             return None
         
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        cap.release()
+        # 元信息优先取自缓存 (config.VIDEO_META_CACHE)；帧数在完整解码一遍后校正为实际帧数
+        width, height, fps, total_frames, _ = probe_video(video_path, cap)
         
         print(f"📊 视频信息: {width}x{height}, {fps:.1f}fps, {total_frames} 帧")
         
@@ -94,67 +127,100 @@ class DraftGTGenerator:
         
         tracked_count = 0
         frame_count = 0
+        metrics_start = METRICS.snapshot()
+        start_time = time.perf_counter()
         
-        with open(output_path, 'w') as f:
-            # 使用 model.track() 进行推理和追踪
-            # persist=True: 保持追踪 ID
-            # tracker="bytetrack.yaml": 使用 ByteTrack
-            # conf: 置信度阈值 (降低以减少漏检)
-            results = self.model.track(
-                source=str(video_path),
-                tracker="bytetrack.yaml",
-                persist=True,
-                conf=conf_threshold,
-                stream=True,
-                verbose=False
-            )
-            
+        # 检测缓存: 命中时不解码、不推理，直接按当前阈值重放缓存的检测框 (换 --conf 对比漏检时免推理)；
+        # 未命中时以 config.DETECTION_CACHE_CONF 推理并记录 (运动门控不记录)
+        cached = recorder = None
+        if (self.det_cache is not None and not self.motion_gate
+                and conf_threshold >= self.det_cache.conf_floor):
+            cached = self.det_cache.load(video_path, self.model_path, self.imgsz, conf_threshold,
+                                         self.classes)
+            if cached is not None:
+                cap.release()
+                cap = cached.reader()
+                print(f"⚡ 检测缓存命中 ({len(cached)} 个检测框)，跳过解码和推理")
+            else:
+                recorder = DetectionRecorder(self.det_cache.conf_floor)
+        
+        # 逐帧推理 + ByteTrack 关联 (与 model.track(persist=True) 结果一致)
+        # conf: 置信度阈值 (降低以减少漏检)
+        gate = MotionGate() if self.motion_gate else None
+        tracker = FrameTracker(self.model, conf_threshold, tracker_cfg=self.tracker_cfg, gate=gate,
+                               detections=cached, recorder=recorder, classes=self.classes)
+        
+        # 可选: 同时输出列式二进制轨迹 (<输出文件名>.tracks 目录)
+        store_writer = (TrackStoreWriter(Path(output_path).with_suffix('.tracks'))
+                        if self.columnar else nullcontext())
+        
+        with MOTWriter(output_path) as writer, store_writer as store:
             # 使用进度条处理每一帧
-            for frame_idx, r in enumerate(tqdm(results, total=total_frames, desc="处理帧")):
-                frame_count += 1
+            pbar = tqdm(total=total_frames, desc="处理帧", disable=not self.progress)
+            while True:
+                with METRICS.timer('decode'):
+                    ret, frame = cap.read()
+                if not ret:
+                    break
+                
+                tracks = tracker.update(frame)
+                frame_count += 1  # frame_count 即 MOT 帧号 (从 1 开始)
+                METRICS.count('frames')
+                pbar.update(1)
                 
-                # 检查是否有检测结果和追踪 ID
-                if r.boxes is not None and r.boxes.id is not None:
-                    # 提取检测信息
-                    boxes = r.boxes.xywh.cpu().numpy()  # 中心坐标 (xc, yc, w, h)
-                    track_ids = r.boxes.id.int().cpu().numpy()
-                    confidences = r.boxes.conf.cpu().numpy()
-                    class_ids = r.boxes.cls.int().cpu().numpy()
+                # 检查是否有追踪结果
+                if tracks is not None:
+                    boxes, track_ids, confidences, class_ids = tracks  # boxes 为中心坐标 (xc, yc, w, h)
                     
-                    # 逐个目标写入标注
-                    for box, track_id, conf, class_id in zip(boxes, track_ids, confidences, class_ids):
-                        # 提取坐标和尺寸
-                        x_center, y_center, w, h = box
-                        
-                        # 转换为左上角坐标 (MOT 标准)
-                        x1 = x_center - w / 2
-                        y1 = y_center - h / 2
-                        
-                        # 写入 MOT Challenge 格式
-                        # frame_idx 从 1 开始计数 (MOT 标准)
-                        line = self.MOT_FORMAT.format(
-                            frame_idx=frame_idx + 1,      # 帧号 (从 1 开始)
-                            track_id=int(track_id),        # 追踪 ID
-                            x1=x1,                         # 左上角 x
-                            y1=y1,                         # 左上角 y
-                            w=w,                           # 宽度
-                            h=h,                           # 高度
-                            conf=conf,                     # 置信度
-                            class_id=int(class_id),        # 类别 ID
-                            dummy1=-1,                     # MOT 标准占位符
-                            dummy2=-1                      # MOT 标准占位符
+                    # 整帧写入 MOT Challenge 格式 (中心坐标在写入时转换为左上角坐标)
+                    with METRICS.timer('writing'):
+                        written = writer.write_frame(
+                            frame_count, boxes, track_ids, confidences, class_ids
                         )
-                        f.write(line)
-                        tracked_count += 1
+                        if store is not None:
+                            store.write_frame(frame_count, boxes, track_ids, confidences, class_ids)
+                    tracked_count += written
+                    METRICS.count('detections', written)
+            pbar.close()
+        
+        cap.release()
+        
+        # 已解码到流末尾: 记录实际帧数 (容器头中的帧数可能不准，如 .webm)
+        if frame_count != total_frames:
+            print(f"ℹ️  实际帧数 {frame_count} (容器头记录 {total_frames})")
+        record_frame_count(video_path, frame_count)
+        if recorder is not None:
+            self.det_cache.save(video_path, self.model_path, self.imgsz, recorder, width, height, fps,
+                                self.classes)
+        
+        # [新增] 自动生成 seqinfo.ini (TrackEval 评测工具需要)，seqLength 使用实际帧数
+        self._write_seqinfo(video_path, output_dir, width, height, fps, frame_count)
         
-        # [新增] 自动生成 seqinfo.ini (TrackEval 评测工具需要)
-        self._write_seqinfo(video_path, output_dir, width, height, fps, total_frames)
+        inferred = gate.inferred if gate is not None else frame_count
+        if cached is not None:
+            inferred = 0
+        video_metrics = METRICS.since(metrics_start) if METRICS.enabled else None
+        self.last_stats = {'frames': frame_count, 'detections': tracked_count, 'inferred': inferred,
+                           'metrics': video_metrics}
+        
+        # 分阶段耗时: JSON-lines 日志 (每个视频一行) 和 Prometheus 文本文件
+        if video_metrics is not None:
+            if self.metrics_log is not None:
+                self.metrics_log.write(video_record(
+                    video_file, video_metrics, time.perf_counter() - start_time,
+                    output=str(output_path), frames=frame_count, detections=tracked_count,
+                    inferred=inferred
+                ))
+            if self.metrics_file:
+                METRICS.write_prometheus(self.metrics_file)
         
         # 完成提示
         print(f"\n✅ 预标注完成！")
         print(f"📊 统计信息:")
         print(f"   - 处理帧数: {frame_count}")
         print(f"   - 检测目标数: {tracked_count}")
+        if gate is not None:
+            print(f"   - 实际推理帧数: {inferred} (运动门控跳过 {gate.stats()['skip_ratio']:.0%})")
         print(f"   - 输出文件: {output_path}")
         print(f"\n💡 提示: 请使用标注工具 (如 DarkLabel) 打开此文件进行人工修正")
         
@@ -220,11 +286,36 @@ def main():
   # 调整置信度阈值
   python gen_draft_gt.py --video video_dir --conf 0.2
   
-  # 跳过已存在的标注
+  # 增量处理: 目录清单 (.gse_manifest.json) 记录已处理视频，重跑只处理新增/内容变化/参数变化的视频
   python gen_draft_gt.py --video video_dir
   
+  # 只列出将要处理/跳过的视频
+  python gen_draft_gt.py --video video_dir --dry-run
+  
   # 强制覆盖已存在的标注
   python gen_draft_gt.py --video video_dir --force
+  
+  # 8 个进程并行处理目录 (每个进程单独加载模型)
+  python gen_draft_gt.py --video video_dir --workers 8
+  
+  # 同时输出列式二进制轨迹 (<视频名>_gt.tracks)
+  python gen_draft_gt.py --video video_dir --columnar
+  
+  # 运动门控: 画面静止时跳过推理 (停机位大部分时间无变化)
+  python gen_draft_gt.py --video video_dir --motion-gate
+  
+  # 使用项目内置的向量化 ByteTrack (参数取自 config.TRACK_*，可用 python -m utils.bytetrack 离线调参)
+  python gen_draft_gt.py --video video_dir --tracker native
+  
+  # 只标注 GSE 和 Ground_Crew (类别 ID 见 config.CLASS_NAMES)，飞机框不参与 NMS 和追踪
+  python gen_draft_gt.py --video video_dir --classes 1 2
+  
+  # 检测缓存: 首次运行记录检测框 (data/det_cache)，之后换 --conf 或 --tracker 只重放缓存，不再推理
+  python gen_draft_gt.py --video video_dir --conf 0.2 --force
+  
+  # 分阶段耗时: 每个视频一行 JSON 日志 + Prometheus 指标 (文件或 http://127.0.0.1:9100/metrics)
+  python gen_draft_gt.py --video video_dir --metrics-log data/metrics.jsonl --metrics-file data/gse.prom
+  python gen_draft_gt.py --video video_dir --metrics-port 9100
         """
     )
     
@@ -237,7 +328,29 @@ def main():
     parser.add_argument('--model', '-m', type=str, default=None,
                         help='模型路径 (可选，默认使用 config.MODEL_PATH)')
     parser.add_argument('--force', '-f', action='store_true',
-                        help='强制覆盖已存在的标注文件')
+                        help='强制覆盖已存在的标注文件 (忽略目录清单，全部重新处理)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='目录模式: 只列出将要处理/跳过的视频及原因，不加载模型')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='目录模式的并行工作进程数 (默认 1，即串行处理)')
+    parser.add_argument('--threads-per-worker', type=int, default=None,
+                        help='每个工作进程的线程数 (默认: CPU 核数 / 进程数)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='同时输出列式二进制轨迹 (<视频名>_gt.tracks 目录，可按列/帧范围内存映射读取)')
+    parser.add_argument('--motion-gate', action='store_true',
+                        help='画面静止时跳过推理并沿用上一帧轨迹 (阈值见 config.MOTION_GATE_*)')
+    parser.add_argument('--tracker', type=str, default="bytetrack.yaml",
+                        help='追踪器: ultralytics 配置 (默认 bytetrack.yaml) 或 native (向量化 ByteTrack，参数见 config.TRACK_*)')
+    parser.add_argument('--classes', type=int, nargs='+', default=None,
+                        help='只检测/追踪这些类别 ID (默认全部，类别见 config.CLASS_NAMES)')
+    parser.add_argument('--no-det-cache', action='store_true',
+                        help=f'不读写检测缓存 (默认缓存到 {config.DETECTION_CACHE_DIR}，换阈值/追踪器时免推理)')
+    parser.add_argument('--metrics-log', type=str, default=None,
+                        help='每个视频的分阶段耗时 (解码/推理/NMS/追踪/写入) 追加到此 JSON-lines 文件')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                        help='以 Prometheus 文本格式写入指标文件 (每个视频完成后更新)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='在 127.0.0.1:<端口>/metrics 提供 Prometheus 指标')
     
     args = parser.parse_args()
     
@@ -246,8 +359,16 @@ def main():
         print(f"❌ 错误: 置信度阈值必须在 0.0-1.0 之间，得到: {args.conf}")
         return 1
     
-    # 创建生成器
-    generator = DraftGTGenerator(model_path=args.model)
+    if args.workers < 1:
+        print(f"❌ 错误: 工作进程数必须 >= 1，得到: {args.workers}")
+        return 1
+    
+    if args.classes is not None:
+        unknown = [c for c in args.classes if c not in config.CLASS_NAMES]
+        if unknown:
+            print(f"❌ 错误: 未知的类别 ID {unknown} (可选: {config.CLASS_NAMES})")
+            return 1
+        args.classes = sorted(set(args.classes))
     
     # 判断输入是文件还是目录
     input_path = Path(args.video)
@@ -256,6 +377,24 @@ def main():
         print(f"❌ 错误: 路径不存在: {args.video}")
         return 1
     
+    # 任一指标输出选项都会启用分阶段计时 (默认关闭，几乎没有开销)
+    if args.metrics_log or args.metrics_file or args.metrics_port:
+        configure_metrics(True)
+    if args.metrics_port:
+        METRICS.serve(args.metrics_port)
+        print(f"📈 指标端点: http://127.0.0.1:{args.metrics_port}/metrics")
+    
+    # 创建生成器 (并行目录模式下模型只在工作进程中加载)
+    generator = None
+    if input_path.is_file() or (args.workers == 1 and not args.dry_run):
+        generator = DraftGTGenerator(model_path=args.model, columnar=args.columnar,
+                                     motion_gate=args.motion_gate,
+                                     metrics_log=args.metrics_log,
+                                     metrics_file=args.metrics_file,
+                                     tracker=args.tracker,
+                                     det_cache=not args.no_det_cache,
+                                     classes=args.classes)
+    
     # 文件模式：处理单个视频
     if input_path.is_file():
         output_file = generator.process_video(
@@ -277,34 +416,83 @@ def main():
             generator=generator,
             video_dir=input_path,
             conf_threshold=args.conf,
-            force_overwrite=args.force
+            force_overwrite=args.force,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+            model_path=args.model,
+            columnar=args.columnar,
+            motion_gate=args.motion_gate,
+            metrics_log=args.metrics_log,
+            metrics_file=args.metrics_file,
+            dry_run=args.dry_run,
+            tracker=args.tracker,
+            det_cache=not args.no_det_cache,
+            classes=args.classes
         )
     
     return 1
 
 
-def _process_video_directory(generator, video_dir, conf_threshold=0.1, force_overwrite=False):
+def _init_worker_generator(model_path, columnar, motion_gate, instrument, metrics_log, tracker,
+                           det_cache, classes):
+    """工作进程初始化: 每个进程只加载一次模型 (各自持有独立的 ByteTrack 状态)"""
+    # 分阶段耗时随结果返回主进程汇总；Prometheus 文件只由主进程写入
+    configure_metrics(instrument)
+    return DraftGTGenerator(model_path=model_path, progress=False, columnar=columnar,
+                            motion_gate=motion_gate, metrics_log=metrics_log, tracker=tracker,
+                            det_cache=det_cache, classes=classes)
+
+
+def _process_in_worker(generator, job):
+    """工作进程任务: 处理单个视频，返回 (输出文件路径, 统计信息)"""
+    video_file, output_path, conf_threshold = job
+    output_file = generator.process_video(
+        video_path=video_file,
+        output_path=output_path,
+        conf_threshold=conf_threshold
+    )
+    return output_file, generator.last_stats
+
+
+def _output_paths(video_file, columnar=False):
+    """视频对应的输出 (与视频同目录的 <视频名>_gt.txt，以及可选的 .tracks 目录)，用于清单比对"""
+    video_file = Path(video_file)
+    output_path = video_file.parent / f"{video_file.stem}_gt.txt"
+    return [output_path, output_path.with_suffix('.tracks')] if columnar else [output_path]
+
+
+def _process_video_directory(generator, video_dir, conf_threshold=0.1, force_overwrite=False,
+                             workers=1, threads_per_worker=None, model_path=None,
+                             columnar=False, motion_gate=False, metrics_log=None,
+                             metrics_file=None, dry_run=False, tracker="bytetrack.yaml",
+                             det_cache=True, classes=None):
     """
     批量处理视频目录
     
     Args:
-        generator: DraftGTGenerator 实例
+        generator: DraftGTGenerator 实例 (并行模式下可为 None)
         video_dir: 视频目录路径
         conf_threshold: 置信度阈值
-        force_overwrite: 是否强制覆盖已存在的文件
+        force_overwrite: 是否忽略清单，强制重新处理所有视频
+        workers: 并行工作进程数 (>1 时每个进程单独加载模型)
+        threads_per_worker: 每个进程的线程数 (默认: CPU 核数 / 进程数)
+        model_path: 并行模式下工作进程使用的模型路径
+        columnar: 并行模式下是否同时输出列式二进制轨迹
+        motion_gate: 并行模式下是否启用运动门控
+        metrics_log: 并行模式下每个视频的分阶段耗时 JSON-lines 日志
+        metrics_file: 并行模式下汇总后的 Prometheus 文本文件
+        dry_run: 只列出将要处理/跳过的视频，不处理 (generator 可为 None)
+        tracker: 追踪器 (记录到清单；并行模式下工作进程使用)
+        det_cache: 并行模式下工作进程是否使用检测缓存
+        classes: 只检测/追踪的类别 ID (记录到清单；并行模式下工作进程使用)
     
     Returns:
         返回码 (0: 成功, 1: 失败)
     """
     video_dir = Path(video_dir)
     
-    # 查找所有视频文件
-    video_files = []
-    for ext in ['*.webm', '*.mp4', '*.avi', '*.mov']:
-        video_files.extend(video_dir.glob(f"**/{ext}"))
-        video_files.extend(video_dir.glob(f"**/{ext.upper()}"))
-    
-    video_files = sorted(list(set(video_files)))  # 去重并排序
+    # 查找所有视频文件 (单次遍历，扩展名不区分大小写，目录列表可缓存)
+    video_files = find_videos(video_dir)
     
     if not video_files:
         print(f"❌ 错误: 未找到视频文件 ({video_dir})")
@@ -312,25 +500,50 @@ def _process_video_directory(generator, video_dir, conf_threshold=0.1, force_ove
     
     print(f"🎬 找到 {len(video_files)} 个视频文件\n")
     
+    # 增量处理: 视频目录下的清单记录每个视频的内容哈希、权重哈希、置信度和追踪器配置，
+    # 只处理新增/内容变化/输出缺失/模型或参数变化的视频。
+    # 清单建立之前生成的标注 (无记录但文件已存在) 与以前一样跳过，--force 重新生成
+    manifest = Manifest(video_dir)
+    model_path = model_path or (generator.model_path if generator is not None else None)
+    # 类别过滤只在设置时记录 (未设置时与之前的清单保持一致)
+    params = run_params(model_path, conf_threshold, tracker, motion_gate=motion_gate, columnar=columnar,
+                        **({'classes': classes} if classes is not None else {}))
+    plan = plan_videos(manifest, video_files, params, lambda v: _output_paths(v, columnar),
+                       force=force_overwrite, run_untracked=False)
+    
+    if dry_run:
+        to_run = sum(run for _, _, run in plan)
+        print(f"📋 预演 (--dry-run): {to_run} 个待处理, {len(plan) - to_run} 个跳过")
+        for video_file, status, run in plan:
+            print(f"   {'▶️  处理' if run else '⏭️  跳过'} {video_file.relative_to(video_dir)}  "
+                  f"({STATUS_LABELS_CN[status]})")
+        return 0
+    
     # 统计信息
     success_count = 0
     skip_count = 0
     fail_count = 0
     output_files = []
+    jobs = []
     
     # 批量处理
-    for idx, video_file in enumerate(video_files, 1):
+    for idx, (video_file, status, run) in enumerate(plan, 1):
         # 输出标注文件路径 (与视频同目录)
-        output_path = video_file.parent / f"{video_file.stem}_gt.txt"
+        output_path = _output_paths(video_file)[0]
         
         print(f"[{idx}/{len(video_files)}] 📹 {video_file.name}")
         
-        # 检查文件是否已存在
-        if output_path.exists() and not force_overwrite:
-            print(f"           ⏭️  跳过 (文件已存在，使用 --force 强制覆盖)")
+        if not run:
+            print(f"           ⏭️  跳过 ({STATUS_LABELS_CN[status]}，使用 --force 强制覆盖)")
             skip_count += 1
             print()
             continue
+        print(f"           ▶️  {STATUS_LABELS_CN[status]}")
+        
+        if workers > 1:
+            # 并行模式: 先收集任务，稍后分发给工作进程
+            jobs.append((str(video_file), str(output_path), conf_threshold))
+            continue
         
         # 处理视频
         output_file = generator.process_video(
@@ -344,7 +557,60 @@ def _process_video_directory(generator, video_dir, conf_threshold=0.1, force_ove
         else:
             success_count += 1
             output_files.append(output_file)
+            manifest.record(video_file, params, _output_paths(video_file, columnar))
+        
+        print()
+    
+    if jobs:
+        threads_per_worker = threads_per_worker or default_threads_per_worker(workers)
+        print(f"🚀 并行模式: {min(workers, len(jobs))} 个进程 × {threads_per_worker} 线程, "
+              f"{len(jobs)} 个视频待处理\n")
+        
+        total_frames = 0
+        total_detections = 0
+        total_inferred = 0
+        start_time = time.perf_counter()
+        
+        results = run_sharded(
+            jobs,
+            init_fn=_init_worker_generator,
+            task_fn=_process_in_worker,
+            workers=workers,
+            init_args=(model_path, columnar, motion_gate, METRICS.enabled, metrics_log, tracker,
+                       det_cache, classes),
+            threads_per_worker=threads_per_worker
+        )
+        
+        for done, (job, result, error) in enumerate(results, 1):
+            video_name = Path(job[0]).name
+            if error is not None:
+                print(f"[{done}/{len(jobs)}] ❌ {video_name}: {error}")
+                fail_count += 1
+                continue
+            
+            output_file, stats = result
+            if output_file is None:
+                print(f"[{done}/{len(jobs)}] ❌ {video_name}")
+                fail_count += 1
+            else:
+                success_count += 1
+                output_files.append(output_file)
+                manifest.record(job[0], params, _output_paths(job[0], columnar))
+                total_frames += stats['frames']
+                total_detections += stats['detections']
+                total_inferred += stats['inferred']
+                METRICS.merge(stats['metrics'])
+                if metrics_file:
+                    METRICS.write_prometheus(metrics_file)
+                print(f"[{done}/{len(jobs)}] ✅ {video_name}: "
+                      f"{stats['detections']} 个检测 | {stats['frames']} 帧")
         
+        elapsed = time.perf_counter() - start_time
+        output_files.sort()
+        print(f"\n📊 并行汇总: {total_frames} 帧 | {total_detections} 个检测 | "
+              f"耗时 {elapsed:.1f}s ({total_frames / max(elapsed, 1e-9):.1f} 帧/秒)")
+        if motion_gate:
+            print(f"🎯 运动门控: 推理 {total_inferred}/{total_frames} 帧")
         print()
     
     # 最终统计
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+INT8 quantization and accuracy report for GSE Detection v11
+机场GSE检测 v11 INT8 量化与精度报告
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.backends import export_model, quantize_model
+from utils.detection import GSEDetector
+from utils.evaluation import (DetectionEvaluator, latency_summary, load_ground_truth,
+                              process_memory_bytes)
+import config
+
+
+PRECISIONS = ("fp32", "int8")
+
+
+def _path_size_mb(path):
+    path = Path(path)
+    files = path.rglob('*') if path.is_dir() else [path]
+    return sum(f.stat().st_size for f in files if f.is_file()) / 1e6
+
+
+def load_detector(model_path: str, precision: str):
+    """
+    Load an ONNX detector and run one warm-up inference
+
+    Args:
+        model_path: PyTorch weights the ONNX model was built from
+        precision: 'fp32' or 'int8'
+
+    Returns:
+        GSEDetector
+    """
+    detector = GSEDetector(model_path, backend="onnx", precision=precision)
+
+    # Warm up so runtime buffers allocated on the first run exist
+    warmup = np.zeros((config.INPUT_SIZE, config.INPUT_SIZE, 3), dtype=np.uint8)
+    detector.model(warmup, imgsz=config.INPUT_SIZE, verbose=False)
+    return detector
+
+
+def _loaded_memory(model_path: str, precision: str):
+    """Runs in a fresh process: resident memory added by loading one detector"""
+    # Runtime imports are the same for both precisions and are not counted
+    import onnxruntime  # noqa: F401
+    from ultralytics.nn.autobackend import AutoBackend  # noqa: F401
+
+    before = process_memory_bytes()
+    load_detector(model_path, precision)
+    after = process_memory_bytes()
+    return (after - before) / 1e6 if before is not None and after is not None else None
+
+
+def measure_memory(model_path: str, precision: str):
+    """
+    Memory a detector adds, measured in its own process
+
+    Loading both precisions into one process would charge the first one
+    for everything the second then reuses (runtime initialization, ultralytics
+    ONNX setup), so each is loaded in a fresh interpreter instead.
+
+    Args:
+        model_path: PyTorch weights the ONNX model was built from
+        precision: 'fp32' or 'int8'
+
+    Returns:
+        Megabytes including one warm-up inference (None if process memory
+        cannot be measured)
+    """
+    # spawn: a fresh interpreter, not a fork of this one with its models loaded
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_loaded_memory, (model_path, precision))
+
+
+def evaluate_video(detectors: dict, evaluators: dict, latencies: dict, video_path: str,
+                   gt_path: str, stride: int = 1, max_frames: int = None, conf: float = 0.01):
+    """
+    Run every detector on a video and score it against MOT ground truth
+
+    Args:
+        detectors: Precision -> GSEDetector
+        evaluators: Precision -> DetectionEvaluator (updated in place)
+        latencies: Precision -> list of per-frame seconds (appended in place)
+        video_path: Input video
+        gt_path: MOT annotation file for the video (e.g. <video>_gt.txt)
+        stride: Evaluate every Nth frame
+        max_frames: Maximum frames evaluated for this video (None: all)
+        conf: Detection confidence threshold (low, to trace the full PR curve)
+
+    Returns:
+        Number of frames evaluated
+    """
+    ground_truth = load_ground_truth(gt_path)
+    no_boxes = (np.empty((0, 4)), np.empty(0, dtype=np.int64))
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise IOError(f"Failed to open video: {video_path}")
+
+    frame_idx = 0
+    evaluated = 0
+    while max_frames is None or evaluated < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame_idx += 1  # MOT frame numbers start at 1
+        if (frame_idx - 1) % stride:
+            continue
+
+        gt_xyxy, gt_cls = ground_truth.get(frame_idx, no_boxes)
+        for precision, detector in detectors.items():
+            start = time.perf_counter()
+            result = detector.model(frame, conf=conf, iou=config.IOU_THRESHOLD,
+                                    imgsz=config.INPUT_SIZE, device=detector.device,
+                                    verbose=False)[0]
+            latencies[precision].append(time.perf_counter() - start)
+
+            boxes = result.boxes
+            evaluators[precision].add_frame(
+                boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy(),
+                gt_xyxy, gt_cls
+            )
+        evaluated += 1
+
+        if evaluated % 50 == 0:
+            print(f"   Frame {frame_idx} | evaluated {evaluated}")
+
+    cap.release()
+    return evaluated
+
+
+def print_report(report: dict):
+    """Print the FP32 vs INT8 comparison as a table"""
+    fp32, int8 = report['precisions']['fp32'], report['precisions']['int8']
+
+    def fmt(value, spec=".3f"):
+        return "n/a" if value is None else format(value, spec)
+
+    print(f"\n{'='*70}")
+    print(f"📊 FP32 vs INT8 ({report['frames']} frames, reference: MOT draft GT)")
+    print(f"{'='*70}")
+    print(f"   {'Class':<14}{'GT':>8}{'FP32 AP50':>12}{'INT8 AP50':>12}{'Δ':>9}")
+    for name, entry in fp32['accuracy']['classes'].items():
+        ap_fp32, ap_int8 = entry['ap50'], int8['accuracy']['classes'][name]['ap50']
+        delta = ap_int8 - ap_fp32 if ap_fp32 is not None else None
+        print(f"   {name:<14}{entry['gt']:>8}{fmt(ap_fp32):>12}{fmt(ap_int8):>12}{fmt(delta, '+.3f'):>9}")
+
+    print(f"\n   {'':<22}{'FP32':>12}{'INT8':>12}")
+    rows = [
+        ("mAP50", fp32['accuracy']['map50'], int8['accuracy']['map50'], ".3f"),
+        ("mAP50-95", fp32['accuracy']['map50_95'], int8['accuracy']['map50_95'], ".3f"),
+        ("Latency mean (ms)", fp32['latency']['mean_ms'], int8['latency']['mean_ms'], ".1f"),
+        ("Latency p95 (ms)", fp32['latency']['p95_ms'], int8['latency']['p95_ms'], ".1f"),
+        ("Memory (MB)", fp32['memory_mb'], int8['memory_mb'], ".1f"),
+        ("Model size (MB)", fp32['model_mb'], int8['model_mb'], ".1f"),
+    ]
+    for label, a, b, spec in rows:
+        print(f"   {label:<22}{fmt(a, spec):>12}{fmt(b, spec):>12}")
+    print(f"{'='*70}\n")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="GSE Detection v11 - INT8 quantization and FP32 comparison report",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Calibrate on apron frames and build the INT8 model (cached next to the weights)
+  python quantize.py --calib data/calibration
+
+  # Compare FP32 and INT8 against draft GT (video_01_gt.txt next to the video)
+  python quantize.py --calib data/calibration --video video_01.mp4 --report int8_report.json
+
+  # Several videos, every 5th frame, at most 200 frames each
+  python quantize.py --video v1.mp4 v2.mp4 --stride 5 --max-frames 200
+        """
+    )
+
+    parser.add_argument('--calib', type=str, default=config.CALIBRATION_DIR,
+                        help=f'Folder of calibration frames (default: {config.CALIBRATION_DIR})')
+    parser.add_argument('--max-calib', type=int, default=None,
+                        help=f'Maximum calibration images (default: {config.CALIBRATION_MAX_IMAGES})')
+    parser.add_argument('--model', '-m', type=str, default=config.MODEL_PATH,
+                        help=f'PyTorch weights (default: {config.MODEL_PATH})')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-run calibration even if a cached INT8 model exists')
+    parser.add_argument('--video', type=str, nargs='+', default=None,
+                        help='Videos to evaluate FP32 vs INT8 on')
+    parser.add_argument('--gt', type=str, nargs='+', default=None,
+                        help='MOT ground truth per video (default: <video>_gt.txt next to each video)')
+    parser.add_argument('--stride', type=int, default=1,
+                        help='Evaluate every Nth frame (default: 1)')
+    parser.add_argument('--max-frames', type=int, default=None,
+                        help='Maximum frames evaluated per video (default: all)')
+    parser.add_argument('--conf', type=float, default=0.01,
+                        help='Detection confidence threshold for AP (default: 0.01)')
+    parser.add_argument('--report', type=str, default=None,
+                        help='Write the comparison report as JSON to this path')
+
+    args = parser.parse_args()
+
+    if args.stride < 1:
+        parser.error(f"--stride must be >= 1, got {args.stride}")
+    if args.gt and (not args.video or len(args.gt) != len(args.video)):
+        parser.error("--gt needs exactly one file per --video")
+
+    # Build (or reuse) the INT8 model
+    try:
+        int8_path = quantize_model(args.model, args.calib, max_images=args.max_calib, force=args.force)
+    except (FileNotFoundError, ImportError) as e:
+        print(f"❌ Quantization failed: {e}")
+        return 1
+    print(f"✅ INT8 model: {int8_path}")
+
+    if not args.video:
+        print(f"💡 Load it with GSEDetector(precision=\"int8\")")
+        return 0
+
+    videos = [Path(v) for v in args.video]
+    gts = [Path(g) for g in args.gt] if args.gt else [v.parent / f"{v.stem}_gt.txt" for v in videos]
+    for path in videos + gts:
+        if not path.exists():
+            print(f"❌ File not found: {path}")
+            return 1
+
+    # Memory is measured per precision in a fresh process; evaluation loads both here
+    memory = {precision: measure_memory(args.model, precision) for precision in PRECISIONS}
+    detectors = {precision: load_detector(args.model, precision) for precision in PRECISIONS}
+    class_names = detectors["fp32"].class_names
+    evaluators = {p: DetectionEvaluator(class_names) for p in PRECISIONS}
+    latencies = {p: [] for p in PRECISIONS}
+
+    frames = 0
+    for video, gt in zip(videos, gts):
+        print(f"\n🎬 Evaluating {video.name} against {gt.name}...")
+        frames += evaluate_video(detectors, evaluators, latencies, video, gt,
+                                 stride=args.stride, max_frames=args.max_frames, conf=args.conf)
+
+    model_paths = {
+        "fp32": export_model(args.model, "onnx", dynamic=False),
+        "int8": int8_path,
+    }
+    report = {
+        'model': str(args.model),
+        'calibration': str(args.calib),
+        'videos': [str(v) for v in videos],
+        'ground_truth': [str(g) for g in gts],
+        'frames': frames,
+        'conf': args.conf,
+        'precisions': {
+            precision: {
+                'model_path': str(model_paths[precision]),
+                'model_mb': _path_size_mb(model_paths[precision]),
+                'memory_mb': memory[precision],
+                'latency': latency_summary(latencies[precision]),
+                'accuracy': evaluators[precision].results(),
+            }
+            for precision in PRECISIONS
+        },
+    }
+
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to: {args.report}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
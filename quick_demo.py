@@ -5,30 +5,64 @@ Quick inference demo for GSE Detection v11
 机场GSE检测 v11 快速推理演示
 """
 
+import asyncio
 import cv2
 import sys
+import time
 from pathlib import Path
 
 # Add utils to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils.detection import GSEDetector
+from utils.instrumentation import METRICS, STAGES, JsonlLog, configure as configure_metrics, video_record
+from utils.motion import MotionGate
+from utils.pipeline import StagedPipeline
+from utils.tiling import camera_rois, rect_roi, draw_roi
+from utils.video_io import open_video
 import config
 
 
-def detect_image(image_path: str):
+def _run_detection(detector, frames, batch_size: int = 1, rois=None, tiled: bool = False):
+    """
+    Detect objects in frames, on the full frame or on ROI tiles
+    
+    Args:
+        detector: GSEDetector instance
+        frames: List of images
+        batch_size: Frames (or tiles) per forward pass
+        rois: Normalized ROI polygons (None: whole frame)
+        tiled: Split the ROI (or frame) into overlapping config.TILE_SIZE tiles
+    
+    Returns:
+        List of YOLO results, one per frame
+    """
+    if not rois and not tiled:
+        return detector.detect_batch(frames, batch_size=batch_size)
+    
+    tile_size = config.TILE_SIZE if tiled else None
+    return [
+        detector.detect_tiled(frame, rois, tile_size=tile_size, batch_size=batch_size)[0]
+        for frame in frames
+    ]
+
+
+def detect_image(image_path: str, rois=None, tiled: bool = False, backend: str = None):
     """
     Detect objects in a single image
     
     Args:
         image_path: Path to input image
+        rois: Normalized ROI polygons (None: whole frame)
+        tiled: Run tiled inference
+        backend: Inference backend ('torch', 'onnx', 'openvino'; default from config)
     """
     print(f"\n{'='*70}")
     print(f"GSE Detection v11 - Image Detection Demo")
     print(f"{'='*70}\n")
     
     # Initialize detector
-    detector = GSEDetector()
+    detector = GSEDetector(backend=backend)
     
     # Load image
     image = cv2.imread(image_path)
@@ -41,7 +75,10 @@ def detect_image(image_path: str):
     
     # Detect
     print("\n🔍 Running detection...")
-    results = detector.detect(image)
+    if rois or tiled:
+        results = _run_detection(detector, [image], batch_size=8, rois=rois, tiled=tiled)
+    else:
+        results = detector.detect(image)
     
     # Print results
     detections = detector.get_detections_info(results)
@@ -54,12 +91,56 @@ def detect_image(image_path: str):
     
     # Draw and save
     annotated = detector.draw_detections(image, results)
+    if rois:
+        draw_roi(annotated, rois)
     output_path = image_path.replace('.', '_detected.')
     cv2.imwrite(output_path, annotated)
     print(f"\n💾 Saved to: {output_path}")
 
 
-def detect_video(video_path: str, output_path: str = None, skip_frames: int = 1):
+def _read_batches(cap, skip_frames: int, batch_size: int):
+    """
+    Decode frames and group them into batches
+    
+    Args:
+        cap: Opened VideoReader (or cv2.VideoCapture)
+        skip_frames: Detect on every Nth frame
+        batch_size: Number of frames to detect per batch
+    
+    Yields:
+        Lists of (frame_idx, frame, detect) tuples in decode order, each holding
+        batch_size frames to detect plus the skipped frames between them
+    """
+    pending = []
+    pending_detect = 0
+    frame_idx = 0
+    
+    while True:
+        with METRICS.timer('decode'):
+            ret, frame = cap.read()
+        if not ret:
+            break
+        
+        # Process every Nth frame
+        detect = frame_idx % skip_frames == 0
+        pending.append((frame_idx, frame, detect))
+        pending_detect += detect
+        frame_idx += 1
+        
+        if pending_detect >= batch_size:
+            yield pending
+            pending = []
+            pending_detect = 0
+    
+    if pending:
+        yield pending
+
+
+def detect_video(video_path: str, output_path: str = None, skip_frames: int = 1,
+                 batch_size: int = 1, pipeline: bool = False, queue_size: int = 4,
+                 motion_gate: bool = False, rois=None, tiled: bool = False,
+                 backend: str = None, metrics_log: str = None, metrics_file: str = None,
+                 decoder: str = None, decode_size: bool = False):
     """
     Detect objects in video
     
@@ -67,28 +148,58 @@ def detect_video(video_path: str, output_path: str = None, skip_frames: int = 1)
         video_path: Path to input video
         output_path: Path for output video (optional)
         skip_frames: Skip N frames between detections (for speed)
+        batch_size: Number of frames stacked into one forward pass
+        pipeline: Run decode, inference, drawing and encoding on separate threads
+        queue_size: Number of batches buffered between pipeline stages
+        motion_gate: Skip inference on frames without motion and reuse the
+            previous detections for them
+        rois: Normalized ROI polygons; detections outside are discarded
+        tiled: Split the ROI (or frame) into overlapping tiles
+        backend: Inference backend ('torch', 'onnx', 'openvino'; default from config)
+        metrics_log: Append the per-stage timing of this video to a JSON-lines log
+        metrics_file: Write the metrics in Prometheus text format when done
+        decoder: Decode backend ('opencv', 'pyav', 'auto'; default config.DECODE_BACKEND)
+        decode_size: Decode straight to the detector's input size (detector.imgsz),
+            skipping the full-size resize in predict; the output video has that size
     """
     print(f"\n{'='*70}")
     print(f"GSE Detection v11 - Video Detection Demo")
     print(f"{'='*70}\n")
     
     # Initialize detector
-    detector = GSEDetector()
+    detector = GSEDetector(backend=backend)
     
-    # Open video
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print(f"❌ Failed to open video: {video_path}")
+    # Open video. Decoded frames live in a ring of reused buffers: one batch
+    # (detected plus skipped frames) is in flight at a time. Pipeline mode
+    # buffers several batches between threads, so it gets fresh arrays.
+    pool_size = 0 if pipeline else batch_size * skip_frames + 1
+    try:
+        cap = open_video(video_path, backend=decoder, pool_size=pool_size,
+                         max_side=detector.imgsz if decode_size else None)
+    except (IOError, ValueError) as e:
+        print(f"❌ Failed to open video: {e}")
         return
     
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    frame_count = cap.frame_count
+    fps = cap.fps
+    width = cap.width
+    height = cap.height
     
-    print(f"📹 Loaded video: {video_path}")
+    print(f"📹 Loaded video: {video_path} ({cap.backend} decoder)")
     print(f"   Frames: {frame_count} | FPS: {fps:.1f} | Size: {width}x{height}")
+    if cap.scale != 1.0:
+        print(f"   Decoding at model input size (source {cap.source_width}x{cap.source_height})")
     print(f"   Processing every {skip_frames} frame(s)")
+    if batch_size > 1:
+        print(f"   Batch size: {batch_size} frame(s) per forward pass")
+    if pipeline:
+        print(f"   Pipeline mode: decode / infer / annotate / encode threads")
+    if motion_gate:
+        print(f"   Motion gating: reuse detections on static frames")
+    if rois:
+        print(f"   ROI: {len(rois)} polygon(s)")
+    if tiled:
+        print(f"   Tiled inference: {config.TILE_SIZE}px tiles, {config.TILE_OVERLAP:.0%} overlap")
     
     # Setup output if requested
     writer = None
@@ -100,32 +211,84 @@ def detect_video(video_path: str, output_path: str = None, skip_frames: int = 1)
     # Process video
     frame_idx = 0
     detected_count = 0
+    gate = MotionGate() if motion_gate else None
+    last_results = None
     
-    print("\n🔍 Processing video...")
-    
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Process every Nth frame
-        if frame_idx % skip_frames == 0:
-            results = detector.detect(frame)
-            detections = detector.get_detections_info(results)
-            detected_count += len(detections)
-            
-            # Draw on frame
-            frame = detector.draw_detections(frame, results)
-            
-            # Print progress
-            if frame_idx % (skip_frames * 30) == 0:
-                print(f"   Frame {frame_idx}/{frame_count} | Objects: {detected_count}")
+    def infer_batch(batch):
+        nonlocal last_results
+        # 'infer' runs the model, 'reuse' repeats the last results (static scene)
+        actions = []
+        for _, frame, detect in batch:
+            if not detect:
+                actions.append(None)
+            elif gate is None:
+                actions.append('infer')
+            else:
+                with METRICS.timer('gating'):
+                    moved = gate.should_infer(frame)
+                actions.append('infer' if moved else 'reuse')
         
-        # Write frame
-        if writer:
-            writer.write(frame)
+        to_detect = [frame for (_, frame, _), action in zip(batch, actions) if action == 'infer']
+        batch_results = iter(_run_detection(detector, to_detect, batch_size, rois, tiled))
         
-        frame_idx += 1
+        inferred = []
+        for (idx, frame, _), action in zip(batch, actions):
+            if action == 'infer':
+                last_results = [next(batch_results)]
+            inferred.append((idx, frame, last_results if action else None))
+        return inferred
+    
+    def annotate_batch(batch):
+        nonlocal detected_count
+        annotated = []
+        for idx, frame, results in batch:
+            if results is not None:
+                # Host columns only (drawing below reuses them); no per-detection dicts
+                detected_count += len(detector.get_detection_arrays(results)['cls'])
+                
+                # Draw on frame
+                frame = detector.draw_detections(frame, results)
+                if rois:
+                    draw_roi(frame, rois)
+                
+                # Print progress
+                if idx % (skip_frames * 30) == 0:
+                    print(f"   Frame {idx}/{frame_count} | Objects: {detected_count}")
+            annotated.append((idx, frame))
+        return annotated
+    
+    def encode_batch(batch):
+        nonlocal frame_idx
+        for _, frame in batch:
+            # Write frame
+            if writer:
+                with METRICS.timer('writing'):
+                    writer.write(frame)
+            frame_idx += 1
+            METRICS.count('frames')
+        return batch
+    
+    batches = _read_batches(cap, skip_frames, batch_size)
+    
+    print("\n🔍 Processing video...")
+    metrics_start = METRICS.snapshot()
+    start_time = time.perf_counter()
+    
+    stage_stats = None
+    if pipeline:
+        # Decode, inference, drawing and encoding each run on their own thread
+        runner = StagedPipeline(
+            batches,
+            [('infer', infer_batch), ('annotate', annotate_batch), ('encode', encode_batch)],
+            queue_size=queue_size,
+            count=len
+        )
+        stage_stats = runner.run()
+    else:
+        for batch in batches:
+            encode_batch(annotate_batch(infer_batch(batch)))
+    
+    elapsed = time.perf_counter() - start_time
     
     # Cleanup
     cap.release()
@@ -135,6 +298,158 @@ def detect_video(video_path: str, output_path: str = None, skip_frames: int = 1)
     print(f"\n✅ Processing complete!")
     print(f"   Total frames: {frame_idx}")
     print(f"   Objects detected: {detected_count}")
+    if elapsed > 0:
+        print(f"   Throughput: {frame_idx / elapsed:.1f} FPS")
+    if stage_stats:
+        print(f"   Stage throughput:")
+        for stats in stage_stats:
+            print(f"      {stats.name:<8} {stats.items} frames | "
+                  f"busy {stats.busy_seconds:.2f}s | {stats.fps:.1f} FPS")
+    if gate is not None:
+        gate_stats = gate.stats()
+        print(f"   Motion gate: {gate_stats['inferred']}/{gate_stats['frames']} frames inferred "
+              f"({gate_stats['skip_ratio']:.0%} skipped)")
+    if METRICS.enabled:
+        video_metrics = METRICS.since(metrics_start)
+        print(f"   Stage timing:")
+        for stage in STAGES:
+            if stage in video_metrics['stages']:
+                totals = video_metrics['stages'][stage]
+                print(f"      {stage:<10} {totals['seconds']:7.2f}s | {totals['calls']} calls | "
+                      f"{totals['seconds'] / max(elapsed, 1e-9):.0%} of wall time")
+        if metrics_log:
+            JsonlLog(metrics_log).write(video_record(
+                video_path, video_metrics, elapsed, output=output_path, frames=frame_idx,
+                detections=detected_count
+            ))
+        if metrics_file:
+            METRICS.write_prometheus(metrics_file)
+    if output_path:
+        print(f"   Output saved: {output_path}")
+
+
+def detect_streams(sources, batch_size: int = None, max_frames: int = None,
+                   realtime: bool = True, backend: str = None):
+    """
+    Detect on several camera streams at once with shared batched inference
+    
+    Args:
+        sources: Stream URLs, device indices or video files
+        batch_size: Maximum frames per forward pass across streams (default from config)
+        max_frames: Stop each stream after this many frames (None: until it ends)
+        realtime: Replay video files at their frame rate, like live cameras
+        backend: Inference backend ('torch', 'onnx', 'openvino'; default from config)
+    """
+    from utils.async_detection import AsyncGSEDetector
+    
+    print(f"\n{'='*70}")
+    print(f"GSE Detection v11 - Multi-Stream Demo ({len(sources)} streams)")
+    print(f"{'='*70}\n")
+    
+    async def run():
+        async with AsyncGSEDetector(backend=backend, max_batch=batch_size, warmup=True) as detector:
+            start_time = time.perf_counter()
+            inferred = 0
+            async for item in detector.stream(sources, realtime=realtime, max_frames=max_frames):
+                inferred += 1
+                if inferred % 30 == 0:
+                    objects = len(item.results[0].boxes)
+                    print(f"   {item.source} frame {item.frame_index} | Objects: {objects} | "
+                          f"latency {(time.monotonic() - item.timestamp) * 1000:.0f} ms")
+            elapsed = time.perf_counter() - start_time
+            return detector.stream_stats, detector.batcher.stats(), elapsed
+    
+    stream_stats, batch_stats, elapsed = asyncio.run(run())
+    
+    print(f"\n✅ Streams finished in {elapsed:.1f}s "
+          f"(mean batch {batch_stats['mean_batch']:.1f} frames)")
+    for stats in stream_stats.values():
+        print(f"   {stats.source}: {stats.read} read | {stats.inferred} inferred | "
+              f"{stats.dropped} dropped | latency {stats.mean_latency * 1000:.0f} ms")
+
+
+def detect_live(source, output_path: str = None, duration: float = None,
+                target_latency: float = None, backend: str = None):
+    """
+    Detect on a live stream, always on the newest frame
+    
+    A capture thread keeps only the latest frame and the inference stride
+    adapts so the capture-to-result latency stays near the target. Stalled
+    streams are reopened.
+    
+    Args:
+        source: Stream URL, device index, or a video file replayed at its frame rate
+        output_path: Path for the annotated output video (inferred frames only,
+            so it plays faster than real time when frames are skipped)
+        duration: Stop after this many seconds (None: until the stream ends or Ctrl+C)
+        target_latency: Capture-to-result latency in seconds (default config.LIVE_TARGET_LATENCY_MS)
+        backend: Inference backend ('torch', 'onnx', 'openvino'; default from config)
+    """
+    from utils.live import AdaptiveStride, LatestFrameReader, live_frames
+    
+    print(f"\n{'='*70}")
+    print(f"GSE Detection v11 - Live Stream Demo")
+    print(f"{'='*70}\n")
+    
+    detector = GSEDetector(backend=backend, warmup=True)
+    
+    reader = LatestFrameReader(source)
+    try:
+        reader.start()
+    except IOError as e:
+        print(f"❌ {e}")
+        return
+    print(f"📡 Live source: {source}")
+    print(f"   FPS: {reader.fps:.1f} | Size: {reader.width}x{reader.height}")
+    
+    writer = None
+    if output_path:
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        writer = cv2.VideoWriter(output_path, fourcc, reader.fps, (reader.width, reader.height))
+        print(f"📝 Output will be saved to: {output_path}")
+    
+    # Stride = frames arriving during one inference (skipping more would not lower latency)
+    stride = AdaptiveStride(target_latency, frame_interval=1 / reader.fps)
+    inferred = 0
+    detected_count = 0
+    latency_sum = 0.0
+    print(f"\n🔍 Processing stream (target latency {stride.target_latency * 1000:.0f} ms, Ctrl+C to stop)...")
+    start_time = time.perf_counter()
+    try:
+        for frame_idx, capture_time, frame in live_frames(reader, stride, duration):
+            infer_start = time.perf_counter()
+            results = detector.detect(frame)
+            detected_count += len(results[0].boxes)
+            if writer:
+                frame = detector.draw_detections(frame, results)
+                with METRICS.timer('writing'):
+                    writer.write(frame)
+            inferred += 1
+            METRICS.count('frames')
+            
+            latency = time.time() - capture_time
+            latency_sum += latency
+            stride.update(latency, time.perf_counter() - infer_start)
+            if inferred % 30 == 0:
+                print(f"   Frame {frame_idx} | Objects: {len(results[0].boxes)} | "
+                      f"stride {stride.stride} | latency {stride.latency * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped")
+    finally:
+        reader.stop()
+        if writer:
+            writer.release()
+    elapsed = time.perf_counter() - start_time
+    
+    if reader.error:
+        print(f"⚠️  Stream ended: {reader.error}")
+    print(f"\n✅ Live processing finished in {elapsed:.1f}s")
+    print(f"   Frames: {inferred} inferred / {reader.captured} captured "
+          f"({reader.dropped} dropped, {reader.reconnects} reconnects)")
+    print(f"   Objects detected: {detected_count}")
+    if inferred:
+        print(f"   Mean latency: {latency_sum / inferred * 1000:.0f} ms "
+              f"({stride.over_target} frames over the {stride.target_latency * 1000:.0f} ms target)")
     if output_path:
         print(f"   Output saved: {output_path}")
 
@@ -151,23 +466,117 @@ Examples:
   python quick_demo.py --image path/to/image.jpg
   python quick_demo.py --video path/to/video.mp4
   python quick_demo.py --video path/to/video.mp4 --output result.mp4 --skip 2
+  python quick_demo.py --video path/to/video.mp4 --batch 8
+  python quick_demo.py --video path/to/video.mp4 --output result.mp4 --pipeline
+  python quick_demo.py --video path/to/video.mp4 --output result.mp4 --motion-gate
+  python quick_demo.py --video path/to/4k.mp4 --tiled --camera stand_12
+  python quick_demo.py --video path/to/4k.mp4 --tiled --roi 0.25,0.4,0.9,1.0
+  python quick_demo.py --video path/to/video.mp4 --backend onnx
+  python quick_demo.py --video path/to/4k.mp4 --decoder pyav --decode-size --batch 4
+  python quick_demo.py --streams rtsp://cam1/stream rtsp://cam2/stream cam3.mp4 --batch 8
+  python quick_demo.py --live rtsp://192.168.1.20:554/stream1 --duration 60 --output live.mp4
+  python quick_demo.py --video path/to/video.mp4 --metrics-log metrics.jsonl --metrics-file gse.prom
         """
     )
     
     parser.add_argument('--image', type=str, help='Path to input image')
     parser.add_argument('--video', type=str, help='Path to input video')
+    parser.add_argument('--streams', type=str, nargs='+', default=None,
+                        help='Several stream URLs / device indices / files detected concurrently '
+                             '(frames are batched across streams, late frames dropped)')
+    parser.add_argument('--live', type=str, default=None,
+                        help='Live stream URL, device index, or video file replayed in real time '
+                             '(newest frame wins, adaptive stride, auto-reconnect)')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='Stop live mode after this many seconds')
+    parser.add_argument('--target-latency', type=float, default=None,
+                        help=f'Live mode target latency in ms (default {config.LIVE_TARGET_LATENCY_MS})')
     parser.add_argument('--output', type=str, default=None, help='Output video path')
     parser.add_argument('--skip', type=int, default=1, help='Skip N frames for speed')
+    parser.add_argument('--batch', type=int, default=1,
+                        help='Frames per forward pass in video mode (batched inference)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Overlap decoding, inference, drawing and encoding on separate threads')
+    parser.add_argument('--queue-size', type=int, default=4,
+                        help='Batches buffered between pipeline stages (default: 4)')
+    parser.add_argument('--motion-gate', action='store_true',
+                        help='Skip inference on static frames and reuse the previous detections')
+    parser.add_argument('--tiled', action='store_true',
+                        help='Tiled inference on overlapping config.TILE_SIZE tiles with cross-tile NMS')
+    parser.add_argument('--roi', type=str, default=None,
+                        help='Rectangular ROI as normalized x1,y1,x2,y2 (e.g. 0.25,0.4,0.9,1.0)')
+    parser.add_argument('--camera', type=str, default=None,
+                        help='Use the ROI polygons configured for this camera in config.CAMERA_ROIS')
+    parser.add_argument('--backend', choices=['torch', 'onnx', 'openvino'], default=None,
+                        help=f'Inference backend (default: {config.BACKEND}); exports are cached next to the weights')
+    parser.add_argument('--decoder', choices=['opencv', 'pyav', 'auto'], default=None,
+                        help=f'Video decoder (default: {config.DECODE_BACKEND}; pyav needs pip install av)')
+    parser.add_argument('--decode-size', action='store_true',
+                        help='Decode straight to the model input size (skips the full-size '
+                             'resize; output video is written at that size)')
+    parser.add_argument('--metrics-log', type=str, default=None,
+                        help='Append per-stage timing (decode, inference, NMS, drawing, writing) to a JSON-lines log')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                        help='Write the metrics in Prometheus text format to this file')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on http://127.0.0.1:<port>/metrics')
     
     args = parser.parse_args()
     
+    if args.batch < 1:
+        parser.error(f"--batch must be >= 1, got {args.batch}")
+    if args.queue_size < 1:
+        parser.error(f"--queue-size must be >= 1, got {args.queue_size}")
+    if args.duration is not None and args.duration <= 0:
+        parser.error(f"--duration must be > 0, got {args.duration}")
+    if args.target_latency is not None and args.target_latency <= 0:
+        parser.error(f"--target-latency must be > 0, got {args.target_latency}")
+    
+    rois = None
+    if args.decode_size and args.tiled:
+        parser.error("--decode-size cannot be combined with --tiled (tiles need full resolution)")
+    if args.roi and args.camera:
+        parser.error("--roi and --camera are mutually exclusive")
+    if args.roi:
+        try:
+            coords = [float(v) for v in args.roi.split(',')]
+            if len(coords) != 4:
+                raise ValueError(f"got {len(coords)} values")
+            rois = rect_roi(*coords)
+        except ValueError as e:
+            parser.error(f"--roi expects normalized x1,y1,x2,y2: {e}")
+    elif args.camera:
+        try:
+            rois = camera_rois(args.camera)
+        except KeyError as e:
+            parser.error(str(e.args[0]))
+    
+    # Any metrics output turns on stage timing (off by default, near-zero cost)
+    if args.metrics_log or args.metrics_file or args.metrics_port:
+        configure_metrics(True)
+    if args.metrics_port:
+        METRICS.serve(args.metrics_port)
+        print(f"📈 Metrics endpoint: http://127.0.0.1:{args.metrics_port}/metrics")
+    
     if args.image:
-        detect_image(args.image)
+        detect_image(args.image, rois=rois, tiled=args.tiled, backend=args.backend)
+    elif args.live is not None:
+        detect_live(args.live, args.output, duration=args.duration,
+                    target_latency=args.target_latency / 1000 if args.target_latency else None,
+                    backend=args.backend)
+    elif args.streams:
+        detect_streams(args.streams, batch_size=args.batch if args.batch > 1 else None,
+                       backend=args.backend)
     elif args.video:
-        detect_video(args.video, args.output, args.skip)
+        detect_video(args.video, args.output, args.skip, args.batch,
+                     pipeline=args.pipeline, queue_size=args.queue_size,
+                     motion_gate=args.motion_gate, rois=rois, tiled=args.tiled,
+                     backend=args.backend, metrics_log=args.metrics_log,
+                     metrics_file=args.metrics_file, decoder=args.decoder,
+                     decode_size=args.decode_size)
     else:
         parser.print_help()
-        print("\n❌ Please provide either --image or --video argument")
+        print("\n❌ Please provide --image, --video, --streams or --live")
 
 
 if __name__ == '__main__':
@@ -7,17 +7,34 @@
 使用方法:
     python save_tracks.py
     python save_tracks.py --video H:/GSE论文资料/实验/video_data
+    python save_tracks.py --live rtsp://192.168.1.20:554/stream1
 """
 
 import cv2
+import os
 import sys
+import time
+import pickle
 import argparse
+from contextlib import nullcontext
 import glob
 from pathlib import Path
 from tqdm import tqdm
 
-from ultralytics import YOLO
 import config
+from utils.det_cache import DetectionRecorder, default_cache as default_det_cache, model_input_size
+from utils.discovery import find_videos
+from utils.instrumentation import METRICS, JsonlLog, configure as configure_metrics, video_record
+from utils.live import AdaptiveStride, LatestFrameReader, TimestampWriter, live_frames, source_name
+from utils.manifest import STATUS_LABELS_CN, Manifest, plan_videos, run_params
+from utils.model_registry import get_model, warmup
+from utils.mot_io import MOTWriter
+from utils.motion import MotionGate
+from utils.parallel import run_sharded, default_threads_per_worker
+from utils.track_store import TrackStoreWriter
+from utils.video_io import open_video
+from utils.video_meta import probe_video, record_frame_count
+from utils.tracking import FrameTracker
 
 
 class TrackingSaver:
@@ -26,37 +43,71 @@ class TrackingSaver:
     基于 YOLOv11 + ByteTrack 提取追踪信息并保存为 MOT 格式
     """
     
-    # MOT Challenge 标注格式
-    MOT_FORMAT = "{frame_idx},{track_id},{x1:.2f},{y1:.2f},{w:.2f},{h:.2f},{conf:.2f},{class_id},-1,-1\n"
+    # 检查点文件格式版本
+    CHECKPOINT_VERSION = 2
     
-    def __init__(self, model_path=None, output_dir="data/result"):
+    def __init__(self, model_path=None, output_dir="data/result", progress=True, columnar=False,
+                 checkpoint_interval=None, motion_gate=False, metrics_log=None, metrics_file=None,
+                 tracker="bytetrack.yaml", det_cache=True, classes=None):
         """
         初始化保存器
         
         Args:
             model_path: 模型路径，默认使用 config.MODEL_PATH
             output_dir: 输出目录
+            progress: 是否显示逐帧进度条 (多进程模式下关闭)
+            columnar: 是否同时输出列式二进制轨迹 (<视频名>.tracks 目录)
+            checkpoint_interval: 检查点间隔帧数 (默认 config.CHECKPOINT_INTERVAL，0 表示关闭)
+            motion_gate: 画面静止时跳过推理，沿用上一帧的轨迹
+            metrics_log: 每个视频的分阶段耗时 JSON-lines 日志路径 (需启用 instrumentation)
+            metrics_file: 每个视频处理完后写入的 Prometheus 文本文件路径
+            tracker: 追踪器，ultralytics 配置 (bytetrack.yaml 等) 或 "native"
+                (utils/bytetrack.py 向量化 ByteTrack，参数取自 config.TRACK_*)
+            det_cache: 使用检测缓存 (config.DETECTION_CACHE_DIR)，同一视频/权重重跑时
+                不再推理，只按新的置信度阈值和追踪器重放缓存的检测框
+            classes: 只检测/追踪这些类别 ID (None 表示全部)；其他类别在推理内部
+                (NMS 之前) 即被排除
         """
         self.model_path = model_path or config.MODEL_PATH
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.progress = progress
+        self.columnar = columnar
+        self.checkpoint_interval = (config.CHECKPOINT_INTERVAL if checkpoint_interval is None
+                                    else checkpoint_interval)
+        self.motion_gate = motion_gate
+        self.tracker_cfg = tracker
+        self.det_cache = default_det_cache() if det_cache else None
+        self.classes = classes
+        self.metrics_log = JsonlLog(metrics_log) if metrics_log else None
+        self.metrics_file = metrics_file
+        
+        # 最近一次 process_video 的统计信息 (帧数, 检测数, 实际推理帧数, 分阶段耗时)
+        self.last_stats = {'frames': 0, 'detections': 0, 'inferred': 0, 'metrics': None}
         
         print(f"📦 加载模型: {self.model_path}")
-        self.model = YOLO(self.model_path)
+        # 同一进程内相同权重只加载一次 (ultralytics/torch 也在此时才导入)
+        self.model = get_model(self.model_path, backend="torch", precision="fp32")
         print(f"✅ 模型加载成功")
         
         # 类别映射
         self.class_names = self.model.names
+        # 推理尺寸 (检测缓存键的一部分)
+        self.imgsz = model_input_size(self.model)
         print(f"📊 检测类别: {list(self.class_names.values())}")
         print(f"📁 输出目录: {self.output_dir.absolute()}\n")
     
-    def process_video(self, video_path, conf_threshold=0.1):
+    def process_video(self, video_path, conf_threshold=0.1, resume=False):
         """
         处理单个视频并保存追踪信息
         
+        每隔 checkpoint_interval 帧保存一次检查点 (<视频名>.ckpt)，记录已写入的帧数、
+        ByteTrack 追踪器状态和输出文件字节偏移；处理完成后自动删除。
+        
         Args:
             video_path: 输入视频路径
             conf_threshold: 置信度阈值
+            resume: 若存在匹配的检查点，则从中断处继续 (追踪 ID 保持一致)
         
         Returns:
             (是否成功, 输出文件路径)
@@ -69,110 +120,387 @@ class TrackingSaver:
         
         # 确定输出路径（视频同名，保存在 output_dir 下）
         output_path = self.output_dir / f"{video_file.stem}.txt"
+        checkpoint_path = output_path.with_suffix('.ckpt')
         
         print(f"  📹 处理视频: {video_file.name}")
         print(f"     → 输出: {output_path.name}")
         
-        # 打开视频获取属性
-        cap = cv2.VideoCapture(str(video_path))
-        if not cap.isOpened():
+        # 打开视频获取属性 (同一个句柄随后用于逐帧解码；解码器见 config.DECODE_BACKEND，帧缓冲循环复用)
+        try:
+            cap = open_video(video_path)
+        except IOError:
             print(f"  ❌ 错误: 无法打开视频")
             return False, None
         
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        cap.release()
+        # 元信息优先取自缓存 (config.VIDEO_META_CACHE)；帧数在完整解码一遍后校正为实际帧数
+        width, height, fps, total_frames, _ = probe_video(video_path, cap)
         
         print(f"     视频: {width}x{height}, {fps:.1f}fps, {total_frames} 帧")
         
+        # 分阶段耗时 (解码/推理/NMS/追踪/写入) 从此处开始计入本视频
+        metrics_start = METRICS.snapshot()
+        start_time = time.perf_counter()
+        
+        checkpoint = None
+        if resume:
+            checkpoint = self._load_checkpoint(checkpoint_path, video_file, output_path, conf_threshold)
+        
+        # 检测缓存: 命中时不解码、不推理，直接按当前阈值重放缓存的检测框；未命中时以
+        # config.DETECTION_CACHE_CONF 推理并记录完整一遍的检测 (运动门控/断点续跑不记录)
+        cached = recorder = None
+        if (self.det_cache is not None and not self.motion_gate and checkpoint is None
+                and conf_threshold >= self.det_cache.conf_floor):
+            cached = self.det_cache.load(video_path, self.model_path, self.imgsz, conf_threshold,
+                                         self.classes)
+            if cached is not None:
+                cap.release()
+                cap = cached.reader()
+                print(f"     ⚡ 检测缓存命中 ({len(cached)} 个检测框)，跳过解码和推理")
+            else:
+                recorder = DetectionRecorder(self.det_cache.conf_floor)
+        
+        # 每个视频使用独立的追踪器，追踪 ID 从 1 开始
+        gate = MotionGate() if self.motion_gate else None
+        tracker = FrameTracker(self.model, conf_threshold, tracker_cfg=self.tracker_cfg, gate=gate,
+                               detections=cached, recorder=recorder, classes=self.classes)
+        
         # 运行推理和追踪
         tracked_count = 0
         frame_count = 0
         
-        with open(output_path, 'w') as f:
-            # 使用 model.track() 进行推理和追踪
-            # 注意：对于每个新视频，都会重新初始化追踪，帧号自动从 0 开始
-            results = self.model.track(
-                source=str(video_path),
-                tracker="bytetrack.yaml",
-                persist=True,
-                conf=conf_threshold,
-                stream=True,
-                verbose=False
-            )
+        if checkpoint is not None:
+            frame_count = checkpoint['frame']
+            tracked_count = checkpoint['detections']
+            tracker.load_state_dict(checkpoint['tracker'])
+            
+            # 丢弃检查点之后写入的内容
+            with open(output_path, 'r+b') as f:
+                f.truncate(checkpoint['offset'])
             
+            cap = self._seek(cap, video_path, frame_count)
+            if cap is None:
+                print(f"  ❌ 错误: 无法定位到第 {frame_count + 1} 帧")
+                return False, None
+            print(f"     ⏩ 从检查点恢复: 第 {frame_count + 1} 帧起 (已有 {tracked_count} 个检测)")
+        
+        # 可选: 同时输出列式二进制轨迹 (<输出文件名>.tracks 目录)
+        store_writer = nullcontext()
+        if self.columnar:
+            store_writer = TrackStoreWriter(
+                output_path.with_suffix('.tracks'),
+                state=checkpoint['store'] if checkpoint is not None else None
+            )
+        
+        with MOTWriter(output_path, mode='a' if checkpoint is not None else 'w') as writer, \
+                store_writer as store:
             # 使用进度条处理每一帧
-            pbar = tqdm(results, total=total_frames, desc="     处理帧", 
-                       leave=False, ncols=80)
-            for frame_idx, r in enumerate(pbar):
-                frame_count += 1
+            pbar = tqdm(total=total_frames, initial=frame_count, desc="     处理帧",
+                        leave=False, ncols=80, disable=not self.progress)
+            while True:
+                with METRICS.timer('decode'):
+                    ret, frame = cap.read()
+                if not ret:
+                    break
+                
+                # 推理并关联已有轨迹
+                tracks = tracker.update(frame)
+                frame_count += 1  # frame_count 即 MOT 帧号 (从 1 开始)
+                METRICS.count('frames')
+                pbar.update(1)
                 
-                # 检查是否有检测结果和追踪 ID
-                if r.boxes is not None and r.boxes.id is not None:
-                    # 提取检测信息
-                    boxes = r.boxes.xywh.cpu().numpy()  # 中心坐标 (xc, yc, w, h)
-                    track_ids = r.boxes.id.int().cpu().numpy()
-                    confidences = r.boxes.conf.cpu().numpy()
-                    class_ids = r.boxes.cls.int().cpu().numpy()
+                # 检查是否有追踪结果
+                if tracks is not None:
+                    boxes, track_ids, confidences, class_ids = tracks
                     
-                    # 逐个目标写入标注
-                    for box, track_id, conf, class_id in zip(boxes, track_ids, confidences, class_ids):
-                        # 提取坐标和尺寸
-                        x_center, y_center, w, h = box
-                        
-                        # 转换为左上角坐标 (MOT 标准)
-                        x1 = x_center - w / 2
-                        y1 = y_center - h / 2
-                        
-                        # 写入 MOT Challenge 格式
-                        # frame_idx 从 1 开始计数 (MOT 标准)
-                        line = self.MOT_FORMAT.format(
-                            frame_idx=frame_idx + 1,      # 帧号 (从 1 开始)
-                            track_id=int(track_id),        # 追踪 ID
-                            x1=x1,                         # 左上角 x
-                            y1=y1,                         # 左上角 y
-                            w=w,                           # 宽度
-                            h=h,                           # 高度
-                            conf=conf,                     # 置信度
-                            class_id=int(class_id)         # 类别 ID
+                    # 整帧写入 MOT Challenge 格式 (中心坐标在写入时转换为左上角坐标)
+                    with METRICS.timer('writing'):
+                        written = writer.write_frame(
+                            frame_count, boxes, track_ids, confidences, class_ids
                         )
-                        f.write(line)
-                        tracked_count += 1
+                        if store is not None:
+                            store.write_frame(frame_count, boxes, track_ids, confidences, class_ids)
+                    tracked_count += written
+                    METRICS.count('detections', written)
+                
+                # 定期保存检查点
+                if self.checkpoint_interval and frame_count % self.checkpoint_interval == 0:
+                    self._save_checkpoint(checkpoint_path, {
+                        'version': self.CHECKPOINT_VERSION,
+                        'video_size': video_file.stat().st_size,
+                        'video_mtime': video_file.stat().st_mtime,
+                        'conf': conf_threshold,
+                        'columnar': self.columnar,
+                        'motion_gate': self.motion_gate,
+                        'tracker_cfg': self.tracker_cfg,
+                        'classes': self.classes,
+                        'frame': frame_count,
+                        'detections': tracked_count,
+                        'offset': writer.tell(),
+                        'tracker': tracker.state_dict(),
+                        'store': store.state() if store is not None else None,
+                    })
+            pbar.close()
         
+        cap.release()
+        
+        # 已解码到流末尾: 记录实际帧数 (容器头中的帧数可能不准，如 .webm)
+        if frame_count != total_frames:
+            print(f"     ℹ️  实际帧数 {frame_count} (容器头记录 {total_frames})")
+        record_frame_count(video_path, frame_count)
+        if recorder is not None:
+            self.det_cache.save(video_path, self.model_path, self.imgsz, recorder, width, height, fps,
+                                self.classes)
+        
+        # 处理完成，检查点不再需要
+        if checkpoint_path.exists():
+            checkpoint_path.unlink()
+        
+        # 运动门控的计数随检查点一起恢复，因此覆盖整个视频
+        inferred = tracker.gate.inferred if tracker.gate is not None else frame_count
+        if cached is not None:
+            inferred = 0
+        video_metrics = METRICS.since(metrics_start) if METRICS.enabled else None
+        self.last_stats = {'frames': frame_count, 'detections': tracked_count, 'inferred': inferred,
+                           'metrics': video_metrics}
         print(f"     ✅ 完成: {tracked_count} 个检测 | {frame_count} 帧")
+        if tracker.gate is not None:
+            print(f"     🎯 运动门控: 推理 {inferred}/{frame_count} 帧 "
+                  f"(跳过 {tracker.gate.stats()['skip_ratio']:.0%})")
+        
+        # 分阶段耗时: JSON-lines 日志 (每个视频一行) 和 Prometheus 文本文件
+        if video_metrics is not None:
+            if self.metrics_log is not None:
+                self.metrics_log.write(video_record(
+                    video_file, video_metrics, time.perf_counter() - start_time,
+                    output=str(output_path), frames=frame_count, detections=tracked_count,
+                    inferred=inferred, resumed=checkpoint is not None
+                ))
+            if self.metrics_file:
+                METRICS.write_prometheus(self.metrics_file)
         return True, str(output_path)
     
-    def process_videos_batch(self, video_dir, conf_threshold=0.1):
+    def process_live(self, source, conf_threshold=0.1, duration=None, name=None,
+                     target_latency=None, realtime=True):
         """
-        批量处理视频目录
+        实时处理直播流 (RTSP/HTTP/摄像头) 并逐帧写出追踪信息
+        
+        采集线程只保留最新一帧，推理跟不上时丢弃旧帧；根据采集到出结果的延迟
+        自动调整推理步长 (每 N 帧推理一次)，保持在目标延迟附近。流中断或卡顿时
+        自动重连。每帧结果立即写入 MOT 文件 (帧号为流中的采集帧号)，并在
+        <名称>.timestamps.csv 中记录每帧的采集时间和出结果时间 (Unix 时间)。
         
         Args:
-            video_dir: 视频目录路径
+            source: 流地址、摄像头编号或视频文件 (文件按原始帧率回放，用于离线测试)
             conf_threshold: 置信度阈值
+            duration: 最长运行秒数 (None 表示直到流结束或 Ctrl+C)
+            name: 输出文件名 (默认由流地址生成)
+            target_latency: 目标延迟秒数 (默认 config.LIVE_TARGET_LATENCY_MS)
+            realtime: 视频文件是否按原始帧率回放
         
         Returns:
-            (成功数, 失败数, 输出文件列表)
+            (是否成功, 输出文件路径)
         """
-        video_dir = Path(video_dir)
-        if not video_dir.exists():
-            print(f"❌ 错误: 目录不存在: {video_dir}")
-            return 0, 0, []
+        name = name or source_name(source)
+        output_path = self.output_dir / f"{name}.txt"
+        timestamps_path = self.output_dir / f"{name}.timestamps.csv"
         
-        # 查找所有视频文件
-        video_files = []
-        for ext in ['*.webm', '*.mp4', '*.avi', '*.mov']:
-            video_files.extend(video_dir.glob(f"**/{ext}"))
-            video_files.extend(video_dir.glob(f"**/{ext.upper()}"))
+        print(f"  📡 实时流: {source}")
+        print(f"     → 输出: {output_path.name} (+ {timestamps_path.name})")
         
-        video_files = sorted(list(set(video_files)))  # 去重并排序
+        # 首帧不承担模型初始化开销，否则启动时延迟偏高、步长被拉大
+        warmup(self.model)
         
-        if not video_files:
-            print(f"❌ 错误: 未找到视频文件 ({video_dir})")
-            return 0, 0, []
+        reader = LatestFrameReader(source, realtime=realtime)
+        try:
+            reader.start()
+        except IOError as e:
+            print(f"  ❌ 错误: {e}")
+            return False, None
+        print(f"     流: {reader.width}x{reader.height}, {reader.fps:.1f}fps")
         
-        print(f"🎬 找到 {len(video_files)} 个视频文件\n")
+        # 步长 = 一次推理期间到达的帧数 (延迟由推理耗时决定，跳更多帧不会降低延迟)
+        stride = AdaptiveStride(target_latency, frame_interval=1 / reader.fps)
+        tracker = FrameTracker(self.model, conf_threshold, tracker_cfg=self.tracker_cfg,
+                               gate=MotionGate() if self.motion_gate else None, classes=self.classes)
+        frame_count = 0
+        tracked_count = 0
+        latency_sum = 0.0
+        
+        try:
+            # flush_lines=1: 每帧结果立即落盘，下游可边写边读
+            with MOTWriter(output_path, flush_lines=1) as writer, \
+                    TimestampWriter(timestamps_path) as timestamps:
+                for frame_idx, capture_time, frame in live_frames(reader, stride, duration):
+                    infer_start = time.perf_counter()
+                    tracks = tracker.update(frame)
+                    frame_count += 1
+                    METRICS.count('frames')
+                    
+                    if tracks is not None:
+                        boxes, track_ids, confidences, class_ids = tracks
+                        with METRICS.timer('writing'):
+                            written = writer.write_frame(
+                                frame_idx, boxes, track_ids, confidences, class_ids
+                            )
+                        tracked_count += written
+                        METRICS.count('detections', written)
+                    
+                    # 延迟 = 采集到结果落盘；步长按本帧处理耗时与帧间隔调整
+                    result_time = time.time()
+                    timestamps.write(frame_idx, capture_time, result_time)
+                    latency = result_time - capture_time
+                    latency_sum += latency
+                    stride.update(latency, time.perf_counter() - infer_start)
+                    
+                    if self.progress and frame_count % 100 == 0:
+                        print(f"     帧 {frame_idx}: 推理 {frame_count} 帧, 步长 {stride.stride}, "
+                              f"延迟 {stride.latency * 1000:.0f}ms, 重连 {reader.reconnects} 次")
+        except KeyboardInterrupt:
+            print(f"\n     ⏹️  已停止 (Ctrl+C)")
+        finally:
+            reader.stop()
+        
+        mean_latency = latency_sum / frame_count if frame_count else 0.0
+        self.last_stats = {'frames': frame_count, 'detections': tracked_count,
+                           'inferred': tracker.gate.inferred if tracker.gate is not None else frame_count,
+                           'metrics': None, 'captured': reader.captured,
+                           'reconnects': reader.reconnects, 'mean_latency': mean_latency,
+                           'over_target': stride.over_target}
+        if reader.error:
+            print(f"  ⚠️  流已中断: {reader.error}")
+        print(f"     ✅ 完成: {tracked_count} 个检测 | 推理 {frame_count}/{reader.captured} 帧 | "
+              f"平均延迟 {mean_latency * 1000:.0f}ms | 重连 {reader.reconnects} 次")
+        if stride.over_target:
+            print(f"     ⚠️  {stride.over_target} 帧超过目标延迟 {stride.target_latency * 1000:.0f}ms "
+                  f"(延迟由推理耗时决定，需更快的后端或更小的输入尺寸)")
+        if self.metrics_file and METRICS.enabled:
+            METRICS.write_prometheus(self.metrics_file)
+        return True, str(output_path)
+    
+    def _load_checkpoint(self, checkpoint_path, video_file, output_path, conf_threshold):
+        """
+        读取并校验检查点
+        
+        Returns:
+            检查点字典；不存在或与当前视频/参数不匹配时返回 None (从头处理)
+        """
+        if not checkpoint_path.exists():
+            return None
+        
+        try:
+            with open(checkpoint_path, 'rb') as f:
+                checkpoint = pickle.load(f)
+        except Exception as e:
+            print(f"     ⚠️  检查点无法读取，从头开始: {e}")
+            return None
+        
+        stat = video_file.stat()
+        mismatch = None
+        if checkpoint.get('version') != self.CHECKPOINT_VERSION:
+            mismatch = "检查点版本不同"
+        elif (checkpoint['video_size'], checkpoint['video_mtime']) != (stat.st_size, stat.st_mtime):
+            mismatch = "视频文件已变化"
+        elif checkpoint['conf'] != conf_threshold:
+            mismatch = f"置信度阈值不同 ({checkpoint['conf']})"
+        elif checkpoint['columnar'] != self.columnar:
+            mismatch = "--columnar 设置不同"
+        elif checkpoint['motion_gate'] != self.motion_gate:
+            mismatch = "--motion-gate 设置不同"
+        elif checkpoint.get('tracker_cfg', "bytetrack.yaml") != self.tracker_cfg:
+            mismatch = f"追踪器不同 ({checkpoint.get('tracker_cfg', 'bytetrack.yaml')})"
+        elif checkpoint.get('classes') != self.classes:
+            mismatch = f"--classes 设置不同 ({checkpoint.get('classes')})"
+        elif not output_path.exists() or output_path.stat().st_size < checkpoint['offset']:
+            mismatch = "输出文件缺失或不完整"
+        
+        if mismatch:
+            print(f"     ⚠️  检查点不可用 ({mismatch})，从头开始")
+            return None
+        return checkpoint
+    
+    @staticmethod
+    def _save_checkpoint(checkpoint_path, checkpoint):
+        """原子写入检查点 (先写临时文件再替换，避免中断时损坏)"""
+        tmp_path = checkpoint_path.with_suffix('.ckpt.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(checkpoint, f)
+        os.replace(tmp_path, checkpoint_path)
+    
+    @staticmethod
+    def _seek(cap, video_path, frame_idx):
+        """
+        定位到指定帧 (下一次 read() 返回第 frame_idx 帧，从 0 开始)
+        
+        Returns:
+            定位后的 VideoReader；失败时返回 None
+        """
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == frame_idx:
+            return cap
+        
+        # 部分容器 (如 .webm) 或解码器 (PyAV) 不支持精确定位，退回到从头逐帧跳过
+        cap.release()
+        try:
+            cap = open_video(video_path, backend=cap.backend)
+        except IOError:
+            return None
+        for _ in range(frame_idx):
+            if not cap.grab():
+                cap.release()
+                return None
+        return cap
+    
+    @staticmethod
+    def find_videos(video_dir):
+        """
+        递归查找目录下的所有视频文件 (单次遍历，扩展名不区分大小写，目录列表可缓存)
+        
+        Args:
+            video_dir: 视频目录路径
+        
+        Returns:
+            排序后的视频文件列表
+        """
+        return find_videos(video_dir)
+    
+    @staticmethod
+    def output_paths(video_file, output_dir, columnar=False):
+        """
+        视频对应的输出文件 (<视频名>.txt，以及可选的 <视频名>.tracks 目录)
+        """
+        output_path = Path(output_dir) / f"{Path(video_file).stem}.txt"
+        return [output_path, output_path.with_suffix('.tracks')] if columnar else [output_path]
+    
+    def process_videos_batch(self, video_dir, conf_threshold=0.1, resume=False, video_files=None,
+                             manifest=None, params=None):
+        """
+        批量处理视频目录
+        
+        Args:
+            video_dir: 视频目录路径
+            conf_threshold: 置信度阈值
+            resume: 是否从检查点继续未完成的视频
+            video_files: 要处理的视频列表 (默认处理目录下全部视频)
+            manifest: 输出目录清单，每个视频完成后记录 (None 表示不记录)
+            params: 记录到清单中的运行参数 (run_params())
+        
+        Returns:
+            (成功数, 失败数, 输出文件列表)
+        """
+        if video_files is None:
+            video_dir = Path(video_dir)
+            if not video_dir.exists():
+                print(f"❌ 错误: 目录不存在: {video_dir}")
+                return 0, 0, []
+            
+            # 查找所有视频文件
+            video_files = self.find_videos(video_dir)
+            
+            if not video_files:
+                print(f"❌ 错误: 未找到视频文件 ({video_dir})")
+                return 0, 0, []
+            
+            print(f"🎬 找到 {len(video_files)} 个视频文件\n")
         
         # 批量处理
         success_count = 0
@@ -181,11 +509,14 @@ class TrackingSaver:
         
         for idx, video_file in enumerate(video_files, 1):
             print(f"[{idx}/{len(video_files)}]")
-            success, output_path = self.process_video(video_file, conf_threshold)
+            success, output_path = self.process_video(video_file, conf_threshold, resume=resume)
             
             if success:
                 success_count += 1
                 output_files.append(output_path)
+                if manifest is not None:
+                    manifest.record(video_file, params,
+                                    self.output_paths(video_file, self.output_dir, self.columnar))
             else:
                 fail_count += 1
             print()
@@ -193,6 +524,114 @@ class TrackingSaver:
         return success_count, fail_count, output_files
 
 
+def _init_worker_saver(model_path, output_dir, columnar, checkpoint_interval, motion_gate,
+                       instrument, metrics_log, tracker, det_cache, classes):
+    """工作进程初始化: 每个进程只加载一次模型 (各自持有独立的 ByteTrack 状态)"""
+    # 分阶段耗时随结果返回主进程汇总；Prometheus 文件只由主进程写入
+    configure_metrics(instrument)
+    return TrackingSaver(model_path=model_path, output_dir=output_dir, progress=False,
+                         columnar=columnar, checkpoint_interval=checkpoint_interval,
+                         motion_gate=motion_gate, metrics_log=metrics_log, tracker=tracker,
+                         det_cache=det_cache, classes=classes)
+
+
+def _process_in_worker(saver, job):
+    """工作进程任务: 处理单个视频，返回 (是否成功, 输出文件路径, 统计信息)"""
+    video_file, conf_threshold, resume = job
+    success, output_path = saver.process_video(video_file, conf_threshold, resume=resume)
+    return success, output_path, saver.last_stats
+
+
+def process_videos_parallel(video_files, model_path=None, output_dir="data/result",
+                            conf_threshold=0.1, workers=2, threads_per_worker=None,
+                            columnar=False, resume=False, checkpoint_interval=None,
+                            motion_gate=False, metrics_log=None, metrics_file=None,
+                            manifest=None, params=None, tracker="bytetrack.yaml", det_cache=True,
+                            classes=None):
+    """
+    多进程并行处理视频列表
+    
+    每个工作进程加载一次模型，按顺序领取视频处理；结果汇总回主进程。
+    
+    Args:
+        video_files: 视频文件列表
+        model_path: 模型路径，默认使用 config.MODEL_PATH
+        output_dir: 输出目录
+        conf_threshold: 置信度阈值
+        workers: 工作进程数
+        threads_per_worker: 每个进程的线程数 (默认: CPU 核数 / 进程数)
+        columnar: 是否同时输出列式二进制轨迹
+        resume: 是否从检查点继续未完成的视频
+        checkpoint_interval: 检查点间隔帧数 (默认 config.CHECKPOINT_INTERVAL)
+        motion_gate: 画面静止时跳过推理
+        metrics_log: 每个视频的分阶段耗时 JSON-lines 日志 (由工作进程追加)
+        metrics_file: 汇总后的 Prometheus 文本文件 (每完成一个视频更新一次)
+        manifest: 输出目录清单，每个视频完成后由主进程记录 (None 表示不记录)
+        params: 记录到清单中的运行参数 (run_params())
+        tracker: 追踪器，ultralytics 配置或 "native"
+        det_cache: 是否使用检测缓存
+        classes: 只检测/追踪的类别 ID (None 表示全部)
+    
+    Returns:
+        (成功数, 失败数, 输出文件列表)
+    """
+    threads_per_worker = threads_per_worker or default_threads_per_worker(workers)
+    print(f"🚀 并行模式: {workers} 个进程 × {threads_per_worker} 线程\n")
+    
+    success_count = 0
+    fail_count = 0
+    output_files = []
+    total_frames = 0
+    total_detections = 0
+    total_inferred = 0
+    start_time = time.perf_counter()
+    
+    jobs = [(str(video_file), conf_threshold, resume) for video_file in video_files]
+    results = run_sharded(
+        jobs,
+        init_fn=_init_worker_saver,
+        task_fn=_process_in_worker,
+        workers=workers,
+        init_args=(model_path, output_dir, columnar, checkpoint_interval, motion_gate,
+                   METRICS.enabled, metrics_log, tracker, det_cache, classes),
+        threads_per_worker=threads_per_worker
+    )
+    
+    for idx, (job, result, error) in enumerate(results, 1):
+        video_name = Path(job[0]).name
+        if error is not None:
+            print(f"[{idx}/{len(jobs)}] ❌ {video_name}: {error}")
+            fail_count += 1
+            continue
+        
+        success, output_path, stats = result
+        if success:
+            success_count += 1
+            output_files.append(output_path)
+            total_frames += stats['frames']
+            total_detections += stats['detections']
+            total_inferred += stats['inferred']
+            METRICS.merge(stats['metrics'])
+            if metrics_file:
+                METRICS.write_prometheus(metrics_file)
+            if manifest is not None:
+                manifest.record(job[0], params,
+                                TrackingSaver.output_paths(job[0], output_dir, columnar))
+            print(f"[{idx}/{len(jobs)}] ✅ {video_name}: "
+                  f"{stats['detections']} 个检测 | {stats['frames']} 帧")
+        else:
+            fail_count += 1
+            print(f"[{idx}/{len(jobs)}] ❌ {video_name}")
+    
+    elapsed = time.perf_counter() - start_time
+    print(f"\n📊 并行汇总: {total_frames} 帧 | {total_detections} 个检测 | "
+          f"耗时 {elapsed:.1f}s ({total_frames / max(elapsed, 1e-9):.1f} 帧/秒)")
+    if motion_gate:
+        print(f"🎯 运动门控: 推理 {total_inferred}/{total_frames} 帧")
+    
+    return success_count, fail_count, sorted(output_files)
+
+
 def main():
     """
     主函数 - 命令行入口
@@ -213,6 +652,41 @@ def main():
   
   # 使用自定义模型
   python save_tracks.py --video video_dir --model weights/custom_model.pt
+  
+  # 8 个进程并行处理 (每个进程单独加载模型)
+  python save_tracks.py --video video_dir --workers 8
+  
+  # 同时输出列式二进制轨迹 (data/result/<视频名>.tracks)
+  python save_tracks.py --video video_dir --columnar
+  
+  # 中断后从检查点继续 (每 1000 帧保存一次检查点)
+  python save_tracks.py --video video_dir --resume
+  
+  # 运动门控: 画面静止时跳过推理 (停机位大部分时间无变化)
+  python save_tracks.py --video video_dir --motion-gate
+  
+  # 使用项目内置的向量化 ByteTrack (参数取自 config.TRACK_*，可用 python -m utils.bytetrack 离线调参)
+  python save_tracks.py --video video_dir --tracker native
+  
+  # 只检测/追踪 GSE 和 Ground_Crew (类别 ID 见 config.CLASS_NAMES)，飞机框不参与 NMS 和追踪
+  python save_tracks.py --video video_dir --classes 1 2
+  
+  # 检测缓存: 首次运行记录检测框 (data/det_cache)，之后换 --conf 或 --tracker 只重放缓存，不再推理
+  python save_tracks.py --video video_dir --conf 0.3 -o data/result_03 --force
+  
+  # 增量处理: 输出目录清单 (.gse_manifest.json) 记录已处理视频，重跑只处理新增/变化的视频
+  python save_tracks.py --video video_dir --dry-run   # 只列出将要处理的视频
+  python save_tracks.py --video video_dir --force     # 全部重新处理
+  
+  # 分阶段耗时: 每个视频一行 JSON 日志 + Prometheus 指标 (文件或 http://127.0.0.1:9100/metrics)
+  python save_tracks.py --video video_dir --metrics-log data/metrics.jsonl --metrics-file data/gse.prom
+  python save_tracks.py --video video_dir --metrics-port 9100
+  
+  # 实时流: 只处理最新帧，自适应推理步长保持延迟，断流自动重连 (Ctrl+C 停止)
+  python save_tracks.py --live rtsp://192.168.1.20:554/stream1 --duration 3600
+  
+  # 用本地视频按原始帧率回放，离线测试实时模式
+  python save_tracks.py --live video.mp4 --target-latency 300
         """
     )
     
@@ -225,6 +699,40 @@ def main():
                         help='置信度阈值 (默认 0.1，范围 0.0-1.0)')
     parser.add_argument('--model', '-m', type=str, default=None,
                         help='模型路径 (可选，默认使用 config.MODEL_PATH)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='并行工作进程数 (默认 1，即串行处理)')
+    parser.add_argument('--threads-per-worker', type=int, default=None,
+                        help='每个工作进程的线程数 (默认: CPU 核数 / 进程数)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='同时输出列式二进制轨迹 (<视频名>.tracks 目录，可按列/帧范围内存映射读取)')
+    parser.add_argument('--resume', action='store_true',
+                        help='从检查点 (<视频名>.ckpt) 继续未完成的视频，追踪 ID 保持一致')
+    parser.add_argument('--checkpoint-interval', type=int, default=None,
+                        help=f'检查点间隔帧数 (默认 {config.CHECKPOINT_INTERVAL}，0 表示关闭)')
+    parser.add_argument('--motion-gate', action='store_true',
+                        help='画面静止时跳过推理并沿用上一帧轨迹 (阈值见 config.MOTION_GATE_*)')
+    parser.add_argument('--metrics-log', type=str, default=None,
+                        help='每个视频的分阶段耗时 (解码/推理/NMS/追踪/写入) 追加到此 JSON-lines 文件')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                        help='以 Prometheus 文本格式写入指标文件 (每个视频完成后更新)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='在 127.0.0.1:<端口>/metrics 提供 Prometheus 指标')
+    parser.add_argument('--tracker', type=str, default="bytetrack.yaml",
+                        help='追踪器: ultralytics 配置 (默认 bytetrack.yaml) 或 native (向量化 ByteTrack，参数见 config.TRACK_*)')
+    parser.add_argument('--classes', type=int, nargs='+', default=None,
+                        help='只检测/追踪这些类别 ID (默认全部，类别见 config.CLASS_NAMES)')
+    parser.add_argument('--no-det-cache', action='store_true',
+                        help=f'不读写检测缓存 (默认缓存到 {config.DETECTION_CACHE_DIR}，换阈值/追踪器时免推理)')
+    parser.add_argument('--force', '-f', action='store_true',
+                        help='忽略输出目录清单，重新处理所有视频')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='只列出将要处理/跳过的视频及原因，不加载模型')
+    parser.add_argument('--live', type=str, default=None,
+                        help='实时处理直播流 (rtsp://... / 摄像头编号 / 按原始帧率回放的视频文件)，替代 --video')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='实时模式最长运行秒数 (默认直到流结束或 Ctrl+C)')
+    parser.add_argument('--target-latency', type=float, default=None,
+                        help=f'实时模式目标延迟毫秒数 (默认 {config.LIVE_TARGET_LATENCY_MS})')
     
     args = parser.parse_args()
     
@@ -233,8 +741,46 @@ def main():
         print(f"❌ 错误: 置信度阈值必须在 0.0-1.0 之间，得到: {args.conf}")
         return 1
     
-    # 创建保存器
-    saver = TrackingSaver(model_path=args.model, output_dir=args.output)
+    if args.workers < 1:
+        print(f"❌ 错误: 工作进程数必须 >= 1，得到: {args.workers}")
+        return 1
+    
+    if args.duration is not None and args.duration <= 0:
+        print(f"❌ 错误: 运行时长必须 > 0，得到: {args.duration}")
+        return 1
+    
+    if args.target_latency is not None and args.target_latency <= 0:
+        print(f"❌ 错误: 目标延迟必须 > 0，得到: {args.target_latency}")
+        return 1
+    
+    if args.classes is not None:
+        unknown = [c for c in args.classes if c not in config.CLASS_NAMES]
+        if unknown:
+            print(f"❌ 错误: 未知的类别 ID {unknown} (可选: {config.CLASS_NAMES})")
+            return 1
+        args.classes = sorted(set(args.classes))
+    
+    # 任一指标输出选项都会启用分阶段计时 (默认关闭，几乎没有开销)
+    if args.metrics_log or args.metrics_file or args.metrics_port:
+        configure_metrics(True)
+    if args.metrics_port:
+        METRICS.serve(args.metrics_port)
+        print(f"📈 指标端点: http://127.0.0.1:{args.metrics_port}/metrics")
+    
+    if args.live is not None:
+        # 实时模式: 单个流，单进程
+        saver = TrackingSaver(model_path=args.model, output_dir=args.output,
+                              motion_gate=args.motion_gate,
+                              metrics_file=args.metrics_file,
+                              tracker=args.tracker,
+                              classes=args.classes)
+        target_latency = args.target_latency / 1000 if args.target_latency else None
+        ok, output_file = saver.process_live(args.live, conf_threshold=args.conf,
+                                             duration=args.duration,
+                                             target_latency=target_latency)
+        if ok:
+            print(f"\n📄 生成的文件: {output_file}")
+        return 0 if ok else 1
     
     # 判断是文件还是目录
     video_path = Path(args.video)
@@ -243,18 +789,90 @@ def main():
         print(f"❌ 错误: 路径不存在: {args.video}")
         return 1
     
-    # 批量处理
-    success, fail, output_files = saver.process_videos_batch(
-        video_dir=args.video,
-        conf_threshold=args.conf
-    )
+    output_dir = Path(args.output)
+    
+    video_files = TrackingSaver.find_videos(video_path)
+    if not video_files:
+        print(f"❌ 错误: 未找到视频文件 ({video_path})")
+        return 1
+    print(f"🎬 找到 {len(video_files)} 个视频文件")
+    
+    # 增量处理: 对照输出目录清单，只处理新增/内容变化/输出缺失/模型或参数变化的视频
+    manifest = Manifest(output_dir)
+    # 类别过滤只在设置时记录 (未设置时与之前的清单保持一致)
+    params = run_params(args.model, args.conf, args.tracker,
+                        motion_gate=args.motion_gate, columnar=args.columnar,
+                        **({'classes': args.classes} if args.classes is not None else {}))
+    plan = plan_videos(manifest, video_files, params,
+                       lambda v: TrackingSaver.output_paths(v, output_dir, args.columnar),
+                       force=args.force)
+    video_files = [video_file for video_file, _, run in plan if run]
+    skipped = len(plan) - len(video_files)
+    
+    if args.dry_run:
+        print(f"\n📋 预演 (--dry-run): {len(video_files)} 个待处理, {skipped} 个跳过")
+        for video_file, status, run in plan:
+            print(f"   {'▶️  处理' if run else '⏭️  跳过'} {video_file.name}  ({STATUS_LABELS_CN[status]})")
+        return 0
+    
+    if skipped:
+        print(f"⏭️  跳过 {skipped} 个已是最新的视频 (清单: {manifest.path}，--force 全部重新处理)")
+    if not video_files:
+        print(f"✅ 所有视频均已是最新，无需处理")
+        return 0
+    print()
+    
+    if args.workers > 1:
+        # 并行模式: 模型只在工作进程中加载
+        output_dir.mkdir(parents=True, exist_ok=True)
+        success, fail, output_files = process_videos_parallel(
+            video_files,
+            model_path=args.model,
+            output_dir=args.output,
+            conf_threshold=args.conf,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+            columnar=args.columnar,
+            resume=args.resume,
+            checkpoint_interval=args.checkpoint_interval,
+            motion_gate=args.motion_gate,
+            metrics_log=args.metrics_log,
+            metrics_file=args.metrics_file,
+            manifest=manifest,
+            params=params,
+            tracker=args.tracker,
+            det_cache=not args.no_det_cache,
+            classes=args.classes
+        )
+    else:
+        # 创建保存器
+        saver = TrackingSaver(model_path=args.model, output_dir=args.output,
+                              columnar=args.columnar,
+                              checkpoint_interval=args.checkpoint_interval,
+                              motion_gate=args.motion_gate,
+                              metrics_log=args.metrics_log,
+                              metrics_file=args.metrics_file,
+                              tracker=args.tracker,
+                              det_cache=not args.no_det_cache,
+                              classes=args.classes)
+        
+        # 批量处理
+        success, fail, output_files = saver.process_videos_batch(
+            video_dir=args.video,
+            conf_threshold=args.conf,
+            resume=args.resume,
+            video_files=video_files,
+            manifest=manifest,
+            params=params
+        )
     
     # 统计输出
     print(f"\n{'='*70}")
     print(f"📊 处理完成!")
     print(f"   ✅ 成功: {success} 个")
+    print(f"   ⏭️  跳过: {skipped} 个")
     print(f"   ❌ 失败: {fail} 个")
-    print(f"   📁 输出目录: {saver.output_dir.absolute()}")
+    print(f"   📁 输出目录: {output_dir.absolute()}")
     
     if output_files:
         print(f"\n📄 生成的文件:")
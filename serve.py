@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resident inference server for GSE Detection v11
+机场GSE检测 v11 常驻推理服务
+
+Keeps one warm GSEDetector in memory and serves it over localhost HTTP and/or
+a Unix socket (same HTTP API on both). Frames from concurrent requests are
+stacked into shared forward passes (dynamic batching).
+
+API:
+  GET  /health   Model info and batching counters
+  POST /detect   Body: encoded image (JPEG/PNG/BMP)
+                 Query: conf=<float>, format=json|mot, frame=<MOT frame number>
+  POST /video    Body: JSON {"path": "...", "conf": 0.25, "stride": 1,
+                             "max_frames": null, "format": "mot"}
+                 The video is decoded by the server (path on the server host)
+
+JSON results use the get_detections_info() layout; MOT results are
+detection lines with track ID -1 (no tracking).
+"""
+
+import argparse
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+import numpy as np
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.batching import DynamicBatcher
+from utils.detection import GSEDetector
+from utils.mot_io import format_mot_rows
+import config
+
+
+FORMATS = ("json", "mot")
+
+
+def mot_lines(result, frame_number: int):
+    """
+    Format one frame's detections as MOT Challenge lines
+
+    Args:
+        result: ultralytics Results of the frame
+        frame_number: MOT frame number (1-based)
+
+    Returns:
+        MOT text block with track ID -1 on every line
+    """
+    boxes = result.boxes
+    tlwh = boxes.xyxy.cpu().numpy().astype(np.float64)
+    tlwh[:, 2:] -= tlwh[:, :2]
+    n = len(tlwh)
+    return format_mot_rows(np.full(n, frame_number), np.full(n, -1), tlwh,
+                           boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy())
+
+
+class DetectionService:
+    """
+    A GSEDetector behind a DynamicBatcher, shared by all server threads
+    """
+
+    def __init__(self, detector: GSEDetector, max_batch: int = None, max_wait: float = None):
+        """
+        Initialize service
+
+        Args:
+            detector: Loaded detector (ideally warmed up)
+            max_batch: Maximum frames per forward pass (default config.SERVE_MAX_BATCH)
+            max_wait: Seconds to wait for a batch to fill (default config.SERVE_MAX_WAIT_MS)
+        """
+        self.detector = detector
+        self.batcher = DynamicBatcher(self._infer_batch, max_batch, max_wait, name="inference")
+
+    def _infer_batch(self, items):
+        frames = [frame for frame, _ in items]
+        # One pass at the lowest requested threshold; stricter requests are
+        # filtered afterwards with the same strict > that predict(conf=c) applies
+        # (NMS lets higher-confidence boxes win either way)
+        conf = min(c for _, c in items)
+        results = self.detector.detect_batch(frames, batch_size=len(frames), conf_threshold=conf)
+        return [result if c <= conf else result[result.boxes.conf > c]
+                for result, (_, c) in zip(results, items)]
+
+    def submit(self, frame, conf: float = None):
+        """
+        Queue one frame for the next batch
+
+        Args:
+            frame: BGR image
+            conf: Confidence threshold (default from config)
+
+        Returns:
+            Future resolved with the frame's ultralytics Results
+        """
+        return self.batcher.submit((frame, config.CONFIDENCE_THRESHOLD if conf is None else conf))
+
+    def detect(self, frame, conf: float = None):
+        """Detect on one frame (blocks until its batch has run)"""
+        return self.submit(frame, conf).result()
+
+    def detect_video(self, path, conf: float = None, stride: int = 1, max_frames: int = None):
+        """
+        Detect on a video file, keeping a few batches of frames in flight
+
+        Args:
+            path: Video path on the server host
+            conf: Confidence threshold (default from config)
+            stride: Detect on every Nth frame
+            max_frames: Maximum frames detected (None: all)
+
+        Yields:
+            (MOT frame number, Results) in frame order
+        """
+        cap = cv2.VideoCapture(str(path))
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video: {path}")
+
+        # Bounded window: decoding stays ahead of inference without holding
+        # the whole clip in memory
+        window = 2 * self.batcher.max_batch
+        pending = deque()
+        frame_number = 0
+        submitted = 0
+        try:
+            while max_frames is None or submitted < max_frames:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frame_number += 1
+                if (frame_number - 1) % stride:
+                    continue
+                pending.append((frame_number, self.submit(frame, conf)))
+                submitted += 1
+                if len(pending) >= window:
+                    number, future = pending.popleft()
+                    yield number, future.result()
+
+            while pending:
+                number, future = pending.popleft()
+                yield number, future.result()
+        finally:
+            cap.release()
+            for _, future in pending:
+                future.cancel()
+
+    def format(self, result, fmt: str, frame_number: int = 1):
+        """Results -> get_detections_info() list (json) or MOT text (mot)"""
+        if fmt == "mot":
+            return mot_lines(result, frame_number)
+        return self.detector.get_detections_info([result])
+
+    def health(self):
+        """Model info and batching counters"""
+        return {
+            'status': 'ok',
+            'model': str(self.detector.model_path),
+            'backend': self.detector.backend,
+            'precision': self.detector.precision,
+            'classes': self.detector.class_names,
+            'max_batch': self.batcher.max_batch,
+            'max_wait_ms': self.batcher.max_wait * 1000,
+            **self.batcher.stats(),
+        }
+
+    def close(self):
+        """Finish queued frames and stop the batching thread"""
+        self.batcher.close()
+
+
+def _parse_options(conf=None, fmt="json", stride=1, max_frames=None):
+    conf = None if conf in (None, "") else float(conf)
+    if conf is not None and not 0.0 <= conf <= 1.0:
+        raise ValueError(f"conf must be within 0.0-1.0, got {conf}")
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}, got '{fmt}'")
+    stride = int(stride)
+    if stride < 1:
+        raise ValueError(f"stride must be >= 1, got {stride}")
+    max_frames = None if max_frames in (None, "") else int(max_frames)
+    return conf, fmt, stride, max_frames
+
+
+def make_handler(service: DetectionService):
+    """Build the HTTP request handler class bound to a service"""
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive: clients sending many frames reuse one connection
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, status: int, payload):
+            self._send(status, json.dumps(payload).encode(), 'application/json')
+
+        def _send_result(self, fmt: str, payload):
+            if fmt == "mot":
+                self._send(200, payload.encode(), 'text/plain; charset=utf-8')
+            else:
+                self._send_json(200, payload)
+
+        def do_GET(self):
+            if urlparse(self.path).path == '/health':
+                self._send_json(200, service.health())
+            else:
+                self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            try:
+                if url.path == '/detect':
+                    self._detect(body, {k: v[-1] for k, v in parse_qs(url.query).items()})
+                elif url.path == '/video':
+                    self._video(body)
+                else:
+                    self._send_json(404, {'error': f"Unknown endpoint: {url.path}"})
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+            except Exception as e:
+                self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+
+        def _detect(self, body: bytes, query: dict):
+            conf, fmt, _, _ = _parse_options(query.get('conf'), query.get('format', 'json'))
+            frame_number = int(query.get('frame', 1))
+            frame = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                raise ValueError("Request body is not a decodable image")
+
+            result = service.detect(frame, conf)
+            payload = service.format(result, fmt, frame_number)
+            self._send_result(fmt, payload if fmt == "mot" else {'detections': payload})
+
+        def _video(self, body: bytes):
+            try:
+                request = json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON body: {e}")
+            if not request.get('path'):
+                raise ValueError("Missing 'path'")
+            conf, fmt, stride, max_frames = _parse_options(
+                request.get('conf'), request.get('format', 'mot'),
+                request.get('stride', 1), request.get('max_frames')
+            )
+            if not Path(request['path']).is_file():
+                raise ValueError(f"Video not found: {request['path']}")
+
+            frames = [
+                (number, service.format(result, fmt, number))
+                for number, result in service.detect_video(request['path'], conf, stride, max_frames)
+            ]
+            if fmt == "mot":
+                self._send_result(fmt, "".join(lines for _, lines in frames))
+            else:
+                self._send_result(fmt, {'frames': [{'frame': number, 'detections': detections}
+                                                   for number, detections in frames]})
+
+    return Handler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server on a Unix domain socket (one thread per connection)"""
+
+    daemon_threads = True
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="GSE Detection v11 - Resident inference server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Examples:
+  # HTTP on 127.0.0.1:{config.SERVE_PORT}
+  python serve.py
+
+  # Unix socket only, ONNX backend, batches of up to 16 frames
+  python serve.py --port 0 --socket /tmp/gse.sock --backend onnx --max-batch 16
+
+  # Requests
+  curl -s localhost:{config.SERVE_PORT}/health
+  curl -s --data-binary @frame.jpg "localhost:{config.SERVE_PORT}/detect?conf=0.3"
+  curl -s -d '{{"path": "/data/clip.mp4", "format": "mot"}}' localhost:{config.SERVE_PORT}/video
+  curl -s --unix-socket /tmp/gse.sock --data-binary @frame.jpg "http://gse/detect?format=mot"
+
+  # From Python
+  from utils.client import GSEClient
+  detections = GSEClient().detect(frame)
+        """
+    )
+
+    parser.add_argument('--model', '-m', type=str, default=config.MODEL_PATH,
+                        help=f'Model weights (default: {config.MODEL_PATH})')
+    parser.add_argument('--backend', choices=['torch', 'onnx', 'openvino'], default=None,
+                        help=f'Inference backend (default: {config.BACKEND})')
+    parser.add_argument('--precision', choices=['fp32', 'int8'], default=None,
+                        help=f'Numeric precision (default: {config.PRECISION})')
+    parser.add_argument('--host', type=str, default=config.SERVE_HOST,
+                        help=f'HTTP bind address (default: {config.SERVE_HOST})')
+    parser.add_argument('--port', type=int, default=config.SERVE_PORT,
+                        help=f'HTTP port, 0 disables HTTP (default: {config.SERVE_PORT})')
+    parser.add_argument('--socket', type=str, default=None,
+                        help='Also serve the API on this Unix socket path')
+    parser.add_argument('--max-batch', type=int, default=config.SERVE_MAX_BATCH,
+                        help=f'Maximum frames per forward pass (default: {config.SERVE_MAX_BATCH})')
+    parser.add_argument('--max-wait-ms', type=float, default=config.SERVE_MAX_WAIT_MS,
+                        help=f'Wait for a batch to fill after its first frame (default: {config.SERVE_MAX_WAIT_MS})')
+
+    args = parser.parse_args()
+
+    if args.port == 0 and not args.socket:
+        parser.error("Nothing to serve: --port 0 needs --socket")
+    if args.max_batch < 1:
+        parser.error(f"--max-batch must be >= 1, got {args.max_batch}")
+    if args.max_wait_ms < 0:
+        parser.error(f"--max-wait-ms must be >= 0, got {args.max_wait_ms}")
+    if args.socket and not hasattr(socketserver, 'UnixStreamServer'):
+        parser.error("--socket needs Unix domain socket support (not available on this platform)")
+
+    # Per-batch ultralytics log lines would flood the server output
+    os.environ.setdefault("YOLO_VERBOSE", "False")
+
+    detector = GSEDetector(args.model, backend=args.backend, precision=args.precision, warmup=True)
+    service = DetectionService(detector, args.max_batch, args.max_wait_ms / 1000)
+    handler = make_handler(service)
+
+    servers = []
+    if args.port:
+        servers.append(ThreadingHTTPServer((args.host, args.port), handler))
+        print(f"🌐 HTTP: http://{args.host}:{args.port}")
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)  # stale socket from a previous run
+        servers.append(UnixHTTPServer(args.socket, handler))
+        print(f"🔌 Unix socket: {args.socket}")
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"✅ Serving (max batch {args.max_batch}, max wait {args.max_wait_ms:g} ms). Ctrl+C to stop.")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        while not stop.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+
+    print("\n🛑 Shutting down...")
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    service.close()
+    if args.socket and os.path.exists(args.socket):
+        os.unlink(args.socket)
+
+    stats = service.batcher.stats()
+    print(f"   Served {stats['items']} frames in {stats['batches']} batches "
+          f"(mean batch {stats['mean_batch']:.1f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Asyncio interface to GSEDetector for many concurrent camera streams
+
+Inference runs on the DynamicBatcher worker thread, so awaiting a detection
+never blocks the event loop, and frames from all streams that arrive within
+the batching window share one forward pass. Each stream decodes on its own
+thread.
+
+Each stream holds at most STREAM_QUEUE_SIZE decoded frames. When inference
+cannot keep up, the oldest buffered frame is dropped for the newest one, and
+frames older than STREAM_MAX_LAG_MS are dropped before inference, so latency
+stays bounded while throughput is shared across streams.
+"""
+
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+import time
+
+import cv2
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.batching import DynamicBatcher
+from utils.detection import GSEDetector
+
+
+# One detected frame of a stream; timestamp is the time.monotonic() capture time
+StreamResult = namedtuple('StreamResult', 'source frame_index timestamp frame results')
+
+# Marker a stream puts on the output queue when it has ended
+_DONE = object()
+
+
+class StreamStats:
+    """
+    Frame counters for one stream
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.read = 0
+        self.inferred = 0
+        self.dropped_full = 0   # replaced by a newer frame while buffered
+        self.dropped_stale = 0  # older than the lag limit when dequeued
+        self.latency_sum = 0.0  # capture -> result seconds over inferred frames
+
+    @property
+    def dropped(self):
+        return self.dropped_full + self.dropped_stale
+
+    @property
+    def mean_latency(self):
+        return self.latency_sum / self.inferred if self.inferred else 0.0
+
+
+def _open_capture(source):
+    # Numeric strings are local device indices (e.g. "0" for /dev/video0)
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError(f"Failed to open stream: {source}")
+    return cap
+
+
+class AsyncGSEDetector:
+    """
+    Awaitable, batched GSE detection shared by many coroutines
+    """
+
+    def __init__(self, detector: GSEDetector = None, conf_threshold: float = None,
+                 max_batch: int = None, max_wait: float = None, **detector_kwargs):
+        """
+        Initialize async detector
+
+        Args:
+            detector: Loaded GSEDetector (default: built from detector_kwargs)
+            conf_threshold: Confidence threshold (default from config)
+            max_batch: Maximum frames per forward pass (default config.SERVE_MAX_BATCH)
+            max_wait: Seconds to wait for a batch to fill (default config.SERVE_MAX_WAIT_MS)
+            **detector_kwargs: GSEDetector arguments (model_path, device, backend, ...)
+        """
+        self.detector = detector or GSEDetector(**detector_kwargs)
+        self.conf_threshold = conf_threshold
+        self.batcher = DynamicBatcher(self._infer_batch, max_batch, max_wait, name="async-inference")
+        self.stream_stats = {}
+
+    def _infer_batch(self, frames):
+        results = self.detector.detect_batch(frames, batch_size=len(frames),
+                                             conf_threshold=self.conf_threshold)
+        # Same shape as GSEDetector.detect: a list holding one Results per frame
+        return [[result] for result in results]
+
+    async def detect(self, frame):
+        """
+        Detect objects in one frame
+
+        Args:
+            frame: BGR image
+
+        Returns:
+            List holding the frame's ultralytics Results (as GSEDetector.detect)
+        """
+        return await asyncio.wrap_future(self.batcher.submit(frame))
+
+    async def stream(self, sources, realtime: bool = True, queue_size: int = None,
+                     max_lag: float = None, max_frames: int = None):
+        """
+        Detect on several sources at once
+
+        Args:
+            sources: Stream URLs, device indices or video files; a dict maps
+                names to sources (results carry the name)
+            realtime: Pace video files at their frame rate, like a live camera
+                (live sources are always read as fast as they deliver). Files
+                read with realtime=False never drop frames: decoding waits
+                for inference instead
+            queue_size: Frames buffered per stream (default config.STREAM_QUEUE_SIZE)
+            max_lag: Drop frames older than this many seconds before inference
+                (default config.STREAM_MAX_LAG_MS; 0 disables)
+            max_frames: Stop each stream after this many decoded frames (None: until it ends)
+
+        Yields:
+            StreamResult for every inferred frame, in completion order
+        """
+        named = sources if isinstance(sources, dict) else {str(s): s for s in sources}
+        queue_size = queue_size or config.STREAM_QUEUE_SIZE
+        max_lag = config.STREAM_MAX_LAG_MS / 1000 if max_lag is None else max_lag
+
+        # Bounded: a slow consumer of this generator backs up into the
+        # per-stream buffers, where the drop policy applies
+        output = asyncio.Queue(maxsize=2 * len(named))
+        self.stream_stats = {name: StreamStats(name) for name in named}
+        tasks = [
+            asyncio.ensure_future(self._run_stream(name, source, output, realtime,
+                                                   queue_size, max_lag, max_frames))
+            for name, source in named.items()
+        ]
+
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await output.get()
+                if item is _DONE:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_stream(self, name, source, output, realtime, queue_size, max_lag, max_frames):
+        try:
+            await self._detect_stream(name, source, output, realtime, queue_size, max_lag,
+                                      max_frames)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await output.put(e)
+        else:
+            await output.put(_DONE)
+
+    async def _detect_stream(self, name, source, output, realtime, queue_size, max_lag,
+                             max_frames):
+        loop = asyncio.get_running_loop()
+        stats = self.stream_stats[name]
+        buffer = asyncio.Queue(maxsize=queue_size)
+
+        # One decode thread per stream: reads and the final release never overlap
+        decoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"decode-{name}")
+        try:
+            cap = await loop.run_in_executor(decoder, _open_capture, source)
+        except Exception:
+            decoder.shutdown(wait=False)
+            raise
+        is_file = not isinstance(source, int) and Path(str(source)).is_file()
+        paced = realtime and is_file
+        # Only a source with a clock to fall behind (live, or a paced file) drops frames
+        drop_frames = paced or not is_file
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+
+        async def read_frames():
+            start = time.monotonic()
+            try:
+                while max_frames is None or stats.read < max_frames:
+                    ok, frame = await loop.run_in_executor(decoder, cap.read)
+                    if not ok:
+                        break
+                    if paced:
+                        # Replay at the recorded frame rate (a file decodes faster than real time)
+                        due = start + stats.read / fps
+                        await asyncio.sleep(max(0.0, due - time.monotonic()))
+                    stats.read += 1
+                    item = (stats.read, time.monotonic(), frame)
+                    if not drop_frames:
+                        await buffer.put(item)
+                        continue
+                    if buffer.full():
+                        buffer.get_nowait()
+                        stats.dropped_full += 1
+                    buffer.put_nowait(item)
+            finally:
+                await buffer.put(None)
+
+        reader = asyncio.ensure_future(read_frames())
+        try:
+            while True:
+                item = await buffer.get()
+                if item is None:
+                    break
+                frame_index, timestamp, frame = item
+                if drop_frames and max_lag and time.monotonic() - timestamp > max_lag:
+                    stats.dropped_stale += 1
+                    continue
+                results = await self.detect(frame)
+                stats.inferred += 1
+                stats.latency_sum += time.monotonic() - timestamp
+                await output.put(StreamResult(name, frame_index, timestamp, frame, results))
+            await reader
+        finally:
+            reader.cancel()
+            decoder.submit(cap.release)
+            decoder.shutdown(wait=False)
+
+    def close(self):
+        """Finish queued frames and stop the batching thread"""
+        self.batcher.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+        return False
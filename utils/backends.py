@@ -0,0 +1,170 @@
+"""
+Inference backends for GSE Detection v11
+
+The PyTorch weights are exported once per backend and cached next to them,
+keyed by a hash of the weights, so a changed .pt file never reuses a stale
+export. Exported models are loaded through ultralytics, which runs ONNX
+models in an onnxruntime session and OpenVINO IR through the OpenVINO
+runtime, and returns the same Results objects as the PyTorch model.
+ultralytics (and with it torch) is imported on first use, not at import time.
+
+INT8 models are quantized from the FP32 ONNX export (see utils/quantization.py)
+and cached the same way with an '.int8' tag.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.hashing import file_digest
+
+
+# Backend name -> suffix ultralytics gives the exported artifact
+BACKENDS = {
+    "torch": None,
+    "onnx": ".onnx",
+    "openvino": "_openvino_model",
+}
+
+PRECISIONS = ("fp32", "int8")
+
+
+def export_path(model_path, backend: str, imgsz: int = None, dynamic: bool = None,
+                precision: str = "fp32"):
+    """
+    Cache location of an exported model
+
+    Args:
+        model_path: PyTorch weights (.pt)
+        backend: Backend name ('onnx' or 'openvino')
+        imgsz: Export input size (default config.INPUT_SIZE)
+        dynamic: Dynamic input shapes (default config.EXPORT_DYNAMIC)
+        precision: 'fp32' or 'int8'
+
+    Returns:
+        Path like weights/<stem>.<hash>.<imgsz>[.dynamic][.int8].onnx
+    """
+    if backend not in BACKENDS or BACKENDS[backend] is None:
+        raise ValueError(f"Unknown export backend '{backend}' (choose from onnx, openvino)")
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}' (choose from {', '.join(PRECISIONS)})")
+
+    model_path = Path(model_path)
+    imgsz = imgsz or config.INPUT_SIZE
+    dynamic = config.EXPORT_DYNAMIC if dynamic is None else dynamic
+
+    key = f"{file_digest(model_path)[:12]}.{imgsz}" + (".dynamic" if dynamic else "")
+    if precision != "fp32":
+        key += f".{precision}"
+    return model_path.parent / f"{model_path.stem}.{key}{BACKENDS[backend]}"
+
+
+def export_model(model_path, backend: str, imgsz: int = None, dynamic: bool = None,
+                 force: bool = False):
+    """
+    Export PyTorch weights to a backend format, reusing a cached export
+
+    Args:
+        model_path: PyTorch weights (.pt)
+        backend: Backend name ('onnx' or 'openvino')
+        imgsz: Export input size (default config.INPUT_SIZE)
+        dynamic: Dynamic input shapes (default config.EXPORT_DYNAMIC)
+        force: Re-export even if a cached artifact exists
+
+    Returns:
+        Path of the exported model (file for ONNX, directory for OpenVINO)
+    """
+    imgsz = imgsz or config.INPUT_SIZE
+    dynamic = config.EXPORT_DYNAMIC if dynamic is None else dynamic
+    target = export_path(model_path, backend, imgsz, dynamic)
+    if target.exists() and not force:
+        return target
+
+    print(f"Exporting {model_path} to {backend} ({imgsz}px{', dynamic' if dynamic else ''})...")
+
+    # Export from a private copy: ultralytics writes next to the weights, and
+    # several processes may export at the same time
+    from ultralytics import YOLO
+
+    model_path = Path(model_path)
+    with tempfile.TemporaryDirectory(dir=model_path.parent, prefix=".export-") as tmp_dir:
+        tmp_weights = Path(tmp_dir) / model_path.name
+        shutil.copy2(model_path, tmp_weights)
+        exported = YOLO(str(tmp_weights)).export(format=backend, imgsz=imgsz, dynamic=dynamic)
+
+        if target.is_dir():
+            shutil.rmtree(target)
+        os.replace(exported, target)
+
+    print(f"Cached {backend} model: {target}")
+    return target
+
+
+def quantize_model(model_path, calibration_dir=None, imgsz: int = None, max_images: int = None,
+                   force: bool = False):
+    """
+    Build (or reuse) the INT8 ONNX model for the given weights
+
+    Args:
+        model_path: PyTorch weights (.pt)
+        calibration_dir: Folder of calibration frames (default config.CALIBRATION_DIR)
+        imgsz: Model input size (default config.INPUT_SIZE)
+        max_images: Maximum calibration images (default config.CALIBRATION_MAX_IMAGES)
+        force: Re-quantize even if a cached INT8 model exists
+
+    Returns:
+        Path of the INT8 ONNX model
+    """
+    from utils.quantization import quantize_onnx
+
+    imgsz = imgsz or config.INPUT_SIZE
+    target = export_path(model_path, "onnx", imgsz, dynamic=False, precision="int8")
+    if target.exists() and not force:
+        return target
+
+    # Static shapes: calibration ranges are collected for a fixed input size
+    fp32_path = export_model(model_path, "onnx", imgsz, dynamic=False)
+    quantize_onnx(fp32_path, target, calibration_dir or config.CALIBRATION_DIR, imgsz, max_images)
+
+    print(f"Cached int8 model: {target}")
+    return target
+
+
+def load_model(model_path, backend: str = None, imgsz: int = None, dynamic: bool = None,
+               precision: str = None):
+    """
+    Load weights for inference on the given backend
+
+    Args:
+        model_path: PyTorch weights (.pt)
+        backend: 'torch', 'onnx' or 'openvino' (default config.BACKEND)
+        imgsz: Export input size for non-torch backends (default config.INPUT_SIZE)
+        dynamic: Dynamic input shapes for non-torch backends (default config.EXPORT_DYNAMIC)
+        precision: 'fp32' or 'int8' (default config.PRECISION); INT8 needs the
+            onnx backend and is quantized from config.CALIBRATION_DIR if not cached
+
+    Returns:
+        ultralytics YOLO model
+    """
+    from ultralytics import YOLO
+
+    backend = backend or config.BACKEND
+    precision = precision or config.PRECISION
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}' (choose from {', '.join(BACKENDS)})")
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}' (choose from {', '.join(PRECISIONS)})")
+
+    if precision == "int8":
+        if backend != "onnx":
+            raise ValueError(f"INT8 precision is only available on the onnx backend, not '{backend}'")
+        return YOLO(str(quantize_model(model_path, imgsz=imgsz)), task="detect")
+
+    if backend == "torch":
+        return YOLO(model_path)
+    return YOLO(str(export_model(model_path, backend, imgsz, dynamic)), task="detect")
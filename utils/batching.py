@@ -0,0 +1,158 @@
+"""
+Dynamic request batching for GSE Detection v11
+
+Callers submit single items from any thread and get a Future back. One worker
+thread groups queued items into batches of at most max_batch, waiting at most
+max_wait seconds after the first item for more to arrive, and hands each
+batch to a function that processes it in one go (e.g. one forward pass).
+"""
+
+from concurrent.futures import Future
+from pathlib import Path
+import queue
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+# Marker that stops the worker once the items queued before it are processed
+_STOP = object()
+
+
+class DynamicBatcher:
+    """
+    Coalesce concurrent single-item requests into batches on a worker thread
+    """
+
+    def __init__(self, process_batch, max_batch: int = None, max_wait: float = None,
+                 name: str = "batcher"):
+        """
+        Start the worker thread
+
+        Args:
+            process_batch: Function mapping a list of items to a list of results
+                of the same length and order
+            max_batch: Maximum items per batch (default config.SERVE_MAX_BATCH)
+            max_wait: Seconds to wait for a batch to fill after its first item
+                (default config.SERVE_MAX_WAIT_MS)
+            name: Worker thread name
+        """
+        self.process_batch = process_batch
+        self.max_batch = max_batch or config.SERVE_MAX_BATCH
+        self.max_wait = config.SERVE_MAX_WAIT_MS / 1000 if max_wait is None else max_wait
+        if self.max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {self.max_batch}")
+        if self.max_wait < 0:
+            raise ValueError(f"max_wait must be >= 0, got {self.max_wait}")
+
+        self.batches = 0
+        self.items = 0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """
+        Queue one item
+
+        Args:
+            item: Anything process_batch accepts as a list element
+
+        Returns:
+            concurrent.futures.Future resolved with the item's result (or the
+            exception process_batch raised for its batch)
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DynamicBatcher is closed")
+            self._queue.put((item, future))
+        return future
+
+    def _collect(self):
+        entry = self._queue.get()
+        if entry is _STOP:
+            return None
+
+        batch = [entry]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                # Finish this batch first; the worker stops on the next collect
+                self._queue.put(_STOP)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            # Drop requests whose caller cancelled them while queued
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                results = self.process_batch([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"process_batch returned {len(results)} results "
+                                       f"for {len(batch)} items")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self):
+        """
+        Batching counters
+
+        Returns:
+            Dict with batches, items, mean_batch and pending (queued items)
+        """
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch': self.items / self.batches if self.batches else 0.0,
+            'pending': self._queue.qsize(),
+        }
+
+    def close(self, wait: bool = True):
+        """
+        Stop accepting items; queued items are still processed
+
+        Args:
+            wait: Block until the worker thread has finished
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        if wait:
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
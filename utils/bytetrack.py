@@ -0,0 +1,557 @@
+"""
+Vectorized ByteTrack for GSE Detection v11
+
+A NumPy implementation of ByteTrack (Zhang et al., 2022) driven by the
+tracking parameters in config.py (TRACK_THRESH, TRACK_BUFFER, MATCH_THRESH,
+FRAME_RATE). All tracks live in one structured array; the Kalman predict and
+update steps, IoU cost matrices and state transitions operate on whole index
+sets instead of one Python object per track, and assignments are solved with
+SciPy's linear_sum_assignment under the same cost limit as lap.lapjv, split
+into the independent groups of overlapping boxes.
+
+The tracker only needs boxes, scores and classes, so it also runs over
+precomputed detections without a model (see track_detections and the
+command line below), e.g. to tune the parameters on saved detections:
+
+    python -m utils.bytetrack dets.txt tracks.txt --track-thresh 0.5
+"""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.evaluation import box_iou
+from utils.mot_io import format_mot_rows, read_mot
+
+
+# Track states
+TRACKED, LOST, REMOVED = 0, 1, 2
+
+# One row per track; mean/cov are the Kalman state over (cx, cy, aspect, h) and their velocities
+TRACK_DTYPE = np.dtype([
+    ('id', np.int64),
+    ('mean', np.float64, (8,)),
+    ('cov', np.float64, (8, 8)),
+    ('state', np.int8),
+    ('activated', np.bool_),
+    ('score', np.float64),
+    ('cls', np.float64),
+    ('idx', np.int64),            # index of the matched detection in the current frame
+    ('start_frame', np.int64),
+    ('end_frame', np.int64),      # last frame with a matched detection
+    ('tracklet_len', np.int64),
+])
+
+# Output rows, same layout as ultralytics' BYTETracker.update
+OUTPUT_COLUMNS = ('x1', 'y1', 'x2', 'y2', 'track_id', 'score', 'cls', 'idx')
+
+# Fixed association thresholds of the reference implementation
+_SECOND_MATCH_THRESH = 0.5       # tracked tracks vs low-score detections (IoU only)
+_UNCONFIRMED_MATCH_THRESH = 0.7  # tentative tracks vs leftover high-score detections
+_DUPLICATE_IOU = 0.85            # tracked and lost track covering the same object
+
+# Assignment problems larger than this (rows x columns with an admissible pair)
+# are split into connected groups of overlapping boxes before solving
+_SPLIT_ASSIGNMENT_SIZE = 1024
+
+# Kalman filter: constant velocity, noise proportional to the box height
+_STD_WEIGHT_POSITION = 1.0 / 20
+_STD_WEIGHT_VELOCITY = 1.0 / 160
+_MOTION = np.eye(8)
+_MOTION[:4, 4:] = np.eye(4)
+
+
+def _diag(std):
+    """(N, K) standard deviations -> (N, K, K) diagonal covariances"""
+    n, k = std.shape
+    cov = np.zeros((n, k, k))
+    cov[:, np.arange(k), np.arange(k)] = std ** 2
+    return cov
+
+
+def _height_std(h, weights):
+    """Per-track standard deviations: weight * h, or the weight itself where it is absolute"""
+    return np.stack([h * w if scaled else np.full_like(h, w) for w, scaled in weights], axis=1)
+
+
+def kalman_initiate(xyah):
+    """
+    Kalman state of new tracks
+
+    Args:
+        xyah: (N, 4) measurements (center x, center y, aspect w/h, height)
+
+    Returns:
+        (mean (N, 8), covariance (N, 8, 8))
+    """
+    mean = np.concatenate([xyah, np.zeros_like(xyah)], axis=1)
+    p, v = 2 * _STD_WEIGHT_POSITION, 10 * _STD_WEIGHT_VELOCITY
+    std = _height_std(xyah[:, 3], [(p, True), (p, True), (1e-2, False), (p, True),
+                                   (v, True), (v, True), (1e-5, False), (v, True)])
+    return mean, _diag(std)
+
+
+def kalman_predict(mean, cov):
+    """
+    Advance Kalman states by one frame
+
+    Args:
+        mean: (N, 8) state means
+        cov: (N, 8, 8) state covariances
+
+    Returns:
+        (mean, covariance) after the motion step
+    """
+    p, v = _STD_WEIGHT_POSITION, _STD_WEIGHT_VELOCITY
+    std = _height_std(mean[:, 3], [(p, True), (p, True), (1e-2, False), (p, True),
+                                   (v, True), (v, True), (1e-5, False), (v, True)])
+    return mean @ _MOTION.T, _MOTION @ cov @ _MOTION.T + _diag(std)
+
+
+def kalman_update(mean, cov, xyah):
+    """
+    Correct Kalman states with matched measurements
+
+    Args:
+        mean: (N, 8) predicted state means
+        cov: (N, 8, 8) predicted state covariances
+        xyah: (N, 4) measurements
+
+    Returns:
+        (mean, covariance) after the correction
+    """
+    p = _STD_WEIGHT_POSITION
+    innovation_cov = cov[:, :4, :4] + _diag(
+        _height_std(mean[:, 3], [(p, True), (p, True), (1e-1, False), (p, True)]))
+    # Kalman gain K = P H^T S^-1, solved as S K^T = H P (S is symmetric)
+    gain = np.linalg.solve(innovation_cov, cov[:, :4, :]).transpose(0, 2, 1)
+    mean = mean + np.einsum('nij,nj->ni', gain, xyah - mean[:, :4])
+    cov = cov - gain @ innovation_cov @ gain.transpose(0, 2, 1)
+    return mean, cov
+
+
+def xyxy_to_xyah(xyxy):
+    """(N, 4) corner boxes -> (N, 4) center x, center y, aspect w/h, height"""
+    wh = xyxy[:, 2:] - xyxy[:, :2]
+    return np.column_stack([xyxy[:, :2] + wh / 2, wh[:, 0] / wh[:, 1], wh[:, 1]])
+
+
+def xyah_to_xyxy(xyah):
+    """(N, 4) center x, center y, aspect w/h, height -> (N, 4) corner boxes"""
+    half = np.column_stack([xyah[:, 2] * xyah[:, 3], xyah[:, 3]]) / 2
+    return np.concatenate([xyah[:, :2] - half, xyah[:, :2] + half], axis=1)
+
+
+def _assignment_groups(pair_rows, pair_cols, n, m, matched_rows, matched_cols):
+    """
+    Split admissible pairs into connected groups
+
+    Groups of one row and one column are matched directly (appended to
+    matched_rows/matched_cols); the others are returned for assignment.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    # Bipartite graph of admissible pairs: rows are nodes 0..n-1, columns n..n+m-1
+    graph = coo_matrix((np.ones(len(pair_rows)), (pair_rows, pair_cols + n)), shape=(n + m, n + m))
+    count, labels = connected_components(graph, directed=False)
+    row_labels, col_labels = labels[:n], labels[n:]
+    group_rows = np.bincount(row_labels, minlength=count)
+    group_cols = np.bincount(col_labels, minlength=count)
+
+    single = (group_rows == 1) & (group_cols == 1)
+    pairs = single[row_labels[pair_rows]]
+    matched_rows.append(pair_rows[pairs])
+    matched_cols.append(pair_cols[pairs])
+    return [(np.flatnonzero(row_labels == label), np.flatnonzero(col_labels == label))
+            for label in np.flatnonzero((group_rows > 0) & (group_cols > 0) & ~single)]
+
+
+def linear_assignment(cost, thresh: float):
+    """
+    Minimum-cost matching that leaves pairs above a cost limit unmatched
+
+    Solves the problem lap.lapjv(cost, extend_cost=True, cost_limit=thresh)
+    solves: every row and column may instead stay unmatched for thresh / 2,
+    so only pairs costing at most thresh can be matched. The assignment is
+    solved on the savings thresh - cost of those pairs; large problems are
+    first split into the independent groups of overlapping boxes.
+
+    Args:
+        cost: (N, M) cost matrix
+        thresh: Highest cost of a match
+
+    Returns:
+        (matches (K, 2) row/column indices, unmatched rows, unmatched columns)
+    """
+    n, m = cost.shape
+    allowed = cost <= thresh
+    pair_rows, pair_cols = np.nonzero(allowed)
+    matched_rows, matched_cols = [], []
+    if len(pair_rows):
+        from scipy.optimize import linear_sum_assignment
+
+        savings = np.where(allowed, thresh - cost, 0.0)
+        rows, cols = np.unique(pair_rows), np.unique(pair_cols)
+        if len(rows) * len(cols) <= _SPLIT_ASSIGNMENT_SIZE:
+            groups = [(rows, cols)]
+        else:
+            groups = _assignment_groups(pair_rows, pair_cols, n, m, matched_rows, matched_cols)
+        for rows, cols in groups:
+            r, c = linear_sum_assignment(savings[np.ix_(rows, cols)], maximize=True)
+            r, c = rows[r], cols[c]
+            keep = allowed[r, c]
+            matched_rows.append(r[keep])
+            matched_cols.append(c[keep])
+
+    rows = np.concatenate(matched_rows) if matched_rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(matched_cols) if matched_cols else np.empty(0, dtype=np.int64)
+    unmatched_rows = np.ones(n, dtype=bool)
+    unmatched_rows[rows] = False
+    unmatched_cols = np.ones(m, dtype=bool)
+    unmatched_cols[cols] = False
+    return (np.column_stack([rows, cols]).astype(np.int64), np.flatnonzero(unmatched_rows),
+            np.flatnonzero(unmatched_cols))
+
+
+def track_boxes(tracks):
+    """(N, 4) corner boxes of tracks' current Kalman means"""
+    return xyah_to_xyxy(tracks['mean'][:, :4])
+
+
+class ByteTracker:
+    """
+    ByteTrack over a structured array of tracks
+
+    Picklable; IDs start at 1 per tracker instance.
+    """
+
+    def __init__(self, track_thresh: float = None, track_buffer: int = None,
+                 match_thresh: float = None, frame_rate: float = None,
+                 low_thresh: float = 0.1, new_track_thresh: float = None, fuse_score: bool = True):
+        """
+        Initialize tracker
+
+        Args:
+            track_thresh: Score separating high- from low-confidence detections
+                (default config.TRACK_THRESH)
+            track_buffer: Frames (at 30 fps) a lost track is kept for re-identification
+                (default config.TRACK_BUFFER)
+            match_thresh: Highest IoU cost of a first-stage match (default config.MATCH_THRESH)
+            frame_rate: Video frame rate scaling track_buffer (default config.FRAME_RATE)
+            low_thresh: Detections at or below this score are ignored
+            new_track_thresh: Lowest score starting a new track (default
+                track_thresh + 0.1, as in the reference implementation)
+            fuse_score: Weight IoU by detection score in high-score matching
+        """
+        self.track_thresh = config.TRACK_THRESH if track_thresh is None else track_thresh
+        self.track_buffer = config.TRACK_BUFFER if track_buffer is None else track_buffer
+        self.match_thresh = config.MATCH_THRESH if match_thresh is None else match_thresh
+        self.frame_rate = config.FRAME_RATE if frame_rate is None else frame_rate
+        self.low_thresh = low_thresh
+        self.new_track_thresh = (self.track_thresh + 0.1 if new_track_thresh is None
+                                 else new_track_thresh)
+        self.fuse_score = fuse_score
+        self.max_time_lost = int(self.frame_rate / 30.0 * self.track_buffer)
+        self.reset()
+
+    def reset(self):
+        """Drop all tracks and restart frame counting and IDs"""
+        self.tracks = np.zeros(0, dtype=TRACK_DTYPE)
+        self.frame_id = 0
+        self._next_id = 1
+
+    def params(self):
+        """
+        Parameters that determine the tracker's output
+
+        Returns:
+            JSON-serializable dict
+        """
+        return dict(track_thresh=self.track_thresh, track_buffer=self.track_buffer,
+                    match_thresh=self.match_thresh, frame_rate=self.frame_rate,
+                    low_thresh=self.low_thresh, new_track_thresh=self.new_track_thresh,
+                    fuse_score=self.fuse_score)
+
+    def _cost(self, track_idx, xyxy, scores=None):
+        """IoU distance between tracks and detections, optionally fused with detection scores"""
+        similarity = box_iou(track_boxes(self.tracks[track_idx]), xyxy)
+        if scores is not None and self.fuse_score:
+            similarity = similarity * scores[None, :]
+        return 1.0 - similarity
+
+    def _apply_matches(self, track_idx, det_idx, xyah, scores, cls):
+        """Kalman-correct matched tracks and mark them tracked (re-finding lost ones)"""
+        if len(track_idx) == 0:
+            return
+        tracks = self.tracks
+        mean, cov = kalman_update(tracks['mean'][track_idx], tracks['cov'][track_idx], xyah[det_idx])
+        tracks['mean'][track_idx] = mean
+        tracks['cov'][track_idx] = cov
+        was_tracked = tracks['state'][track_idx] == TRACKED
+        tracks['tracklet_len'][track_idx] = np.where(was_tracked, tracks['tracklet_len'][track_idx] + 1, 0)
+        tracks['state'][track_idx] = TRACKED
+        tracks['activated'][track_idx] = True
+        tracks['end_frame'][track_idx] = self.frame_id
+        tracks['score'][track_idx] = scores[det_idx]
+        tracks['cls'][track_idx] = cls[det_idx]
+        tracks['idx'][track_idx] = det_idx
+
+    def _new_tracks(self, det_idx, xyah, scores, cls):
+        """Tracks started from unmatched detections"""
+        new = np.zeros(len(det_idx), dtype=TRACK_DTYPE)
+        new['id'] = np.arange(self._next_id, self._next_id + len(det_idx))
+        self._next_id += len(det_idx)
+        new['mean'], new['cov'] = kalman_initiate(xyah[det_idx])
+        new['state'] = TRACKED
+        # Only tracks born in the first frame are confirmed at once
+        new['activated'] = self.frame_id == 1
+        new['score'] = scores[det_idx]
+        new['cls'] = cls[det_idx]
+        new['idx'] = det_idx
+        new['start_frame'] = self.frame_id
+        new['end_frame'] = self.frame_id
+        return new
+
+    def _remove_duplicates(self):
+        """Of a tracked and a lost track on the same object, drop the younger one"""
+        tracked = np.flatnonzero(self.tracks['state'] == TRACKED)
+        lost = np.flatnonzero(self.tracks['state'] == LOST)
+        if len(tracked) == 0 or len(lost) == 0:
+            return
+        pairs = np.argwhere(box_iou(track_boxes(self.tracks[tracked]),
+                                    track_boxes(self.tracks[lost])) > _DUPLICATE_IOU)
+        if len(pairs) == 0:
+            return
+        p, q = tracked[pairs[:, 0]], lost[pairs[:, 1]]
+        age = self.tracks['end_frame'] - self.tracks['start_frame']
+        self.tracks['state'][np.where(age[p] > age[q], q, p)] = REMOVED
+
+    def update(self, xyxy, scores, cls=None):
+        """
+        Associate one frame's detections with the tracks
+
+        Args:
+            xyxy: (N, 4) detection boxes x1, y1, x2, y2
+            scores: (N,) detection confidences
+            cls: (N,) class IDs (default 0)
+
+        Returns:
+            (K, 8) float32 rows x1, y1, x2, y2, track_id, score, cls, detection
+            index of the confirmed tracks in this frame (OUTPUT_COLUMNS)
+        """
+        self.frame_id += 1
+        xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+        cls = np.zeros(len(scores)) if cls is None else np.asarray(cls, dtype=np.float64).reshape(-1)
+
+        # Zero-size boxes would put an infinite aspect ratio into the Kalman state
+        wh = xyxy[:, 2:] - xyxy[:, :2]
+        valid = (wh[:, 0] > 0) & (wh[:, 1] > 0)
+        high = np.flatnonzero(valid & (scores >= self.track_thresh))
+        low = np.flatnonzero(valid & (scores > self.low_thresh) & (scores < self.track_thresh))
+        xyah = np.zeros((len(xyxy), 4))
+        xyah[valid] = xyxy_to_xyah(xyxy[valid])
+
+        state = self.tracks['state']
+        activated = self.tracks['activated']
+        unconfirmed = np.flatnonzero((state == TRACKED) & ~activated)
+        was_lost = state == LOST
+        pool = np.concatenate([np.flatnonzero((state == TRACKED) & activated), np.flatnonzero(was_lost)])
+
+        # Predict confirmed and lost tracks; lost tracks stop growing in height
+        if len(pool):
+            mean = self.tracks['mean'][pool]
+            mean[:, 7] = np.where(state[pool] == TRACKED, mean[:, 7], 0.0)
+            self.tracks['mean'][pool], self.tracks['cov'][pool] = kalman_predict(
+                mean, self.tracks['cov'][pool])
+
+        # 1. High-score detections vs confirmed and lost tracks
+        matches, u_pool, u_high = linear_assignment(
+            self._cost(pool, xyxy[high], scores[high]), self.match_thresh)
+        self._apply_matches(pool[matches[:, 0]], high[matches[:, 1]], xyah, scores, cls)
+
+        # 2. Low-score detections vs tracks still unmatched (IoU only)
+        remaining = pool[u_pool]
+        remaining = remaining[state[remaining] == TRACKED]
+        matches, u_remaining, _ = linear_assignment(
+            self._cost(remaining, xyxy[low]), _SECOND_MATCH_THRESH)
+        self._apply_matches(remaining[matches[:, 0]], low[matches[:, 1]], xyah, scores, cls)
+        state[remaining[u_remaining]] = LOST
+
+        # 3. Tentative tracks vs leftover high-score detections; unmatched ones are dropped
+        leftover = high[u_high]
+        matches, u_unconfirmed, u_leftover = linear_assignment(
+            self._cost(unconfirmed, xyxy[leftover], scores[leftover]), _UNCONFIRMED_MATCH_THRESH)
+        self._apply_matches(unconfirmed[matches[:, 0]], leftover[matches[:, 1]], xyah, scores, cls)
+        state[unconfirmed[u_unconfirmed]] = REMOVED
+
+        # Tracks lost for longer than the buffer are dropped
+        stale = was_lost & (state == LOST) & (self.frame_id - self.tracks['end_frame'] > self.max_time_lost)
+        state[stale] = REMOVED
+
+        # 4. New tracks from confident unmatched detections
+        leftover = leftover[u_leftover]
+        leftover = leftover[scores[leftover] >= self.new_track_thresh]
+        self.tracks = np.concatenate([self.tracks, self._new_tracks(leftover, xyah, scores, cls)])
+
+        self._remove_duplicates()
+        self.tracks = self.tracks[self.tracks['state'] != REMOVED]
+
+        out = self.tracks[(self.tracks['state'] == TRACKED) & self.tracks['activated']]
+        return np.column_stack([track_boxes(out), out['id'], out['score'], out['cls'],
+                                out['idx']]).astype(np.float32)
+
+
+def track_detections(frame_ids, xyxy, scores, class_ids=None, tracker: ByteTracker = None,
+                     image_size=None):
+    """
+    Track precomputed detections of a whole sequence
+
+    Frames between the first and last frame without any detection still
+    advance the tracker (lost tracks age as they would in a video).
+
+    Args:
+        frame_ids: (N,) frame numbers (1-based)
+        xyxy: (N, 4) detection boxes
+        scores: (N,) detection confidences
+        class_ids: (N,) class IDs (default 0)
+        tracker: ByteTracker to use (default: new one with config parameters)
+        image_size: (width, height) to clip track boxes to, as the video scripts
+            do (None: no clipping)
+
+    Returns:
+        Dict with 'frame', 'id', 'tlwh' (K, 4), 'conf' and 'cls' of the tracks
+        (the columns of read_mot)
+    """
+    tracker = tracker or ByteTracker()
+    frame_ids = np.asarray(frame_ids, dtype=np.int64)
+    xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float64)
+    class_ids = np.zeros(len(scores)) if class_ids is None else np.asarray(class_ids)
+
+    order = np.argsort(frame_ids, kind='stable')
+    frame_ids, xyxy, scores, class_ids = frame_ids[order], xyxy[order], scores[order], class_ids[order]
+    outputs = []
+    if len(frame_ids):
+        first, last = int(frame_ids[0]), int(frame_ids[-1])
+        frames = np.arange(first, last + 1)
+        bounds = np.searchsorted(frame_ids, np.append(frames, last + 1))
+        # Frame numbers before the first detection still count for the tracker clock
+        tracker.frame_id = max(tracker.frame_id, first - 1)
+        for frame, start, end in zip(frames, bounds[:-1], bounds[1:]):
+            rows = tracker.update(xyxy[start:end], scores[start:end], class_ids[start:end])
+            if len(rows):
+                outputs.append(np.column_stack([np.full(len(rows), frame), rows]))
+
+    rows = np.concatenate(outputs) if outputs else np.empty((0, 9))
+    boxes = rows[:, 1:5].astype(np.float64)
+    if image_size is not None:
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, image_size[0])
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, image_size[1])
+    boxes[:, 2:] -= boxes[:, :2]
+    return {
+        'frame': rows[:, 0].astype(np.int64),
+        'id': rows[:, 5].astype(np.int64),
+        'tlwh': boxes,
+        'conf': rows[:, 6].astype(np.float64),
+        'cls': rows[:, 7].astype(np.int64),
+    }
+
+
+def track_mot_file(det_path, out_path, tracker: ByteTracker = None, image_size=None):
+    """
+    Re-track the boxes of a MOT file (track IDs in the input are ignored)
+
+    Args:
+        det_path: MOT text file with detections (e.g. an earlier run's output)
+        out_path: Output MOT text file
+        tracker: ByteTracker to use (default: new one with config parameters)
+        image_size: (width, height) to clip track boxes to (None: no clipping)
+
+    Returns:
+        Dict of output columns (see track_detections)
+    """
+    dets = read_mot(det_path)
+    xyxy = dets['tlwh'].copy()
+    xyxy[:, 2:] += xyxy[:, :2]
+    tracks = track_detections(dets['frame'], xyxy, dets['conf'], dets['cls'], tracker, image_size)
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, 'w') as f:
+        f.write(format_mot_rows(tracks['frame'], tracks['id'], tracks['tlwh'],
+                                tracks['conf'], tracks['cls']))
+    return tracks
+
+
+def _seqinfo_size(det_path):
+    """Image size from a seqinfo.ini next to a MOT file, or None"""
+    import configparser
+
+    seqinfo = configparser.ConfigParser()
+    if not seqinfo.read(Path(det_path).parent / "seqinfo.ini"):
+        return None
+    try:
+        return int(seqinfo['Sequence']['imWidth']), int(seqinfo['Sequence']['imHeight'])
+    except (KeyError, ValueError):
+        return None
+
+
+def main():
+    """Command line: track the detections of a MOT file without running the model"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Run ByteTrack over precomputed detections in a MOT file",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Re-track with the config.py parameters
+  python -m utils.bytetrack output/video_01/gt/gt.txt retracked.txt
+
+  # Try other parameters
+  python -m utils.bytetrack dets.txt tracks.txt --track-thresh 0.5 --track-buffer 60
+        """
+    )
+    parser.add_argument('input', type=str, help='MOT file with detections')
+    parser.add_argument('output', type=str, help='Output MOT file')
+    parser.add_argument('--track-thresh', type=float, default=None,
+                        help=f'High/low detection score split (default: {config.TRACK_THRESH})')
+    parser.add_argument('--track-buffer', type=int, default=None,
+                        help=f'Frames a lost track is kept (default: {config.TRACK_BUFFER})')
+    parser.add_argument('--match-thresh', type=float, default=None,
+                        help=f'First-stage IoU cost limit (default: {config.MATCH_THRESH})')
+    parser.add_argument('--frame-rate', type=float, default=None,
+                        help=f'Sequence frame rate (default: {config.FRAME_RATE})')
+    parser.add_argument('--low-thresh', type=float, default=0.1,
+                        help='Ignore detections at or below this score (default: 0.1)')
+    parser.add_argument('--new-track-thresh', type=float, default=None,
+                        help='Lowest score starting a track (default: track-thresh + 0.1)')
+    parser.add_argument('--image-size', type=int, nargs=2, metavar=('W', 'H'), default=None,
+                        help='Clip boxes to this frame size (default: from seqinfo.ini next to the input)')
+
+    args = parser.parse_args()
+
+    if not Path(args.input).is_file():
+        print(f"❌ Input not found: {args.input}")
+        return 1
+
+    tracker = ByteTracker(args.track_thresh, args.track_buffer, args.match_thresh, args.frame_rate,
+                          low_thresh=args.low_thresh, new_track_thresh=args.new_track_thresh)
+    image_size = args.image_size or _seqinfo_size(args.input)
+
+    start = time.perf_counter()
+    tracks = track_mot_file(args.input, args.output, tracker, image_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {len(tracks['frame'])} boxes in {len(np.unique(tracks['id']))} tracks "
+          f"({tracker.frame_id} frames, {elapsed:.2f}s): {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Client for the GSE Detection v11 inference server (serve.py)
+
+Talks HTTP to localhost or over a Unix socket, using only the standard
+library plus OpenCV for encoding frames.
+"""
+
+import http.client
+import json
+from pathlib import Path
+import socket
+import sys
+from urllib.parse import urlencode
+
+import cv2
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket"""
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class GSEClient:
+    """
+    Blocking client for serve.py (one connection per request, thread-safe)
+    """
+
+    def __init__(self, host: str = None, port: int = None, socket_path: str = None,
+                 timeout: float = 300.0):
+        """
+        Initialize client
+
+        Args:
+            host: Server address (default config.SERVE_HOST)
+            port: Server port (default config.SERVE_PORT)
+            socket_path: Connect to this Unix socket instead of host/port
+            timeout: Socket timeout in seconds (video requests can take long)
+        """
+        self.host = host or config.SERVE_HOST
+        self.port = port or config.SERVE_PORT
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: bytes = None, content_type: str = None):
+        if self.socket_path:
+            conn = _UnixHTTPConnection(self.socket_path, self.timeout)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            headers = {'Content-Type': content_type} if content_type else {}
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            if response.status != 200:
+                try:
+                    message = json.loads(data)['error']
+                except (ValueError, KeyError):
+                    message = data.decode(errors='replace')
+                raise RuntimeError(f"Server error {response.status}: {message}")
+            if response.getheader('Content-Type', '').startswith('application/json'):
+                return json.loads(data)
+            return data.decode()
+        finally:
+            conn.close()
+
+    def health(self):
+        """Server model info and batching counters"""
+        return self._request('GET', '/health')
+
+    def detect(self, image, conf: float = None, fmt: str = "json", frame: int = 1):
+        """
+        Detect objects in one image
+
+        Args:
+            image: BGR numpy array, image file path, or encoded image bytes
+            conf: Confidence threshold (default: server config)
+            fmt: 'json' (get_detections_info() list) or 'mot' (MOT lines, ID -1)
+            frame: MOT frame number written on the lines (mot format)
+
+        Returns:
+            List of detection dicts (json) or MOT text (mot)
+        """
+        if isinstance(image, np.ndarray):
+            # BMP: lossless and cheap to encode, so results match local inference
+            ok, encoded = cv2.imencode('.bmp', image)
+            if not ok:
+                raise ValueError("Failed to encode image")
+            body = encoded.tobytes()
+        elif isinstance(image, (bytes, bytearray)):
+            body = bytes(image)
+        else:
+            body = Path(image).read_bytes()
+
+        query = {'format': fmt, 'frame': frame}
+        if conf is not None:
+            query['conf'] = conf
+        result = self._request('POST', f"/detect?{urlencode(query)}", body,
+                               'application/octet-stream')
+        return result['detections'] if fmt == "json" else result
+
+    def detect_video(self, path, conf: float = None, stride: int = 1, max_frames: int = None,
+                     fmt: str = "mot"):
+        """
+        Detect objects in a video decoded by the server
+
+        Args:
+            path: Video path (must be readable by the server process)
+            conf: Confidence threshold (default: server config)
+            stride: Detect on every Nth frame
+            max_frames: Maximum frames detected (None: all)
+            fmt: 'mot' (MOT lines, ID -1) or 'json'
+
+        Returns:
+            MOT text (mot) or list of {'frame', 'detections'} dicts (json)
+        """
+        request = {'path': str(Path(path).resolve()), 'conf': conf, 'stride': stride,
+                   'max_frames': max_frames, 'format': fmt}
+        result = self._request('POST', '/video', json.dumps(request).encode(), 'application/json')
+        return result['frames'] if fmt == "json" else result
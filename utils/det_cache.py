@@ -0,0 +1,382 @@
+"""
+Per-video detection cache for GSE Detection v11
+
+Raw detections only depend on the video, the weights and the inference size,
+not on the confidence threshold or the tracker. A tracking pass therefore
+runs the model at a low floor (config.DETECTION_CACHE_CONF), stores every box
+above it as compact arrays, and tracks only the boxes above the requested
+threshold. Later runs with any threshold at or above the floor, or with other
+tracker settings, replay the stored boxes without decoding the video or
+loading frames into the model.
+
+Cache files live in config.DETECTION_CACHE_DIR, one .npz per
+(video content hash, weights hash, input size[, class filter]):
+
+    frame (N,) int32, xyxy (N, 4) float32, conf (N,) float32, cls (N,) int16
+    meta: JSON with frame_count, width, height, fps and the conf floor
+"""
+
+import json
+import os
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.hashing import cached_file_digest, file_digest
+from utils.video_io import VideoReader
+
+
+def model_input_size(model):
+    """
+    Inference size predict() uses for a model loaded without an explicit imgsz
+
+    Args:
+        model: Loaded ultralytics YOLO model
+
+    Returns:
+        Input size in pixels
+    """
+    imgsz = model.overrides.get('imgsz')
+    if imgsz is None:
+        from ultralytics.utils import DEFAULT_CFG
+        imgsz = DEFAULT_CFG.imgsz
+    return imgsz if isinstance(imgsz, int) else max(imgsz)
+
+
+class CachedDetections:
+    """
+    Detections of one video, grouped by frame
+    """
+
+    def __init__(self, frame, xyxy, conf, cls, meta: dict):
+        """
+        Wrap loaded arrays
+
+        Args:
+            frame: (N,) frame numbers (1-based, sorted)
+            xyxy: (N, 4) boxes
+            conf: (N,) confidences
+            cls: (N,) class IDs
+            meta: Dict with frame_count, width, height, fps and conf_floor
+        """
+        self.frame, self.xyxy, self.conf, self.cls = frame, xyxy, conf, cls
+        self.frame_count = meta['frame_count']
+        self.width, self.height = meta['width'], meta['height']
+        self.fps = meta['fps']
+        self.conf_floor = meta['conf_floor']
+        # Row range of frame f is bounds[f - 1]:bounds[f]
+        self._bounds = np.searchsorted(frame, np.arange(1, self.frame_count + 2))
+
+    def __len__(self):
+        return len(self.conf)
+
+    def frame_detections(self, frame_idx: int, conf_threshold: float = None):
+        """
+        Detections of one frame
+
+        Args:
+            frame_idx: Frame number (1-based)
+            conf_threshold: Keep boxes above this confidence, as predict(conf=...)
+                does (None: all)
+
+        Returns:
+            (xyxy, conf, cls) arrays
+        """
+        rows = slice(self._bounds[frame_idx - 1], self._bounds[frame_idx])
+        xyxy, conf, cls = self.xyxy[rows], self.conf[rows], self.cls[rows]
+        if conf_threshold is not None:
+            keep = conf > conf_threshold
+            xyxy, conf, cls = xyxy[keep], conf[keep], cls[keep]
+        return xyxy, conf, cls
+
+    def select(self, conf_threshold: float):
+        """
+        All detections above a threshold
+
+        Args:
+            conf_threshold: Confidence threshold (as predict(conf=...))
+
+        Returns:
+            (frame, xyxy, conf, cls) arrays
+        """
+        keep = self.conf > conf_threshold
+        return self.frame[keep], self.xyxy[keep], self.conf[keep], self.cls[keep]
+
+    def reader(self):
+        """
+        Frame source for replaying through the video loops of the scripts
+
+        Returns:
+            ReplayReader yielding one placeholder per frame
+        """
+        return ReplayReader(self)
+
+
+class ReplayReader(VideoReader):
+    """
+    VideoReader stand-in over cached detections: read() returns (True, None)
+    once per frame, without decoding (FrameTracker takes the boxes from the cache)
+    """
+
+    backend = "cache"
+
+    def __init__(self, detections: CachedDetections):
+        super().__init__("", None, 0)
+        self.fps = detections.fps
+        self.frame_count = detections.frame_count
+        self._init_size(detections.width, detections.height)
+
+    def read(self):
+        if self.position >= self.frame_count:
+            return False, None
+        self.position += 1
+        return True, None
+
+
+class DetectionRecorder:
+    """
+    Collects one pass's detections frame by frame for DetectionCache.save
+    """
+
+    def __init__(self, conf_floor: float):
+        """
+        Start an empty recording
+
+        Args:
+            conf_floor: Confidence the model was run at (all kept boxes are above it)
+        """
+        self.conf_floor = conf_floor
+        self.frame_count = 0
+        self._frames, self._xyxy, self._conf, self._cls = [], [], [], []
+
+    def add(self, xyxy, conf, cls):
+        """
+        Append the next frame's detections
+
+        Args:
+            xyxy: (N, 4) boxes
+            conf: (N,) confidences
+            cls: (N,) class IDs
+        """
+        self.frame_count += 1
+        if len(conf):
+            self._frames.append(np.full(len(conf), self.frame_count, dtype=np.int32))
+            self._xyxy.append(np.asarray(xyxy, dtype=np.float32).reshape(-1, 4))
+            self._conf.append(np.asarray(conf, dtype=np.float32))
+            self._cls.append(np.asarray(cls).astype(np.int16))
+
+    def skip(self):
+        """Count a frame that was not inferred (the recording becomes unusable)"""
+        self.frame_count += 1
+        self._frames = None
+
+    @property
+    def complete(self):
+        """Whether every frame so far was recorded"""
+        return self._frames is not None
+
+    def arrays(self):
+        """(frame, xyxy, conf, cls) of the recording"""
+        if not self._frames:
+            return (np.empty(0, np.int32), np.empty((0, 4), np.float32),
+                    np.empty(0, np.float32), np.empty(0, np.int16))
+        return (np.concatenate(self._frames), np.concatenate(self._xyxy),
+                np.concatenate(self._conf), np.concatenate(self._cls))
+
+
+class DetectionCache:
+    """
+    Directory of cached detections (config.DETECTION_CACHE_DIR)
+    """
+
+    def __init__(self, directory=None, conf_floor: float = None):
+        """
+        Open cache directory (created on first save)
+
+        Args:
+            directory: Cache directory (default config.DETECTION_CACHE_DIR)
+            conf_floor: Confidence new recordings are made at (default config.DETECTION_CACHE_CONF)
+        """
+        self.directory = Path(directory or config.DETECTION_CACHE_DIR)
+        self.conf_floor = config.DETECTION_CACHE_CONF if conf_floor is None else conf_floor
+        self._weights = {}
+
+    def video_hash(self, video_path):
+        """
+        Content hash of a video (shared index, see utils.hashing.cached_file_digest)
+
+        Args:
+            video_path: Video file
+
+        Returns:
+            Hex digest
+        """
+        return cached_file_digest(video_path)
+
+    def path(self, video_path, model_path, imgsz: int, classes=None):
+        """
+        Cache file of a video, weights, input size and class filter
+
+        Args:
+            video_path: Video file
+            model_path: Weights file
+            imgsz: Inference size
+            classes: Class IDs inference was restricted to (None: all). Kept
+                apart from the unfiltered cache: with the class filter inside
+                NMS, max_det is shared by fewer classes
+
+        Returns:
+            Path of the .npz file (may not exist)
+        """
+        model_path = str(Path(model_path).resolve())
+        if model_path not in self._weights:
+            self._weights[model_path] = file_digest(model_path)
+        suffix = "" if classes is None else "_c" + "-".join(str(c) for c in sorted(set(classes)))
+        return self.directory / (f"{self.video_hash(video_path)[:16]}_"
+                                 f"{self._weights[model_path][:16]}_{imgsz}{suffix}.npz")
+
+    def load(self, video_path, model_path, imgsz: int, conf_threshold: float = None,
+             classes=None):
+        """
+        Cached detections of a video
+
+        Args:
+            video_path: Video file
+            model_path: Weights file
+            imgsz: Inference size
+            conf_threshold: Threshold the caller needs; a cache recorded at a
+                higher floor does not hold all its boxes and counts as a miss
+            classes: Class IDs inference is restricted to (None: all)
+
+        Returns:
+            CachedDetections, or None when not cached
+        """
+        path = self.path(video_path, model_path, imgsz, classes)
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data['meta']))
+                arrays = data['frame'], data['xyxy'], data['conf'], data['cls']
+        except (OSError, ValueError, KeyError):
+            # Missing or damaged file: rebuilt by the next inference pass
+            return None
+        if conf_threshold is not None and conf_threshold < meta['conf_floor']:
+            return None
+        return CachedDetections(*arrays, meta)
+
+    def save(self, video_path, model_path, imgsz: int, recorder: DetectionRecorder,
+             width: int, height: int, fps: float, classes=None):
+        """
+        Store a complete recording
+
+        Args:
+            video_path: Video file
+            model_path: Weights file
+            imgsz: Inference size
+            recorder: Recording of a full pass (every frame inferred)
+            width: Frame width
+            height: Frame height
+            fps: Frame rate
+            classes: Class IDs inference was restricted to (None: all)
+
+        Returns:
+            Path of the cache file, or None when the recording is incomplete
+        """
+        if not recorder.complete:
+            return None
+        path = self.path(video_path, model_path, imgsz, classes)
+        frame, xyxy, conf, cls = recorder.arrays()
+        meta = {'frame_count': recorder.frame_count, 'width': width, 'height': height,
+                'fps': fps, 'conf_floor': recorder.conf_floor}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, frame=frame, xyxy=xyxy, conf=conf, cls=cls, meta=json.dumps(meta))
+        os.replace(tmp_path, path)
+        return path
+
+
+def default_cache():
+    """
+    Cache at config.DETECTION_CACHE_DIR
+
+    Returns:
+        DetectionCache, or None when config.DETECTION_CACHE_DIR is empty (caching disabled)
+    """
+    return DetectionCache() if config.DETECTION_CACHE_DIR else None
+
+
+def main():
+    """Command line: export cached detections of a video as MOT text, optionally tracked"""
+    import argparse
+
+    from utils.bytetrack import track_detections
+    from utils.mot_io import format_mot_rows
+
+    parser = argparse.ArgumentParser(
+        description="Export cached detections of a video without running the model",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Detections above 0.3 as MOT rows (track ID -1)
+  python -m utils.det_cache video_01.mp4 dets_03.txt --conf 0.3
+
+  # Tracked with the built-in ByteTrack (config.TRACK_* parameters)
+  python -m utils.det_cache video_01.mp4 tracks_03.txt --conf 0.3 --track
+        """
+    )
+    parser.add_argument('video', type=str, help='Video whose detections were cached')
+    parser.add_argument('output', type=str, help='Output MOT file')
+    parser.add_argument('--conf', type=float, default=None,
+                        help='Confidence threshold (default: the cache floor)')
+    parser.add_argument('--model', '-m', type=str, default=None,
+                        help=f'Weights the detections came from (default: {config.MODEL_PATH})')
+    parser.add_argument('--imgsz', type=int, default=None,
+                        help='Inference size of the cached run (default: the model\'s own)')
+    parser.add_argument('--classes', type=int, nargs='+', default=None,
+                        help='Class filter of the cached run (default: none, all classes)')
+    parser.add_argument('--track', action='store_true',
+                        help='Run the built-in ByteTrack over the detections')
+
+    args = parser.parse_args()
+
+    model_path = args.model or config.MODEL_PATH
+    for path in (args.video, model_path):
+        if not Path(path).is_file():
+            print(f"❌ Not found: {path}")
+            return 1
+
+    imgsz = args.imgsz
+    if imgsz is None:
+        from utils.model_registry import get_model
+        imgsz = model_input_size(get_model(model_path, backend="torch", precision="fp32"))
+
+    cache = DetectionCache()
+    detections = cache.load(args.video, model_path, imgsz, args.conf, args.classes)
+    if detections is None:
+        print(f"❌ No cached detections for {args.video} (run save_tracks.py or gen_draft_gt.py "
+              f"once, with --conf >= {cache.conf_floor})")
+        return 1
+
+    conf = detections.conf_floor if args.conf is None else args.conf
+    frame, xyxy, scores, cls = detections.select(conf)
+    if args.track:
+        rows = track_detections(frame, xyxy, scores, cls,
+                                image_size=(detections.width, detections.height))
+    else:
+        tlwh = xyxy.astype(np.float64)
+        tlwh[:, 2:] -= tlwh[:, :2]
+        rows = {'frame': frame, 'id': np.full(len(frame), -1), 'tlwh': tlwh,
+                'conf': scores, 'cls': cls}
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        f.write(format_mot_rows(rows['frame'], rows['id'], rows['tlwh'], rows['conf'], rows['cls']))
+    print(f"✅ {len(rows['frame'])} boxes (conf > {conf}, {detections.frame_count} frames): {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
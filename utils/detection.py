@@ -4,13 +4,60 @@ Detection utilities for GSE Detection v11
 
 import cv2
 import numpy as np
-from ultralytics import YOLO
 from pathlib import Path
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
+from utils.det_cache import model_input_size
+from utils.instrumentation import METRICS
+from utils.model_registry import get_model
+from utils.tiling import roi_tiles, merge_tile_boxes
+
+
+def result_arrays(result):
+    """
+    Boxes of one result as host NumPy columns
+
+    The whole box tensor is copied off the device in one transfer; reading
+    xyxy/conf/cls element by element costs one sync and one Python object per
+    value. The columns are kept on the result, so drawing and
+    get_detections_info() on the same result share one transfer.
+
+    Args:
+        result: YOLO Results
+
+    Returns:
+        Dict of columns: 'xyxy' (N, 4) float32, 'conf' (N,) float32 and
+        'cls' (N,) int64, plus 'id' (N,) int64 when the boxes carry track IDs
+    """
+    boxes = result.boxes
+    cached = getattr(result, '_host_arrays', None)
+    if cached is not None and cached[0] is boxes:
+        return cached[1]
+
+    if boxes is None:
+        data = np.zeros((0, 6), dtype=np.float32)
+    else:
+        data = boxes.data
+        data = (data.cpu().numpy() if hasattr(data, 'cpu') else np.asarray(data)).astype(np.float32, copy=False)
+
+    # Rows: x1, y1, x2, y2, [track_id,] conf, cls
+    arrays = {'xyxy': data[:, :4], 'conf': data[:, -2], 'cls': data[:, -1].astype(np.int64)}
+    if data.shape[1] == 7:
+        arrays['id'] = data[:, 4].astype(np.int64)
+    result._host_arrays = (boxes, arrays)
+    return arrays
+
+
+class BatchResults(list):
+    """
+    Results of a batch (detect_batch(), or detect() on a list of images)
+
+    The GSEDetector helpers return one output per result for a batch, even
+    when it holds a single frame, so a short last batch keeps the same shape.
+    """
 
 
 class GSEDetector:
@@ -18,136 +65,320 @@ class GSEDetector:
     Lightweight GSE Detection wrapper using YOLOv11
     """
     
-    def __init__(self, model_path: str = config.MODEL_PATH, device: str = None):
+    def __init__(self, model_path: str = config.MODEL_PATH, device: str = None,
+                 backend: str = None, precision: str = None, warmup: bool = None):
         """
         Initialize detector
         
+        Detectors built for the same weights, backend, precision and device
+        share one loaded model (see utils/model_registry.py).
+        
         Args:
             model_path: Path to YOLO model weights
             device: Device to use ('cuda', 'cpu', 'mps', or None for auto)
+            backend: 'torch', 'onnx' or 'openvino' (default from config;
+                'onnx' when precision is 'int8')
+            precision: 'fp32' or 'int8' (default from config)
+            warmup: Run one blank inference after loading (default config.MODEL_WARMUP)
         """
         self.model_path = model_path
         self.device = device or config.DEVICE
+        self.precision = precision or config.PRECISION
+        self.backend = backend or ("onnx" if self.precision == "int8" else config.BACKEND)
         
-        print(f"Loading model from: {model_path}")
-        self.model = YOLO(model_path)
-        
-        if self.device:
-            self.model.to(self.device)
+        print(f"Loading model from: {model_path} (backend: {self.backend}, {self.precision})")
+        self.model = get_model(model_path, self.backend, self.precision, self.device, warm=warmup)
         
         self.class_names = self.model.names
+        # Size predict() runs at without an explicit imgsz, as in the tracking
+        # scripts and the detection cache key
+        self.imgsz = model_input_size(self.model)
         print(f"Model loaded. Classes: {list(self.class_names.values())}")
     
-    def detect(self, image, conf_threshold: float = None, iou_threshold: float = None):
+    def detect(self, image, conf_threshold: float = None, iou_threshold: float = None,
+               stream: bool = False, classes=None, imgsz: int = None):
         """
         Detect objects in image
         
         Args:
-            image: Input image (numpy array or path)
+            image: Input image (numpy array or path), a list of images, or a
+                video path / URL (use stream=True for videos)
             conf_threshold: Confidence threshold (default from config)
             iou_threshold: IoU threshold for NMS (default from config)
+            stream: Return a generator yielding one result per frame as it is
+                decoded, instead of holding every result in memory
+            classes: Class IDs to detect (None: all); other classes are
+                dropped before NMS
+            imgsz: Inference size (default: the model's own input size, self.imgsz)
         
         Returns:
-            results: YOLO detection results
+            results: YOLO detection results (a generator when stream=True;
+                BatchResults for a list of images)
         """
-        conf = conf_threshold or config.CONFIDENCE_THRESHOLD
-        iou = iou_threshold or config.IOU_THRESHOLD
+        conf = config.CONFIDENCE_THRESHOLD if conf_threshold is None else conf_threshold
+        iou = config.IOU_THRESHOLD if iou_threshold is None else iou_threshold
+        
+        imgsz = self.imgsz if imgsz is None else imgsz
         
-        results = self.model(image, conf=conf, iou=iou, device=self.device)
+        results = self.model(image, conf=conf, iou=iou, imgsz=imgsz, device=self.device,
+                             stream=stream, classes=classes)
+        if stream:
+            return self._record_stream(results)
+        METRICS.record_speed(results)
+        if isinstance(image, (list, tuple)):
+            return BatchResults(results)
         return results
-    
-    def detect_gse_only(self, image, conf_threshold: float = None):
+
+    @staticmethod
+    def _record_stream(results):
+        """Pass streamed results through, recording their stage timings one by one"""
+        for result in results:
+            METRICS.record_speed((result,))
+            yield result
+
+    def detect_batch(self, frames, batch_size: int = 8, conf_threshold: float = None,
+                     iou_threshold: float = None, classes=None, imgsz: int = None):
+        """
+        Detect objects in several images, stacking them into batched forward passes
+
+        Args:
+            frames: Sequence of input images (numpy arrays or paths)
+            batch_size: Maximum number of images per forward pass
+            conf_threshold: Confidence threshold (default from config)
+            iou_threshold: IoU threshold for NMS (default from config)
+            classes: Class IDs to detect (None: all)
+            imgsz: Inference size (default: the model's own input size, self.imgsz)
+
+        Returns:
+            results: BatchResults, one YOLO result per input frame and in the same order
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+        conf = config.CONFIDENCE_THRESHOLD if conf_threshold is None else conf_threshold
+        iou = config.IOU_THRESHOLD if iou_threshold is None else iou_threshold
+        imgsz = self.imgsz if imgsz is None else imgsz
+
+        frames = list(frames)
+        results = BatchResults()
+        for start in range(0, len(frames), batch_size):
+            # A list source is preprocessed into one tensor and run as a single batch
+            chunk = frames[start:start + batch_size]
+            chunk_results = self.model(chunk, conf=conf, iou=iou, imgsz=imgsz,
+                                       device=self.device, classes=classes)
+            METRICS.record_speed(chunk_results)
+            results.extend(chunk_results)
+
+        return results
+
+    def detect_tiled(self, image, rois=None, tile_size: int = None, overlap: float = None,
+                     batch_size: int = 8, conf_threshold: float = None,
+                     iou_threshold: float = None, classes=None):
+        """
+        Detect objects on overlapping tiles, optionally restricted to an ROI
+
+        Tiles are cut from the ROI bounding box only (tiles not touching the ROI
+        are skipped), run through the model in batches at tile resolution, and
+        merged back into frame coordinates with cross-tile NMS. This keeps small
+        objects such as Ground_Crew at native resolution on 4K frames.
+
+        Args:
+            image: Input image (numpy array)
+            rois: Polygons with normalized (x, y) vertices (None: whole frame)
+            tile_size: Tile edge length in pixels (None: one window over the ROI,
+                inferred at the model's own input size)
+            overlap: Overlap between tiles as a fraction of tile_size (default from config)
+            batch_size: Maximum number of tiles per forward pass
+            conf_threshold: Confidence threshold (default from config)
+            iou_threshold: IoU threshold for NMS (default from config)
+            classes: Class IDs to detect (None: all)
+
+        Returns:
+            results: List holding one YOLO Results for the whole frame
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+        conf = config.CONFIDENCE_THRESHOLD if conf_threshold is None else conf_threshold
+        iou = config.IOU_THRESHOLD if iou_threshold is None else iou_threshold
+        imgsz = tile_size or self.imgsz
+
+        height, width = image.shape[:2]
+        tiles, mask = roi_tiles(rois, width, height, tile_size, overlap)
+
+        merged = []
+        for start in range(0, len(tiles), batch_size):
+            windows = tiles[start:start + batch_size]
+            crops = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in windows]
+            tile_results = self.model(crops, conf=conf, iou=iou, imgsz=imgsz,
+                                      device=self.device, verbose=False, classes=classes)
+            METRICS.record_speed(tile_results)
+            for (x1, y1, _, _), result in zip(windows, tile_results):
+                # Rows: x1, y1, x2, y2, conf, cls in tile coordinates
+                data = result.boxes.data.clone()
+                data[:, [0, 2]] += x1
+                data[:, [1, 3]] += y1
+                merged.append(data)
+
+        import torch
+        from ultralytics.engine.results import Results
+
+        boxes = torch.cat(merged) if merged else torch.zeros((0, 6))
+        with METRICS.timer('nms'):
+            boxes = merge_tile_boxes(boxes, mask, iou, nms=len(tiles) > 1)
+
+        return [Results(image, path="", names=self.class_names, boxes=boxes)]
+
+    def detect_gse_only(self, image, conf_threshold: float = None, stream: bool = False):
         """
         Detect only GSE objects
         
+        Other classes are excluded inside inference, so NMS never considers
+        them; the results are new objects holding only GSE boxes.
+        
         Args:
-            image: Input image
+            image: Input image(s) or video (see detect())
             conf_threshold: Confidence threshold
+            stream: Return a generator yielding one filtered result per frame
         
         Returns:
-            filtered_results: Detection results containing only GSE
+            filtered_results: Detection results containing only GSE, one per
+                frame (a generator when stream=True)
         """
-        results = self.detect(image, conf_threshold=conf_threshold)
-        
-        # Filter for GSE class only
-        gse_class_id = config.GSE_CLASS_ID
-        
-        if len(results) > 0:
-            result = results[0]
-            if result.boxes is not None:
-                # Filter by class ID
-                mask = result.boxes.cls == gse_class_id
-                result.boxes = result.boxes[mask]
-        
-        return results
+        return self.detect(image, conf_threshold=conf_threshold, stream=stream,
+                           classes=[config.GSE_CLASS_ID])
     
-    def draw_detections(self, image, results, show_class_name: bool = True):
+    @staticmethod
+    def _per_frame(results, per_frame):
+        """Whether a helper returns one output per result rather than a single output"""
+        if not isinstance(results, (list, tuple)):
+            # Generator from detect(stream=True)
+            return True
+        if per_frame is not None:
+            return per_frame
+        # A batch keeps one output per frame even when it holds a single frame
+        return isinstance(results, BatchResults) or len(results) > 1
+    
+    @staticmethod
+    def _each(results, fn, items=None):
+        """Apply fn to every result (or to items paired with them): a list for a list, a generator for a generator"""
+        outputs = (fn(item) for item in (results if items is None else items))
+        return list(outputs) if isinstance(results, (list, tuple)) else outputs
+    
+    def draw_detections(self, image, results, show_class_name: bool = True, per_frame: bool = None):
         """
         Draw detection boxes on image
         
+        A single result gives one annotated image as before. A batch
+        (BatchResults, whatever its length), several results or a generator
+        from detect(stream=True) give one annotated image per result.
+        
         Args:
-            image: Input image
+            image: Input image; with several results, a sequence of images in
+                the same order, or None to draw on each result's original frame
             results: Detection results from model
             show_class_name: Whether to show class names
+            per_frame: Force per-result output (True) or single output (False);
+                None: per result for a batch, a generator or several results
         
         Returns:
-            annotated_image: Image with drawn boxes
+            annotated_image: Image with drawn boxes (a list of images for a
+                list of results, a generator for a generator)
         """
+        if not self._per_frame(results, per_frame):
+            with METRICS.timer('drawing'):
+                return self._draw(image, results[0] if len(results) > 0 else None, show_class_name)
+        
+        if image is None:
+            pairs = ((result.orig_img, result) for result in results)
+        elif isinstance(image, np.ndarray):
+            raise ValueError("A batch or several results need one image per result (or image=None)")
+        else:
+            pairs = zip(image, results)
+        return self._each(results, lambda pair: self.draw_detections(pair[0], [pair[1]], show_class_name,
+                                                                     per_frame=False), pairs)
+    
+    def _draw(self, image, result, show_class_name):
         annotated = image.copy()
         
-        if len(results) > 0:
-            result = results[0]
-            if result.boxes is not None:
-                for box, conf, cls_id in zip(
-                    result.boxes.xyxy, 
-                    result.boxes.conf, 
-                    result.boxes.cls
-                ):
-                    x1, y1, x2, y2 = map(int, box)
-                    cls_id = int(cls_id)
-                    
-                    # Get color
-                    color = config.CLASS_COLORS.get(cls_id, (0, 255, 0))
-                    
-                    # Draw box
-                    cv2.rectangle(annotated, (x1, y1), (x2, y2), color, 2)
-                    
-                    # Draw label
-                    label = f"{self.class_names[cls_id]} {conf:.2f}"
-                    cv2.putText(
-                        annotated, label, (x1, y1-10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2
-                    )
+        if result is not None:
+            arrays = result_arrays(result)
+            # Python scalars in bulk (one conversion per column, not per value)
+            for (x1, y1, x2, y2), conf, cls_id in zip(
+                arrays['xyxy'].astype(np.int32).tolist(),
+                arrays['conf'].tolist(),
+                arrays['cls'].tolist()
+            ):
+                # Get color
+                color = config.CLASS_COLORS.get(cls_id, (0, 255, 0))
+                
+                # Draw box
+                cv2.rectangle(annotated, (x1, y1), (x2, y2), color, 2)
+                
+                # Draw label
+                label = f"{self.class_names[cls_id]} {conf:.2f}"
+                cv2.putText(
+                    annotated, label, (x1, y1-10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2
+                )
         
         return annotated
     
-    def get_detections_info(self, results):
+    def get_detection_arrays(self, results, per_frame: bool = None):
+        """
+        Extract detections as columns (see result_arrays())
+        
+        Cheaper than get_detections_info() when only counts, boxes or
+        scores are needed: no per-detection dict is built.
+        
+        Args:
+            results: Detection results (a batch, several results or a
+                generator give one dict per result)
+            per_frame: Force per-result output (True) or single output (False);
+                None: per result for a batch, a generator or several results
+        
+        Returns:
+            Dict of columns 'xyxy', 'conf' and 'cls' (empty when there are no
+            results), or one dict per result (list or generator)
+        """
+        if self._per_frame(results, per_frame):
+            return self._each(results, result_arrays)
+        if len(results) > 0:
+            return result_arrays(results[0])
+        return {'xyxy': np.zeros((0, 4), dtype=np.float32), 'conf': np.zeros(0, dtype=np.float32),
+                'cls': np.zeros(0, dtype=np.int64)}
+    
+    def get_detections_info(self, results, per_frame: bool = None):
         """
         Extract detection information from results
         
         Args:
-            results: Detection results
+            results: Detection results (a batch, several results or a
+                generator give one list per result)
+            per_frame: Force per-result output (True) or single output (False);
+                None: per result for a batch, a generator or several results
         
         Returns:
             List of detection dictionaries with keys:
             - class_id, class_name, confidence, bbox (x1, y1, x2, y2)
+            or one such list per result (list or generator)
         """
-        detections = []
-        
-        if len(results) > 0:
-            result = results[0]
-            if result.boxes is not None:
-                for box, conf, cls_id in zip(
-                    result.boxes.xyxy,
-                    result.boxes.conf,
-                    result.boxes.cls
-                ):
-                    cls_id = int(cls_id)
-                    detections.append({
-                        'class_id': cls_id,
-                        'class_name': self.class_names[cls_id],
-                        'confidence': float(conf),
-                        'bbox': [float(x) for x in box]
-                    })
-        
-        return detections
+        if self._per_frame(results, per_frame):
+            return self._each(results, lambda result: self._detections_info(result_arrays(result)))
+        return self._detections_info(self.get_detection_arrays(results, per_frame=False))
+    
+    def _detections_info(self, arrays):
+        # Built from the host columns in one pass (no per-element tensor access)
+        return [
+            {
+                'class_id': cls_id,
+                'class_name': self.class_names[cls_id],
+                'confidence': conf,
+                'bbox': box
+            }
+            for box, conf, cls_id in zip(
+                arrays['xyxy'].tolist(),
+                arrays['conf'].tolist(),
+                arrays['cls'].tolist()
+            )
+        ]
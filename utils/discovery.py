@@ -0,0 +1,157 @@
+"""
+Recursive video discovery for GSE Detection v11
+
+Walks a directory tree once with os.scandir and matches extensions
+case-insensitively (one pass instead of a glob per extension and case).
+Results can be streamed while the walk is still running.
+
+The listing can be cached between runs: each directory's video files and
+subdirectories are stored with the directory's mtime, which changes whenever
+an entry is added, removed or renamed in it. A rerun stats every directory
+but only re-lists the ones that changed, which on network storage is far
+cheaper than listing the whole archive again.
+"""
+
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+# Directories modified this recently are re-listed on the next run: coarse
+# mtime resolution (e.g. 1 s on some NFS servers) could hide a later change
+_MTIME_SLACK_NS = 2 * 10**9
+
+
+def _normalize_extensions(extensions):
+    return tuple(sorted({e.lower() if e.startswith('.') else f".{e.lower()}"
+                         for e in (extensions or config.VIDEO_EXTENSIONS)}))
+
+
+def _list_dir(path, extensions):
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    # Symlinked directories are not followed (avoids cycles)
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        # Unreadable directory (permissions, vanished): skip it like glob does
+        pass
+    return sorted(files), sorted(subdirs)
+
+
+def iter_videos(root, extensions=None, listing: dict = None, updated: dict = None):
+    """
+    Yield video files below a directory as the walk finds them
+
+    Args:
+        root: Directory to search (recursively)
+        extensions: File extensions to match, any case (default config.VIDEO_EXTENSIONS)
+        listing: Cached listing from a previous walk ({relative dir: entry});
+            directories whose mtime is unchanged are not re-listed
+        updated: Dict that receives the fresh listing of this walk (for caching)
+
+    Yields:
+        Path of each video file, directory by directory (files before subdirectories)
+    """
+    root = str(root)
+    extensions = _normalize_extensions(extensions)
+    listing = listing or {}
+    now_ns = time.time_ns()
+
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        path = os.path.join(root, rel) if rel else root
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+
+        cached = listing.get(rel)
+        if cached is not None and cached['mtime_ns'] == mtime:
+            files, subdirs = cached['files'], cached['dirs']
+        else:
+            files, subdirs = _list_dir(path, extensions)
+        if updated is not None:
+            recent = now_ns - mtime < _MTIME_SLACK_NS
+            updated[rel] = {'mtime_ns': None if recent else mtime, 'files': files, 'dirs': subdirs}
+
+        for name in files:
+            yield Path(path) / name
+        # Reversed so that the stack pops subdirectories in sorted order
+        stack.extend(os.path.join(rel, d) if rel else d for d in reversed(subdirs))
+
+
+class DiscoveryCache:
+    """
+    Directory listings of earlier walks, stored as JSON
+    """
+
+    def __init__(self, path=None):
+        """
+        Load cache (a missing or unreadable file starts empty)
+
+        Args:
+            path: Cache file (default config.DISCOVERY_CACHE)
+        """
+        self.path = Path(path or config.DISCOVERY_CACHE)
+        try:
+            with open(self.path) as f:
+                self.listings = json.load(f)
+        except (OSError, ValueError):
+            self.listings = {}
+
+    @staticmethod
+    def key(root, extensions=None):
+        """Cache key of a root directory and extension set"""
+        return f"{Path(root).resolve()}|{','.join(_normalize_extensions(extensions))}"
+
+    def save(self):
+        """Write the cache atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.listings, f)
+        os.replace(tmp_path, self.path)
+
+
+def find_videos(root, extensions=None, cache: bool = True):
+    """
+    List all video files below a directory
+
+    Args:
+        root: Directory to search (recursively)
+        extensions: File extensions to match, any case (default config.VIDEO_EXTENSIONS)
+        cache: Reuse and update the listing cache (config.DISCOVERY_CACHE; an
+            empty setting disables caching)
+
+    Returns:
+        Sorted list of Paths
+    """
+    if not cache or not config.DISCOVERY_CACHE:
+        return sorted(iter_videos(root, extensions))
+
+    store = DiscoveryCache()
+    key = DiscoveryCache.key(root, extensions)
+    updated = {}
+    videos = sorted(iter_videos(root, extensions, store.listings.get(key), updated))
+    if updated != store.listings.get(key):
+        store.listings[key] = updated
+        try:
+            store.save()
+        except OSError:
+            pass  # read-only working directory: caching is only an optimization
+    return videos
@@ -0,0 +1,223 @@
+"""
+Detection accuracy evaluation for GSE Detection v11
+
+Per-class average precision of detections against MOT Challenge annotation
+files (e.g. draft ground truth from gen_draft_gt.py), plus small helpers for
+latency and memory figures used in comparison reports.
+"""
+
+import os
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.mot_io import read_mot
+
+
+# COCO-style IoU thresholds 0.50:0.05:0.95
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+
+
+def box_iou(boxes_a, boxes_b):
+    """
+    Pairwise IoU of two sets of boxes
+
+    Args:
+        boxes_a: (N, 4) array of x1, y1, x2, y2
+        boxes_b: (M, 4) array of x1, y1, x2, y2
+
+    Returns:
+        (N, M) IoU matrix
+    """
+    tl = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    br = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    inter = np.prod(np.clip(br - tl, 0, None), axis=2)
+    area_a = np.prod(boxes_a[:, 2:] - boxes_a[:, :2], axis=1)
+    area_b = np.prod(boxes_b[:, 2:] - boxes_b[:, :2], axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def average_precision(recall, precision):
+    """
+    Area under a precision/recall curve (all-point interpolation)
+
+    Args:
+        recall: Increasing recall values
+        precision: Matching precision values
+
+    Returns:
+        Average precision in [0, 1]
+    """
+    recall = np.concatenate(([0.0], recall, [1.0]))
+    precision = np.concatenate(([1.0], precision, [0.0]))
+    # Precision envelope: best precision achievable at any higher recall
+    precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+    steps = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1]))
+
+
+def load_ground_truth(path):
+    """
+    Group a MOT annotation file by frame
+
+    Args:
+        path: MOT text file
+
+    Returns:
+        Dict frame number -> (xyxy (N, 4), class_ids (N,))
+    """
+    data = read_mot(path)
+    xyxy = data['tlwh'].copy()
+    xyxy[:, 2:] += xyxy[:, :2]
+
+    frames = {}
+    if len(xyxy):
+        order = np.argsort(data['frame'], kind='stable')
+        frame_ids, starts = np.unique(data['frame'][order], return_index=True)
+        for frame_id, rows in zip(frame_ids, np.split(order, starts[1:])):
+            frames[int(frame_id)] = (xyxy[rows], data['cls'][rows])
+    return frames
+
+
+class DetectionEvaluator:
+    """
+    Accumulate detections frame by frame and report per-class AP
+    """
+
+    def __init__(self, class_names: dict, iou_thresholds=IOU_THRESHOLDS):
+        """
+        Initialize evaluator
+
+        Args:
+            class_names: Class ID -> name mapping
+            iou_thresholds: IoU thresholds at which matches are counted
+        """
+        self.class_names = class_names
+        self.iou_thresholds = np.asarray(iou_thresholds)
+        self._scores = {cls: [] for cls in class_names}
+        self._tp = {cls: [] for cls in class_names}
+        self._num_gt = {cls: 0 for cls in class_names}
+
+    def add_frame(self, pred_xyxy, pred_conf, pred_cls, gt_xyxy, gt_cls):
+        """
+        Match one frame's detections to its ground truth
+
+        Args:
+            pred_xyxy: (N, 4) predicted boxes
+            pred_conf: (N,) predicted confidences
+            pred_cls: (N,) predicted class IDs
+            gt_xyxy: (M, 4) ground-truth boxes
+            gt_cls: (M,) ground-truth class IDs
+        """
+        pred_xyxy = np.asarray(pred_xyxy, dtype=np.float64).reshape(-1, 4)
+        pred_conf = np.asarray(pred_conf, dtype=np.float64).reshape(-1)
+        pred_cls = np.asarray(pred_cls).reshape(-1).astype(np.int64)
+        gt_xyxy = np.asarray(gt_xyxy, dtype=np.float64).reshape(-1, 4)
+        gt_cls = np.asarray(gt_cls).reshape(-1).astype(np.int64)
+
+        for cls in self.class_names:
+            preds = np.flatnonzero(pred_cls == cls)
+            gts = np.flatnonzero(gt_cls == cls)
+            self._num_gt[cls] += len(gts)
+            if len(preds) == 0:
+                continue
+
+            # Greedy matching in descending confidence, independently per threshold
+            preds = preds[np.argsort(-pred_conf[preds], kind='stable')]
+            tp = np.zeros((len(preds), len(self.iou_thresholds)), dtype=bool)
+            if len(gts):
+                iou = box_iou(pred_xyxy[preds], gt_xyxy[gts])
+                for t, threshold in enumerate(self.iou_thresholds):
+                    taken = np.zeros(len(gts), dtype=bool)
+                    for i in range(len(preds)):
+                        candidates = np.where(taken, -1.0, iou[i])
+                        j = int(candidates.argmax())
+                        if candidates[j] >= threshold:
+                            taken[j] = True
+                            tp[i, t] = True
+
+            self._scores[cls].append(pred_conf[preds])
+            self._tp[cls].append(tp)
+
+    def results(self):
+        """
+        Compute AP per class
+
+        Returns:
+            Dict with 'classes' (class name -> ap50, ap50_95, gt, predictions;
+            APs are None for classes without ground truth), 'map50' and 'map50_95'
+        """
+        classes = {}
+        for cls, name in self.class_names.items():
+            num_gt = self._num_gt[cls]
+            scores = np.concatenate(self._scores[cls]) if self._scores[cls] else np.empty(0)
+            entry = {'gt': num_gt, 'predictions': len(scores), 'ap50': None, 'ap50_95': None}
+
+            if num_gt:
+                aps = np.zeros(len(self.iou_thresholds))
+                if len(scores):
+                    tp = np.concatenate(self._tp[cls])[np.argsort(-scores, kind='stable')]
+                    tp_cum = np.cumsum(tp, axis=0)
+                    fp_cum = np.cumsum(~tp, axis=0)
+                    recall = tp_cum / num_gt
+                    precision = tp_cum / (tp_cum + fp_cum)
+                    aps = np.array([
+                        average_precision(recall[:, t], precision[:, t])
+                        for t in range(len(self.iou_thresholds))
+                    ])
+                entry['ap50'] = float(aps[0])
+                entry['ap50_95'] = float(aps.mean())
+            classes[name] = entry
+
+        evaluated = [entry for entry in classes.values() if entry['ap50'] is not None]
+        return {
+            'classes': classes,
+            'map50': float(np.mean([e['ap50'] for e in evaluated])) if evaluated else None,
+            'map50_95': float(np.mean([e['ap50_95'] for e in evaluated])) if evaluated else None,
+        }
+
+
+def latency_summary(seconds):
+    """
+    Summarize per-call latencies
+
+    Args:
+        seconds: Sequence of durations in seconds
+
+    Returns:
+        Dict with count, mean_ms, p50_ms, p95_ms, p99_ms
+    """
+    ms = np.asarray(seconds, dtype=np.float64) * 1000
+    if len(ms) == 0:
+        return {'count': 0, 'mean_ms': None, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        'count': len(ms),
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+    }
+
+
+def process_memory_bytes():
+    """
+    Resident memory of the current process
+
+    Returns:
+        Bytes, or None when it cannot be determined on this platform
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
@@ -0,0 +1,74 @@
+"""
+File hashing helpers for GSE Detection v11
+"""
+
+import hashlib
+from pathlib import Path
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.jsonl_index import JsonlIndex
+
+
+_INDEX = None
+_index_lock = threading.Lock()
+
+
+def file_digest(path, algorithm: str = "sha256", chunk_size: int = 1 << 20):
+    """
+    Hash a file's content without loading it into memory at once
+
+    Args:
+        path: File to hash
+        algorithm: hashlib algorithm name
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.new(algorithm)
+    with open(Path(path), 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _content_index():
+    """Process-wide JsonlIndex at config.CONTENT_HASH_INDEX (in memory when it is empty)"""
+    global _INDEX
+    path = Path(config.CONTENT_HASH_INDEX) if config.CONTENT_HASH_INDEX else None
+    with _index_lock:
+        if _INDEX is None or _INDEX.path != path:
+            _INDEX = JsonlIndex(path)
+        return _INDEX
+
+
+def cached_file_digest(path):
+    """
+    Content hash of a (video) file, reused while its size and mtime are unchanged
+
+    One index (config.CONTENT_HASH_INDEX) serves every caller, so the manifest
+    and the detection cache never read the same video twice. Worker processes
+    share it through the file, which is parsed once per process and only
+    appended to (see utils.jsonl_index).
+
+    Args:
+        path: File to hash
+
+    Returns:
+        sha256 hex digest
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    index = _content_index()
+
+    entry = index.get(str(path))
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['hash']
+
+    digest = file_digest(path)
+    index.put(str(path), {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest})
+    return digest
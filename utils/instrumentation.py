@@ -0,0 +1,342 @@
+"""
+Lightweight stage timing and counters for GSE Detection v11
+
+A process-wide registry (METRICS) accumulates seconds and call counts per
+pipeline stage plus plain counters. It is disabled by default: timer() then
+returns a shared no-op context manager and the other methods return
+immediately, so instrumented code pays only a method call.
+
+Metrics can be exported in Prometheus text exposition format (to a file for
+the node_exporter textfile collector, or on a local HTTP /metrics endpoint),
+and per-video breakdowns appended to a JSON-lines log.
+"""
+
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+# Pipeline stages in the order they are reported
+STAGES = ('decode', 'gating', 'preprocess', 'inference', 'nms', 'tracking', 'drawing', 'writing')
+
+# Results.speed keys (milliseconds per image) -> stage names
+_SPEED_STAGES = (('preprocess', 'preprocess'), ('inference', 'inference'), ('postprocess', 'nms'))
+
+
+class _NullTimer:
+    """Context manager that does nothing (instrumentation disabled)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Thread-safe registry of stage timings and counters
+    """
+
+    def __init__(self, enabled: bool = False, prefix: str = None):
+        """
+        Initialize registry
+
+        Args:
+            enabled: Record measurements (False: every call is a no-op)
+            prefix: Metric name prefix in the Prometheus export (default from config)
+        """
+        self.enabled = enabled
+        self.prefix = prefix or config.METRICS_PREFIX
+        self._lock = threading.Lock()
+        self._seconds = defaultdict(float)
+        self._calls = defaultdict(int)
+        self._counters = defaultdict(int)
+
+    def timer(self, stage: str):
+        """
+        Time a block of code as one call of a stage
+
+        Args:
+            stage: Stage name (see STAGES)
+
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage: str, seconds: float, calls: int = 1):
+        """Add measured time to a stage"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._seconds[stage] += seconds
+            self._calls[stage] += calls
+
+    def count(self, name: str, value: float = 1):
+        """Increase a counter (e.g. 'frames', 'detections')"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] += value
+
+    def record_speed(self, results):
+        """
+        Record preprocess / inference / NMS time reported by ultralytics
+
+        Args:
+            results: Iterable of ultralytics Results (speed in ms per image)
+        """
+        if not self.enabled:
+            return
+        for result in results:
+            speed = result.speed or {}
+            for key, stage in _SPEED_STAGES:
+                if speed.get(key) is not None:
+                    self.observe(stage, speed[key] / 1000)
+
+    def snapshot(self):
+        """
+        Copy the current totals
+
+        Returns:
+            Dict with 'stages' (stage -> seconds, calls) and 'counters'
+        """
+        with self._lock:
+            return {
+                'stages': {
+                    stage: {'seconds': self._seconds[stage], 'calls': self._calls[stage]}
+                    for stage in self._seconds
+                },
+                'counters': dict(self._counters),
+            }
+
+    def since(self, snapshot):
+        """
+        Totals accumulated after a snapshot was taken
+
+        Args:
+            snapshot: Dict returned by snapshot()
+
+        Returns:
+            Dict in the same format holding only the difference
+        """
+        current = self.snapshot()
+        stages = {}
+        for stage, totals in current['stages'].items():
+            before = snapshot['stages'].get(stage, {'seconds': 0.0, 'calls': 0})
+            if totals['calls'] != before['calls']:
+                stages[stage] = {
+                    'seconds': totals['seconds'] - before['seconds'],
+                    'calls': totals['calls'] - before['calls'],
+                }
+        counters = {
+            name: value - snapshot['counters'].get(name, 0)
+            for name, value in current['counters'].items()
+            if value != snapshot['counters'].get(name, 0)
+        }
+        return {'stages': stages, 'counters': counters}
+
+    def merge(self, delta):
+        """
+        Add totals measured elsewhere (e.g. returned by a worker process)
+
+        Args:
+            delta: Dict in the snapshot()/since() format
+        """
+        if not self.enabled or not delta:
+            return
+        with self._lock:
+            for stage, totals in delta.get('stages', {}).items():
+                self._seconds[stage] += totals['seconds']
+                self._calls[stage] += totals['calls']
+            for name, value in delta.get('counters', {}).items():
+                self._counters[name] += value
+
+    def reset(self):
+        """Clear all totals"""
+        with self._lock:
+            self._seconds.clear()
+            self._calls.clear()
+            self._counters.clear()
+
+    def prometheus_text(self):
+        """
+        Render totals in Prometheus text exposition format
+
+        Returns:
+            Exposition text
+        """
+        snapshot = self.snapshot()
+        stages = sorted(snapshot['stages'],
+                        key=lambda s: (STAGES.index(s) if s in STAGES else len(STAGES), s))
+
+        lines = [
+            f"# HELP {self.prefix}_stage_seconds Time spent per pipeline stage",
+            f"# TYPE {self.prefix}_stage_seconds summary",
+        ]
+        for stage in stages:
+            totals = snapshot['stages'][stage]
+            lines.append(f'{self.prefix}_stage_seconds_sum{{stage="{stage}"}} {totals["seconds"]:.6f}')
+            lines.append(f'{self.prefix}_stage_seconds_count{{stage="{stage}"}} {totals["calls"]}')
+
+        for name in sorted(snapshot['counters']):
+            metric = f"{self.prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {snapshot['counters'][name]:g}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Write the exposition text atomically (textfile collector friendly)
+
+        Args:
+            path: Output .prom file
+        """
+        path = Path(path)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """
+        Serve the exposition text on http://host:port/metrics from a daemon thread
+
+        Args:
+            port: TCP port
+            host: Bind address (localhost by default)
+
+        Returns:
+            The running ThreadingHTTPServer (call shutdown() to stop)
+        """
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class JsonlLog:
+    """
+    Append-only JSON-lines log (one record per processed video)
+    """
+
+    def __init__(self, path):
+        """
+        Open log
+
+        Args:
+            path: Output .jsonl file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, record: dict):
+        """
+        Append one record as a single line
+
+        Args:
+            record: JSON-serializable dict
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        # One write per line in append mode, so concurrent workers do not interleave
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+def video_record(video, delta, wall_seconds: float, **fields):
+    """
+    Build the JSON-lines record of one processed video
+
+    Args:
+        video: Video path
+        delta: Metrics.since() result covering the video
+        wall_seconds: Wall-clock processing time
+        **fields: Extra fields (e.g. output path, frames, detections)
+
+    Returns:
+        Dict with per-stage seconds, calls and share of wall time
+    """
+    stages = {
+        stage: {
+            'seconds': round(totals['seconds'], 6),
+            'calls': totals['calls'],
+            'share': round(totals['seconds'] / wall_seconds, 4) if wall_seconds > 0 else None,
+        }
+        for stage, totals in delta['stages'].items()
+    }
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'video': str(video),
+        'wall_seconds': round(wall_seconds, 6),
+        **fields,
+        'counters': delta['counters'],
+        'stages': stages,
+    }
+
+
+# Process-wide registry used by the detector, tracker and scripts
+METRICS = Metrics()
+
+
+def configure(enabled: bool = True):
+    """
+    Enable or disable the process-wide registry
+
+    Args:
+        enabled: Record measurements
+
+    Returns:
+        METRICS
+    """
+    METRICS.enabled = enabled
+    return METRICS
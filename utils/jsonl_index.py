@@ -0,0 +1,127 @@
+"""
+Append-only JSON-lines index shared by runs and worker processes
+
+Each line of the file holds one ``{"key": ..., "entry": {...}}`` record; a
+later line for the same key replaces the earlier one. A process parses the
+file once, and afterwards a lookup that misses only reads the lines other
+processes appended since. New entries are appended as one line under an
+exclusive file lock, so writers never rewrite (or lose) each other's
+entries and a write costs one line instead of the whole index.
+"""
+
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive advisory lock on ``<path>.lock`` across processes
+
+    Args:
+        path: File the lock guards
+    """
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JsonlIndex:
+    """
+    Key -> JSON entry index kept in memory and appended to a JSON-lines file
+    """
+
+    def __init__(self, path=None):
+        """
+        Open index (read lazily on the first lookup)
+
+        Args:
+            path: Index file (created on the first put); None keeps the
+                entries in memory only
+        """
+        self.path = Path(path) if path else None
+        self._entries = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        """Read the lines appended since the last read (all of them the first time)"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return
+        # A line still being written by another process is read next time
+        end = data.rfind(b'\n') + 1
+        lines = data[:end].splitlines()
+        try:
+            # One parse for the whole block (the first read may hold the full index)
+            records = json.loads(b'[' + b','.join(lines) + b']') if lines else []
+        except ValueError:
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # damaged line: the entry is recomputed and appended again
+        for record in records:
+            if isinstance(record, dict) and 'key' in record and 'entry' in record:
+                self._entries[record['key']] = record['entry']
+        self._offset += end
+
+    def get(self, key: str):
+        """
+        Entry of a key
+
+        Args:
+            key: Index key
+
+        Returns:
+            Entry dict, or None when not indexed (here or by another process)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.path is not None:
+                self._refresh()
+                entry = self._entries.get(key)
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """
+        Store an entry and append it to the file
+
+        Args:
+            key: Index key
+            entry: JSON-serializable dict
+        """
+        line = json.dumps({'key': key, 'entry': entry}) + '\n'
+        with self._lock:
+            self._entries[key] = entry
+            if self.path is None:
+                return
+            with file_lock(self.path):
+                with open(self.path, 'a') as f:
+                    f.write(line)
@@ -0,0 +1,380 @@
+"""
+Live stream helpers for GSE Detection v11
+
+For live apron monitoring a growing lag is worse than a dropped frame, so a
+capture thread decodes continuously and keeps only the newest frame; the
+consumer always processes the most recent picture. Video files can be
+replayed at their recorded frame rate to test the live path offline.
+"""
+
+from pathlib import Path
+import math
+import sys
+import threading
+import time
+
+import cv2
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+def parse_source(source):
+    """
+    Normalize a stream source
+
+    Args:
+        source: Stream URL (rtsp://, http://, ...), video file, or device index
+
+    Returns:
+        int for device indices ("0" -> 0), otherwise the source as a string
+    """
+    if isinstance(source, int):
+        return source
+    source = str(source)
+    return int(source) if source.isdigit() else source
+
+
+def source_name(source):
+    """
+    File-system friendly name for a source (used for output files)
+
+    Args:
+        source: Stream URL, video file or device index
+
+    Returns:
+        e.g. 'video_01' for a file, 'cam12_stream' for rtsp://cam12/stream,
+        'device0' for device 0
+    """
+    source = parse_source(source)
+    if isinstance(source, int):
+        return f"device{source}"
+    if "://" not in source:
+        return Path(source).stem
+    name = source.split("://", 1)[1].split("?", 1)[0].rsplit("@", 1)[-1]
+    return "".join(c if c.isalnum() else "_" for c in name).strip("_") or "stream"
+
+
+class LatestFrameReader:
+    """
+    Capture thread that keeps only the newest decoded frame
+
+    Frames the consumer did not pick up before a newer one arrived are
+    dropped. Live sources are reopened after a read failure or a stall;
+    files end at their last frame.
+    """
+
+    def __init__(self, source, realtime: bool = True, stall_timeout: float = None,
+                 reconnect_delay: float = None, max_reconnects: int = None):
+        """
+        Initialize reader (call start() to open the source)
+
+        Args:
+            source: Stream URL, video file or device index
+            realtime: Replay video files at their frame rate (live sources are
+                read as fast as they deliver)
+            stall_timeout: Seconds without a frame before a live source is
+                reopened (default config.LIVE_STALL_TIMEOUT)
+            reconnect_delay: Seconds between reconnect attempts (default config.LIVE_RECONNECT_DELAY)
+            max_reconnects: Failed attempts in a row before giving up
+                (default config.LIVE_MAX_RECONNECTS; 0 retries forever)
+        """
+        self.source = parse_source(source)
+        self.is_file = isinstance(self.source, str) and Path(self.source).is_file()
+        self.realtime = realtime
+        self.stall_timeout = stall_timeout or config.LIVE_STALL_TIMEOUT
+        self.reconnect_delay = (config.LIVE_RECONNECT_DELAY if reconnect_delay is None
+                                else reconnect_delay)
+        self.max_reconnects = (config.LIVE_MAX_RECONNECTS if max_reconnects is None
+                               else max_reconnects)
+
+        self.fps = None
+        self.width = None
+        self.height = None
+
+        # Counters (frames are numbered 1, 2, ... across reconnects)
+        self.captured = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.error = None
+
+        self._cap = None
+        self._latest = None
+        self._ended = False
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _open(self):
+        if self.is_file or isinstance(self.source, int):
+            cap = cv2.VideoCapture(self.source)
+        else:
+            # Bound blocking opens/reads on network streams where OpenCV supports it
+            params = []
+            timeout_ms = int(self.stall_timeout * 1000)
+            for prop in ('CAP_PROP_OPEN_TIMEOUT_MSEC', 'CAP_PROP_READ_TIMEOUT_MSEC'):
+                if hasattr(cv2, prop):
+                    params += [getattr(cv2, prop), timeout_ms]
+            cap = cv2.VideoCapture(self.source, cv2.CAP_FFMPEG, params)
+        if not cap.isOpened():
+            cap.release()
+            return None
+
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return cap
+
+    def start(self):
+        """
+        Open the source and start the capture thread
+
+        Returns:
+            self
+
+        Raises:
+            IOError: The source cannot be opened
+        """
+        self._cap = self._open()
+        if self._cap is None:
+            raise IOError(f"Failed to open stream: {self.source}")
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def _reconnect(self):
+        failures = 0
+        while not self._stop.is_set():
+            if self._cap is not None:
+                self._cap.release()
+                self._cap = None
+            if self._stop.wait(self.reconnect_delay):
+                return False
+            self._cap = self._open()
+            if self._cap is not None:
+                self.reconnects += 1
+                return True
+            failures += 1
+            if self.max_reconnects and failures >= self.max_reconnects:
+                self.error = f"Gave up after {failures} reconnect attempts: {self.source}"
+                return False
+        return False
+
+    def _run(self):
+        start = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                read_start = time.monotonic()
+                ok, frame = self._cap.read()
+                stalled = time.monotonic() - read_start > self.stall_timeout
+                if not ok or stalled:
+                    if self.is_file and not stalled:
+                        break
+                    if not self._reconnect():
+                        break
+                    continue
+
+                if self.is_file and self.realtime:
+                    # Replay at the recorded frame rate, like a camera would deliver
+                    delay = start + self.captured / self.fps - time.monotonic()
+                    if delay > 0 and self._stop.wait(delay):
+                        break
+
+                with self._cond:
+                    self.captured += 1
+                    if self._latest is not None:
+                        self.dropped += 1
+                    self._latest = (self.captured, time.time(), frame)
+                    self._cond.notify_all()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            if self._cap is not None:
+                self._cap.release()
+                self._cap = None
+            with self._cond:
+                self._ended = True
+                self._cond.notify_all()
+
+    def read(self, min_index: int = 0, timeout: float = None):
+        """
+        Take the newest frame
+
+        Args:
+            min_index: Wait for a frame numbered at least this (adaptive
+                stride); older pending frames are dropped
+            timeout: Seconds to wait (None: until a frame arrives or the stream ends)
+
+        Returns:
+            (frame_index, capture_unix_time, frame), or None once the stream
+            has ended (see .error for the reason on live sources)
+
+        Raises:
+            TimeoutError: No frame within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._latest is not None and self._latest[0] >= min_index:
+                    item, self._latest = self._latest, None
+                    return item
+                if self._ended:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No frame from {self.source} within {timeout}s")
+                self._cond.wait(remaining)
+
+    def stop(self):
+        """Stop the capture thread and release the source"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class AdaptiveStride:
+    """
+    Choose how many captured frames to advance per inference
+
+    With LatestFrameReader the capture-to-result latency is about one
+    inference plus at most one frame interval, whatever the stride: frames
+    captured while the model runs are dropped anyway, and a larger stride only
+    waits for a later frame. The stride therefore tracks the smoothed
+    inference time against the frame interval: it is the number of frames
+    that arrive during one inference, so the next frame taken is the first
+    one captured after the previous inference finished (no stale frame, no
+    idle waiting). It also bounds the inference rate at fps / stride.
+
+    The latency target cannot be reached by skipping frames; latencies above
+    it are only counted (over_target), they do not raise the stride.
+    """
+
+    def __init__(self, target_latency: float = None, max_stride: int = None, smoothing: float = 0.2,
+                 frame_interval: float = None):
+        """
+        Initialize controller
+
+        Args:
+            target_latency: Seconds from capture to result that are reported as
+                exceeded (default config.LIVE_TARGET_LATENCY_MS)
+            max_stride: Upper bound for the stride (default config.LIVE_MAX_STRIDE)
+            smoothing: Weight of the newest sample in the moving averages
+            frame_interval: Seconds between captured frames (1 / fps); without
+                it the stride stays 1
+        """
+        self.target_latency = target_latency or config.LIVE_TARGET_LATENCY_MS / 1000
+        self.max_stride = max_stride or config.LIVE_MAX_STRIDE
+        self.smoothing = smoothing
+        self.frame_interval = frame_interval
+        self.stride = 1
+        self.latency = None
+        self.inference_time = None
+        self.over_target = 0
+
+    def _smooth(self, average, sample):
+        if average is None or math.isnan(average):
+            return sample
+        return average + self.smoothing * (sample - average)
+
+    def update(self, latency: float, inference_time: float = None):
+        """
+        Record one processed frame
+
+        Args:
+            latency: Seconds from capture to result
+            inference_time: Seconds spent processing the frame (default:
+                latency, an upper bound)
+
+        Returns:
+            Stride for the next frame
+        """
+        self.latency = self._smooth(self.latency, latency)
+        self.inference_time = self._smooth(self.inference_time,
+                                           latency if inference_time is None else inference_time)
+        if latency > self.target_latency:
+            self.over_target += 1
+
+        if self.frame_interval:
+            frames = math.ceil(self.inference_time / self.frame_interval - 1e-6)
+            self.stride = min(max(frames, 1), self.max_stride)
+        return self.stride
+
+
+def live_frames(reader: LatestFrameReader, stride: AdaptiveStride = None, duration: float = None):
+    """
+    Iterate over the frames a live consumer should process
+
+    Args:
+        reader: Started LatestFrameReader
+        stride: Optional controller; report each frame's latency with
+            stride.update() before taking the next frame
+        duration: Stop after this many seconds (None: until the stream ends)
+
+    Yields:
+        (frame_index, capture_unix_time, frame)
+    """
+    end = None if duration is None else time.monotonic() + duration
+    last_index = 0
+    while end is None or time.monotonic() < end:
+        step = stride.stride if stride is not None else 1
+        try:
+            item = reader.read(min_index=last_index + step,
+                               timeout=None if end is None else max(0.0, end - time.monotonic()))
+        except TimeoutError:
+            return
+        if item is None:
+            return
+        last_index = item[0]
+        yield item
+
+
+class TimestampWriter:
+    """
+    Sidecar CSV mapping MOT frame numbers to wall-clock times, written line by line
+    """
+
+    HEADER = "frame,capture_time,result_time\n"
+
+    def __init__(self, path):
+        """
+        Open sidecar
+
+        Args:
+            path: Output .csv file (overwritten)
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "w")
+        self._file.write(self.HEADER)
+
+    def write(self, frame_idx: int, capture_time: float, result_time: float = None):
+        """
+        Append one frame (Unix times in seconds) and flush
+
+        Args:
+            frame_idx: MOT frame number
+            capture_time: When the frame was captured
+            result_time: When its result was written (default: now)
+        """
+        result_time = time.time() if result_time is None else result_time
+        self._file.write(f"{frame_idx},{capture_time:.3f},{result_time:.3f}\n")
+        self._file.flush()
+
+    def close(self):
+        """Close the file"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,224 @@
+"""
+Output-directory manifest for incremental batch runs
+
+Records, per processed video, a content hash of the input, the hash of the
+model weights, the confidence threshold and the tracker configuration that
+produced its outputs. A rerun then only processes videos that are new, whose
+content changed, whose outputs are missing, or whose model/parameters differ
+from the recorded ones.
+
+Content hashes are reused while a file's size and mtime are unchanged, so an
+unchanged directory is checked without reading any video data; hashes of new
+files go through the index shared with the detection cache (utils.hashing).
+"""
+
+import importlib.util
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.hashing import cached_file_digest, file_digest
+from utils.tracking import NATIVE_TRACKER
+
+
+MANIFEST_VERSION = 1
+
+# Status of a video relative to the manifest (shown by the scripts' --dry-run)
+STATUS_LABELS_CN = {
+    'new': "新视频",
+    'changed': "视频内容已变化",
+    'params': "模型或参数已变化",
+    'missing': "输出文件缺失",
+    'done': "已是最新",
+    'untracked': "输出已存在，无清单记录",
+    'forced': "强制重新处理",
+}
+
+
+def tracker_digest(tracker_cfg: str = "bytetrack.yaml"):
+    """
+    Hash of a tracker configuration file
+
+    Args:
+        tracker_cfg: Path, or name of a config shipped with ultralytics
+            (located without importing ultralytics), or NATIVE_TRACKER
+
+    Returns:
+        Hex digest, the native tracker's parameters (they come from config.py),
+        or the name itself when the file cannot be found
+    """
+    if tracker_cfg == NATIVE_TRACKER:
+        from utils.bytetrack import ByteTracker
+        return f"{NATIVE_TRACKER}:{json.dumps(ByteTracker().params(), sort_keys=True)}"
+
+    path = Path(tracker_cfg)
+    if not path.is_file():
+        spec = importlib.util.find_spec("ultralytics")
+        if spec is None or spec.origin is None:
+            return tracker_cfg
+        path = Path(spec.origin).parent / "cfg" / "trackers" / tracker_cfg
+        if not path.is_file():
+            return tracker_cfg
+    return file_digest(path)
+
+
+def run_params(model_path: str = None, conf_threshold: float = 0.1,
+               tracker_cfg: str = "bytetrack.yaml", **options):
+    """
+    Parameters that determine a video's outputs
+
+    Args:
+        model_path: Weights (default config.MODEL_PATH); recorded by content hash
+        conf_threshold: Detection confidence threshold
+        tracker_cfg: Tracker config name or path, recorded by content hash, or
+            NATIVE_TRACKER, recorded by its parameters
+        **options: Further output-affecting options (e.g. motion_gate, columnar)
+
+    Returns:
+        JSON-serializable dict
+    """
+    return dict(weights=file_digest(model_path or config.MODEL_PATH),
+                conf=conf_threshold, tracker=tracker_digest(tracker_cfg), **options)
+
+
+class Manifest:
+    """
+    JSON manifest (config.MANIFEST_NAME) in an output directory
+    """
+
+    def __init__(self, directory):
+        """
+        Load manifest (a missing or unreadable file starts empty)
+
+        Args:
+            directory: Directory holding the manifest; videos below it are
+                keyed by relative path, others by absolute path
+        """
+        self.directory = Path(directory)
+        self.path = self.directory / config.MANIFEST_NAME
+        self.entries = {}
+        self._dirty = False
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data['entries']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _key(self, video_path):
+        path = Path(video_path).resolve()
+        try:
+            return path.relative_to(self.directory.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def content_hash(self, video_path):
+        """
+        Content hash of a video, reusing the recorded one while size and mtime match
+
+        Args:
+            video_path: Video file
+
+        Returns:
+            Hex digest
+        """
+        stat = Path(video_path).stat()
+        entry = self.entries.get(self._key(video_path))
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['video_hash']
+        # Shared index: a video just hashed for the detection cache is not read again
+        return cached_file_digest(video_path)
+
+    def status(self, video_path, params: dict, outputs):
+        """
+        Compare a video with its manifest entry
+
+        Args:
+            video_path: Video file
+            params: run_params() of the planned run
+            outputs: Output paths the run would write
+
+        Returns:
+            'new', 'untracked' (no entry but outputs exist), 'missing',
+            'changed', 'params' or 'done'
+        """
+        entry = self.entries.get(self._key(video_path))
+        if entry is None:
+            return 'untracked' if all(Path(p).exists() for p in outputs) else 'new'
+        if not all(Path(p).exists() for p in outputs):
+            return 'missing'
+        stat = Path(video_path).stat()
+        if (entry['size'], entry['mtime_ns']) != (stat.st_size, stat.st_mtime_ns):
+            if cached_file_digest(video_path) != entry['video_hash']:
+                return 'changed'
+            # Same content under a new mtime (copied, touched): skip rehashing next time
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self._dirty = True
+        if entry['params'] != params:
+            return 'params'
+        return 'done'
+
+    def record(self, video_path, params: dict, outputs):
+        """
+        Record a completed video and save the manifest
+
+        Args:
+            video_path: Video file
+            params: run_params() used
+            outputs: Output paths written
+        """
+        stat = Path(video_path).stat()
+        self.entries[self._key(video_path)] = {
+            'video_hash': self.content_hash(video_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'params': params,
+            'outputs': [str(p) for p in outputs],
+            'completed': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self.save()
+
+    def save(self):
+        """Write the manifest atomically"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def plan_videos(manifest: Manifest, video_files, params: dict, outputs_fn, force: bool = False,
+                run_untracked: bool = True):
+    """
+    Decide which videos a run processes
+
+    Args:
+        manifest: Manifest of the output directory
+        video_files: Candidate videos
+        params: run_params() of the planned run
+        outputs_fn: Maps a video path to the list of its output paths
+        force: Process every video
+        run_untracked: Process videos whose outputs exist without a manifest entry
+            (outputs written before manifests existed)
+
+    Returns:
+        List of (video_file, status, run) tuples in input order
+    """
+    plan = []
+    for video_file in video_files:
+        if force:
+            plan.append((video_file, 'forced', True))
+            continue
+        status = manifest.status(video_file, params, outputs_fn(video_file))
+        run = status not in ('done', 'untracked') or (status == 'untracked' and run_untracked)
+        plan.append((video_file, status, run))
+    if manifest._dirty:
+        manifest.save()
+    return plan
@@ -0,0 +1,135 @@
+"""
+Process-wide model registry for GSE Detection v11
+
+Loading weights (and importing ultralytics/torch) dominates the startup of
+every entry point. get_model() loads a model once per (weights, backend,
+precision, device) and hands the same instance to every later caller in the
+process, so e.g. test_model.py and a worker that builds several detectors pay
+for one load only.
+
+A shared model is not thread-safe: callers that predict from several threads
+at once need their own instance (shared=False).
+"""
+
+from pathlib import Path
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.backends import load_model
+from utils.det_cache import model_input_size
+
+
+_MODELS = {}
+_LOCK = threading.Lock()
+
+# Seconds spent in load_model() / warm-up, per registry key
+_LOAD_SECONDS = {}
+
+# Registry keys whose model has run its warm-up inference
+_WARMED = set()
+
+
+def _key(model_path, backend, precision, device):
+    return (str(Path(model_path).resolve()), backend, precision, device)
+
+
+def warmup(model, imgsz: int = None, device: str = None):
+    """
+    Run one inference on a blank frame
+
+    The first call allocates runtime buffers and (for PyTorch) fuses Conv+BN
+    layers; doing it up front keeps that cost out of the first real frame.
+
+    Args:
+        model: ultralytics YOLO model
+        imgsz: Input size (default: the size predict() uses for the model)
+        device: Device passed to predict (default config.DEVICE)
+    """
+    imgsz = imgsz or model_input_size(model)
+    frame = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+    model.predict(frame, imgsz=imgsz, device=device or config.DEVICE, verbose=False)
+
+
+def get_model(model_path: str = None, backend: str = None, precision: str = None,
+              device: str = None, warm: bool = None, shared: bool = True):
+    """
+    Load a model, reusing the instance already loaded in this process
+
+    Args:
+        model_path: PyTorch weights (default config.MODEL_PATH)
+        backend: 'torch', 'onnx' or 'openvino' (default config.BACKEND)
+        precision: 'fp32' or 'int8' (default config.PRECISION)
+        device: Device to move PyTorch models to (default config.DEVICE)
+        warm: Run a warm-up inference after loading (default config.MODEL_WARMUP);
+            a registry model loaded cold earlier is warmed on the first call asking for it
+        shared: Return the registry instance (False: always load a private copy)
+
+    Returns:
+        ultralytics YOLO model (PyTorch models are fused)
+    """
+    model_path = model_path or config.MODEL_PATH
+    backend = backend or config.BACKEND
+    precision = precision or config.PRECISION
+    device = device or config.DEVICE
+    warm = config.MODEL_WARMUP if warm is None else warm
+    key = _key(model_path, backend, precision, device)
+
+    if shared:
+        with _LOCK:
+            model = _MODELS.get(key)
+        if model is not None:
+            if warm and key not in _WARMED:
+                warmup(model, device=device)
+                with _LOCK:
+                    _WARMED.add(key)
+            return model
+
+    start = time.perf_counter()
+    model = load_model(model_path, backend, precision=precision)
+    if backend == "torch":
+        if device:
+            model.to(device)
+        # Conv+BN fusion up front (predict would otherwise do it on the first call)
+        model.model = model.model.fuse(verbose=False)
+    if warm:
+        warmup(model, device=device)
+
+    if not shared:
+        return model
+    with _LOCK:
+        # Another thread may have loaded the same model meanwhile; keep the first
+        registered = _MODELS.setdefault(key, model)
+        _LOAD_SECONDS.setdefault(key, time.perf_counter() - start)
+        if warm and registered is model:
+            _WARMED.add(key)
+    if warm and key not in _WARMED:
+        # The kept instance came from a thread that loaded it cold
+        warmup(registered, device=device)
+        with _LOCK:
+            _WARMED.add(key)
+    return registered
+
+
+def loaded_models():
+    """
+    Models currently held by the registry
+
+    Returns:
+        Dict (weights path, backend, precision, device) -> load seconds
+    """
+    with _LOCK:
+        return {key: _LOAD_SECONDS.get(key) for key in _MODELS}
+
+
+def clear_models():
+    """Drop every registered model (e.g. after the weights file changed)"""
+    with _LOCK:
+        _MODELS.clear()
+        _LOAD_SECONDS.clear()
+        _WARMED.clear()
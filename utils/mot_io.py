@@ -0,0 +1,193 @@
+"""
+MOT Challenge annotation I/O for GSE Detection v11
+"""
+
+from pathlib import Path
+import sys
+import warnings
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+# One MOT Challenge row: frame, track_id, x1, y1, w, h, conf, class_id, -1, -1
+MOT_LINE_FORMAT = "%d,%d,%.2f,%.2f,%.2f,%.2f,%.2f,%d,-1,-1\n"
+
+
+def format_mot_rows(frame_ids, track_ids, tlwh, confidences, class_ids):
+    """
+    Format rows of any number of frames as MOT Challenge lines
+
+    Args:
+        frame_ids: (N,) array of frame numbers (1-based)
+        track_ids: (N,) array of track IDs
+        tlwh: (N, 4) array of top-left x, top-left y, width, height
+        confidences: (N,) array of confidences
+        class_ids: (N,) array of class IDs
+
+    Returns:
+        MOT text block ('' when N == 0)
+    """
+    tlwh = np.asarray(tlwh)
+    n = len(tlwh)
+    if n == 0:
+        return ""
+
+    # Columns are assembled in NumPy; the text is then produced by a single
+    # %-format over the flattened block instead of one str.format per box
+    block = np.empty((n, 8), dtype=np.float64)
+    block[:, 0] = frame_ids
+    block[:, 1] = track_ids
+    block[:, 2:6] = tlwh
+    block[:, 6] = confidences
+    block[:, 7] = class_ids
+
+    return (MOT_LINE_FORMAT * n) % tuple(block.ravel().tolist())
+
+
+def xywh_to_tlwh(xywh):
+    """
+    Convert center boxes to top-left boxes (MOT standard), keeping the dtype
+
+    Args:
+        xywh: (N, 4) array of center x, center y, width, height
+
+    Returns:
+        (N, 4) array of top-left x, top-left y, width, height
+    """
+    xywh = np.asarray(xywh)
+    tlwh = xywh.copy()
+    tlwh[:, :2] = xywh[:, :2] - xywh[:, 2:4] / 2
+    return tlwh
+
+
+def format_mot_block(frame_idx: int, xywh, track_ids, confidences, class_ids):
+    """
+    Format all objects of one frame as MOT Challenge lines
+
+    Args:
+        frame_idx: Frame number (1-based, MOT standard)
+        xywh: (N, 4) array of center x, center y, width, height
+        track_ids: (N,) array of track IDs
+        confidences: (N,) array of confidences
+        class_ids: (N,) array of class IDs
+
+    Returns:
+        MOT text block for the frame ('' when N == 0)
+    """
+    if len(xywh) == 0:
+        return ""
+    return format_mot_rows(frame_idx, track_ids, xywh_to_tlwh(xywh), confidences, class_ids)
+
+
+def read_mot(path):
+    """
+    Load a MOT Challenge annotation file into column arrays
+
+    Args:
+        path: MOT text file (10 comma-separated columns)
+
+    Returns:
+        Dict with 'frame', 'id', 'tlwh' (N, 4), 'conf', 'cls' and 'extra'
+        (N, 2, the two trailing placeholder columns)
+    """
+    with warnings.catch_warnings():
+        # An empty annotation file is valid (no objects tracked)
+        warnings.simplefilter("ignore", UserWarning)
+        data = np.loadtxt(path, delimiter=",", ndmin=2, dtype=np.float64)
+
+    if data.size == 0:
+        data = np.empty((0, 10), dtype=np.float64)
+    if data.shape[1] != 10:
+        raise ValueError(f"Expected 10 MOT columns in {path}, got {data.shape[1]}")
+
+    return {
+        'frame': data[:, 0].astype(np.int64),
+        'id': data[:, 1].astype(np.int64),
+        'tlwh': data[:, 2:6],
+        'conf': data[:, 6],
+        'cls': data[:, 7].astype(np.int64),
+        'extra': data[:, 8:10],
+    }
+
+
+class MOTWriter:
+    """
+    Buffered MOT Challenge writer taking whole per-frame arrays
+    """
+
+    def __init__(self, path, flush_lines: int = None, mode: str = "w"):
+        """
+        Open writer
+
+        Args:
+            path: Output annotation file
+            flush_lines: Buffered lines before writing to disk (default from config)
+            mode: File open mode ('w' to overwrite, 'a' to append)
+        """
+        self.path = Path(path)
+        self.flush_lines = flush_lines or config.MOT_FLUSH_LINES
+        self.lines_written = 0
+
+        self._file = open(self.path, mode)
+        self._buffer = []
+        self._buffered_lines = 0
+
+    def write_frame(self, frame_idx: int, xywh, track_ids, confidences, class_ids):
+        """
+        Append all objects of one frame
+
+        Args:
+            frame_idx: Frame number (1-based, MOT standard)
+            xywh: (N, 4) array of center x, center y, width, height
+            track_ids: (N,) array of track IDs
+            confidences: (N,) array of confidences
+            class_ids: (N,) array of class IDs
+
+        Returns:
+            Number of lines written for the frame
+        """
+        n = len(xywh)
+        if n == 0:
+            return 0
+
+        self._buffer.append(format_mot_block(frame_idx, xywh, track_ids, confidences, class_ids))
+        self._buffered_lines += n
+        self.lines_written += n
+
+        if self._buffered_lines >= self.flush_lines:
+            self.flush()
+        return n
+
+    def flush(self):
+        """Write buffered lines to the file"""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer = []
+            self._buffered_lines = 0
+        self._file.flush()
+
+    def tell(self):
+        """
+        Flush and return the current byte offset of the file
+
+        Returns:
+            Byte offset after the last written line
+        """
+        self.flush()
+        return self._file.tell()
+
+    def close(self):
+        """Flush and close the file"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,107 @@
+"""
+Frame-level motion gating for GSE Detection v11
+"""
+
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+class MotionGate:
+    """
+    Decide per frame whether the scene changed enough to run the detector again
+
+    Each frame is reduced to a small blurred grayscale thumbnail and compared
+    with the thumbnail of the last frame that went through the model. Comparing
+    against that reference (rather than the previous frame) means slow changes
+    still add up and eventually trigger inference. A frame is also forced
+    through the model after max_skip consecutive skipped frames.
+    """
+
+    def __init__(self, threshold: float = None, pixel_delta: int = None,
+                 width: int = None, max_skip: int = None):
+        """
+        Initialize gate
+
+        Args:
+            threshold: Fraction of changed thumbnail pixels that triggers inference
+            pixel_delta: Gray-level difference for a pixel to count as changed
+            width: Thumbnail width in pixels (height keeps the aspect ratio)
+            max_skip: Maximum consecutive frames skipped before forcing inference
+        """
+        self.threshold = config.MOTION_GATE_THRESHOLD if threshold is None else threshold
+        self.pixel_delta = config.MOTION_GATE_PIXEL_DELTA if pixel_delta is None else pixel_delta
+        self.width = width or config.MOTION_GATE_WIDTH
+        self.max_skip = config.MOTION_GATE_MAX_SKIP if max_skip is None else max_skip
+        self.reset()
+
+    def reset(self):
+        """Forget the reference frame and counters (e.g. for a new video)"""
+        self.frames = 0
+        self.inferred = 0
+        self.last_score = None
+        self._reference = None
+        self._since_inference = 0
+
+    def _thumbnail(self, frame):
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        thumb = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        # Blur so sensor noise and compression artifacts do not count as motion
+        return cv2.GaussianBlur(thumb, (5, 5), 0)
+
+    def should_infer(self, frame):
+        """
+        Score a frame against the reference and decide whether to run the model
+
+        Args:
+            frame: BGR (or grayscale) image
+
+        Returns:
+            True if the detector should run on this frame
+        """
+        thumb = self._thumbnail(frame)
+        self.frames += 1
+
+        if self._reference is None or self._reference.shape != thumb.shape:
+            infer = True
+            self.last_score = None
+        else:
+            diff = cv2.absdiff(thumb, self._reference)
+            self.last_score = np.count_nonzero(diff > self.pixel_delta) / diff.size
+            infer = (self.last_score >= self.threshold
+                     or self._since_inference >= self.max_skip)
+
+        if infer:
+            self._reference = thumb
+            self._since_inference = 0
+            self.inferred += 1
+        else:
+            self._since_inference += 1
+        return infer
+
+    @property
+    def skipped(self):
+        """Number of frames for which inference was skipped"""
+        return self.frames - self.inferred
+
+    def stats(self):
+        """
+        Summarize gating decisions
+
+        Returns:
+            Dict with frames, inferred, skipped and skip_ratio
+        """
+        return {
+            'frames': self.frames,
+            'inferred': self.inferred,
+            'skipped': self.skipped,
+            'skip_ratio': self.skipped / self.frames if self.frames else 0.0,
+        }
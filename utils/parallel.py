@@ -0,0 +1,103 @@
+"""
+Process-pool parallelism across videos for GSE Detection v11
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# Per-process state built once by the worker initializer (e.g. a loaded model)
+_worker_state = None
+
+
+def default_threads_per_worker(workers: int):
+    """
+    Split the machine's cores evenly between worker processes
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        Number of threads each worker may use (at least 1)
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def limit_threads(num_threads: int):
+    """
+    Cap the torch, OpenCV and BLAS thread pools of the current process
+
+    Args:
+        num_threads: Maximum number of threads per pool
+    """
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(num_threads)
+
+    import cv2
+    cv2.setNumThreads(num_threads)
+
+    import torch
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(num_threads)
+    except RuntimeError:
+        # Only allowed before the first parallel op in this process
+        pass
+
+
+def _init_worker(num_threads, init_fn, init_args):
+    global _worker_state
+    limit_threads(num_threads)
+    _worker_state = init_fn(*init_args)
+
+
+def _run_task(task_fn, item):
+    return task_fn(_worker_state, item)
+
+
+def run_sharded(items, init_fn, task_fn, workers: int, init_args=(),
+                threads_per_worker: int = None):
+    """
+    Distribute items over worker processes that each build their state once
+
+    Items are handed out one at a time as workers become free, so long and short
+    videos balance across the pool. Each worker calls ``init_fn(*init_args)``
+    once (loading its own model and tracker) and then ``task_fn(state, item)``
+    for every item it receives. Both functions must be module-level so they can
+    be pickled into spawned processes.
+
+    Args:
+        items: Work items (e.g. video paths or job tuples)
+        init_fn: Builds the per-worker state
+        task_fn: Processes one item with the worker state
+        workers: Number of worker processes
+        init_args: Arguments for init_fn
+        threads_per_worker: Thread budget per worker (default: cores / workers)
+
+    Yields:
+        (item, result, error) tuples in completion order; error is the exception
+        raised by task_fn or None
+    """
+    items = list(items)
+    if not items:
+        return
+
+    workers = max(1, min(workers, len(items)))
+    num_threads = threads_per_worker or default_threads_per_worker(workers)
+
+    # spawn: forking a process that already initialized torch is not safe
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(num_threads, init_fn, tuple(init_args))
+    ) as executor:
+        futures = {executor.submit(_run_task, task_fn, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as exc:
+                yield item, None, exc
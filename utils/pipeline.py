@@ -0,0 +1,163 @@
+"""
+Threaded stage pipeline for GSE Detection v11
+"""
+
+import queue
+import threading
+import time
+
+
+# Marker passed down the queues once the source is exhausted
+_END = object()
+
+
+class StageStats:
+    """
+    Throughput counters for one pipeline stage
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+
+    @property
+    def fps(self):
+        """Items per second of busy time (the stage's own capacity)"""
+        return self.items / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+
+class StagedPipeline:
+    """
+    Run a source and a chain of stages on separate threads joined by bounded queues
+
+    Every stage owns exactly one worker thread and the queues are FIFO, so items
+    leave the pipeline in the order the source produced them. The queues are
+    bounded: once a queue is full its producer blocks, which keeps a fast decoder
+    from buffering an unbounded number of frames ahead of a slow model.
+    """
+
+    def __init__(self, source, stages, queue_size: int = 4, count=None,
+                 source_name: str = "decode"):
+        """
+        Initialize pipeline
+
+        Args:
+            source: Iterable producing items, consumed on its own thread
+            stages: List of (name, fn) pairs; each fn maps one item to the next
+            queue_size: Capacity of each inter-stage queue
+            count: Function giving the number of frames in an item (default 1)
+            source_name: Stage name reported for the source
+        """
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be >= 1, got {queue_size}")
+
+        self.source = source
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.count = count or (lambda item: 1)
+        self.stats = [StageStats(source_name)] + [StageStats(name) for name, _ in self.stages]
+        self.wall_seconds = 0.0
+
+        self._stop = threading.Event()
+        self._error = None
+        self._error_lock = threading.Lock()
+
+    def run(self):
+        """
+        Run the pipeline to completion
+
+        Returns:
+            List of StageStats, source first
+
+        Raises:
+            The first exception raised by any stage
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = [threading.Thread(
+            target=self._source_worker, args=(queues[0] if queues else None, self.stats[0]),
+            name=self.stats[0].name, daemon=True
+        )]
+        for i, (name, fn) in enumerate(self.stages):
+            out_q = queues[i + 1] if i + 1 < len(queues) else None
+            threads.append(threading.Thread(
+                target=self._stage_worker, args=(fn, queues[i], out_q, self.stats[i + 1]),
+                name=name, daemon=True
+            ))
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self._stop.set()
+            raise
+        self.wall_seconds = time.perf_counter() - start
+
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def _fail(self, exc):
+        with self._error_lock:
+            if self._error is None:
+                self._error = exc
+        self._stop.set()
+
+    def _put(self, q, item):
+        """Put with backpressure; gives up when the pipeline is stopping"""
+        if q is None:
+            return True
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _END
+
+    def _source_worker(self, out_q, stats):
+        try:
+            iterator = iter(self.source)
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.busy_seconds += time.perf_counter() - start
+                stats.items += self.count(item)
+                if not self._put(out_q, item):
+                    return
+        except Exception as exc:
+            self._fail(exc)
+        finally:
+            self._put(out_q, _END)
+
+    def _stage_worker(self, fn, in_q, out_q, stats):
+        try:
+            while True:
+                item = self._get(in_q)
+                if item is _END:
+                    break
+                start = time.perf_counter()
+                result = fn(item)
+                stats.busy_seconds += time.perf_counter() - start
+                stats.items += self.count(item)
+                if not self._put(out_q, result):
+                    return
+        except Exception as exc:
+            self._fail(exc)
+        finally:
+            self._put(out_q, _END)
@@ -0,0 +1,135 @@
+"""
+INT8 post-training quantization for GSE Detection v11
+
+Static quantization with onnxruntime: activation ranges are calibrated on a
+folder of representative apron frames, then weights (per channel) and
+activations are stored as 8-bit integers in QDQ format. The non-Conv nodes of
+the detection head (box decoding, concatenation of coordinates and class
+scores) stay in FP32, since pixel coordinates and probabilities sharing one
+8-bit range would destroy the scores.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def find_calibration_images(calibration_dir, max_images: int = None):
+    """
+    List calibration images, evenly subsampled when there are too many
+
+    Args:
+        calibration_dir: Folder of apron frames (searched recursively)
+        max_images: Maximum number of images (default config.CALIBRATION_MAX_IMAGES)
+
+    Returns:
+        Sorted list of image paths
+    """
+    max_images = max_images or config.CALIBRATION_MAX_IMAGES
+    images = sorted(
+        path for path in Path(calibration_dir).rglob('*')
+        if path.suffix.lower() in IMAGE_EXTENSIONS
+    )
+    if not images:
+        raise FileNotFoundError(f"No calibration images ({', '.join(IMAGE_EXTENSIONS)}) in {calibration_dir}")
+    if len(images) > max_images:
+        images = [images[i] for i in np.linspace(0, len(images) - 1, max_images).astype(int)]
+    return images
+
+
+def preprocess(image, imgsz: int):
+    """
+    Prepare a BGR image exactly like ultralytics does for a static model
+
+    Args:
+        image: BGR image (numpy array)
+        imgsz: Square model input size
+
+    Returns:
+        (1, 3, imgsz, imgsz) float32 RGB tensor in [0, 1]
+    """
+    from ultralytics.data.augment import LetterBox
+
+    letterboxed = LetterBox((imgsz, imgsz), auto=False)(image=image)
+    chw = letterboxed[..., ::-1].transpose(2, 0, 1)
+    return np.ascontiguousarray(chw)[None].astype(np.float32) / 255.0
+
+
+def _head_nodes_to_exclude(model):
+    # The graph output is produced by the detection head; keep its non-Conv
+    # nodes (DFL decoding, anchors, concat) in FP32
+    output = model.graph.output[0].name
+    producer = next(node for node in model.graph.node if output in node.output)
+    prefix = producer.name.rsplit('/', 1)[0] + '/'
+    return [
+        node.name for node in model.graph.node
+        if node.name.startswith(prefix) and node.op_type != 'Conv'
+    ]
+
+
+def quantize_onnx(fp32_path, int8_path, calibration_dir, imgsz: int = None, max_images: int = None):
+    """
+    Quantize an exported FP32 ONNX detector to INT8
+
+    Args:
+        fp32_path: Static-shape FP32 ONNX model exported by ultralytics
+        int8_path: Output path of the INT8 model
+        calibration_dir: Folder of representative frames
+        imgsz: Model input size (default config.INPUT_SIZE)
+        max_images: Maximum calibration images (default config.CALIBRATION_MAX_IMAGES)
+
+    Returns:
+        Path of the INT8 model
+    """
+    import onnx
+    from onnxruntime.quantization import (CalibrationDataReader, QuantFormat, QuantType,
+                                          quantize_static)
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    imgsz = imgsz or config.INPUT_SIZE
+    images = find_calibration_images(calibration_dir, max_images)
+    print(f"Calibrating INT8 model on {len(images)} image(s) from {calibration_dir}...")
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self, input_name):
+            self.input_name = input_name
+            self.paths = iter(images)
+
+        def get_next(self):
+            for path in self.paths:
+                image = cv2.imread(str(path))
+                if image is not None:
+                    return {self.input_name: preprocess(image, imgsz)}
+            return None
+
+    int8_path = Path(int8_path)
+    with tempfile.TemporaryDirectory(dir=int8_path.parent, prefix=".quantize-") as tmp_dir:
+        prepared = Path(tmp_dir) / "prepared.onnx"
+        quant_pre_process(str(fp32_path), str(prepared))
+
+        model = onnx.load(str(prepared))
+        tmp_output = Path(tmp_dir) / "int8.onnx"
+        quantize_static(
+            str(prepared),
+            str(tmp_output),
+            _Reader(model.graph.input[0].name),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            nodes_to_exclude=_head_nodes_to_exclude(model),
+        )
+        os.replace(tmp_output, int8_path)
+
+    return int8_path
@@ -0,0 +1,209 @@
+"""
+ROI masks and tiled inference helpers for GSE Detection v11
+"""
+
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+def camera_rois(camera: str):
+    """
+    Look up the ROI polygons configured for a camera
+
+    Args:
+        camera: Camera name (key of config.CAMERA_ROIS)
+
+    Returns:
+        List of polygons with normalized (x, y) vertices
+    """
+    if camera not in config.CAMERA_ROIS:
+        known = ", ".join(sorted(config.CAMERA_ROIS)) or "none configured"
+        raise KeyError(f"No ROI configured for camera '{camera}' (known: {known})")
+    return config.CAMERA_ROIS[camera]
+
+
+def rect_roi(x1: float, y1: float, x2: float, y2: float):
+    """
+    Build a rectangular ROI from normalized corner coordinates
+
+    Args:
+        x1, y1: Top-left corner in [0, 1]
+        x2, y2: Bottom-right corner in [0, 1]
+
+    Returns:
+        ROI polygon list holding a single rectangle
+    """
+    if not (0 <= x1 < x2 <= 1 and 0 <= y1 < y2 <= 1):
+        raise ValueError(f"Invalid normalized rectangle: {(x1, y1, x2, y2)}")
+    return [[(x1, y1), (x2, y1), (x2, y2), (x1, y2)]]
+
+
+def _to_pixels(polygons, width: int, height: int):
+    return [
+        np.round(np.asarray(polygon, dtype=np.float64) * (width, height)).astype(np.int32)
+        for polygon in polygons
+    ]
+
+
+def roi_mask(polygons, width: int, height: int):
+    """
+    Rasterize ROI polygons into a binary mask
+
+    Args:
+        polygons: Polygons with normalized (x, y) vertices
+        width: Frame width in pixels
+        height: Frame height in pixels
+
+    Returns:
+        (height, width) uint8 mask, 1 inside the ROI
+    """
+    mask = np.zeros((height, width), dtype=np.uint8)
+    cv2.fillPoly(mask, _to_pixels(polygons, width, height), 1)
+    return mask
+
+
+def roi_bounds(polygons, width: int, height: int):
+    """
+    Pixel bounding rectangle of ROI polygons
+
+    Args:
+        polygons: Polygons with normalized (x, y) vertices
+        width: Frame width in pixels
+        height: Frame height in pixels
+
+    Returns:
+        (x1, y1, x2, y2) clipped to the frame
+    """
+    points = np.concatenate(_to_pixels(polygons, width, height))
+    x1, y1 = points.min(axis=0).clip(0, (width, height))
+    x2, y2 = points.max(axis=0).clip(0, (width, height))
+    return int(x1), int(y1), int(x2), int(y2)
+
+
+def _axis_windows(start: int, end: int, tile: int, overlap: float):
+    span = end - start
+    if span <= tile * (1 + overlap):
+        # A region barely larger than one tile is covered by a single window
+        # (slightly downscaled by the model) rather than two near-identical tiles
+        return [(start, end)]
+    stride = max(1, int(tile * (1 - overlap)))
+    count = int(np.ceil((span - tile) / stride)) + 1
+    # Spread tiles evenly so the overlap is uniform and the last tile ends at the edge
+    starts = np.linspace(start, end - tile, count).round().astype(int)
+    return [(int(s), int(s) + tile) for s in starts]
+
+
+def tile_grid(region, tile_size: int = None, overlap: float = None):
+    """
+    Split a region into overlapping square tiles
+
+    Args:
+        region: (x1, y1, x2, y2) area to cover, in pixels
+        tile_size: Tile edge length (None: one window covering the whole region)
+        overlap: Overlap between neighboring tiles as a fraction of tile_size
+
+    Returns:
+        List of (x1, y1, x2, y2) tile windows, row by row
+    """
+    x1, y1, x2, y2 = region
+    if tile_size is None:
+        return [(x1, y1, x2, y2)]
+
+    overlap = config.TILE_OVERLAP if overlap is None else overlap
+    if not 0 <= overlap < 1:
+        raise ValueError(f"overlap must be in [0, 1), got {overlap}")
+
+    return [
+        (tx1, ty1, tx2, ty2)
+        for ty1, ty2 in _axis_windows(y1, y2, tile_size, overlap)
+        for tx1, tx2 in _axis_windows(x1, x2, tile_size, overlap)
+    ]
+
+
+def roi_tiles(polygons, width: int, height: int, tile_size: int = None, overlap: float = None):
+    """
+    Tiles covering the ROI, dropping tiles that do not touch it
+
+    Args:
+        polygons: Polygons with normalized (x, y) vertices (None: whole frame)
+        width: Frame width in pixels
+        height: Frame height in pixels
+        tile_size: Tile edge length (None: a single window over the ROI bounds)
+        overlap: Overlap between neighboring tiles as a fraction of tile_size
+
+    Returns:
+        (tiles, mask) where mask is None when no ROI is given
+    """
+    if not polygons:
+        return tile_grid((0, 0, width, height), tile_size, overlap), None
+
+    mask = roi_mask(polygons, width, height)
+    tiles = [
+        (x1, y1, x2, y2)
+        for x1, y1, x2, y2 in tile_grid(roi_bounds(polygons, width, height), tile_size, overlap)
+        if mask[y1:y2, x1:x2].any()
+    ]
+    return tiles, mask
+
+
+def merge_tile_boxes(boxes, mask=None, iou_threshold: float = None, nms: bool = True):
+    """
+    Merge detections gathered from several tiles
+
+    Boxes whose center lies outside the ROI mask are dropped, then duplicates
+    from overlapping tiles are suppressed with class-aware NMS.
+
+    Args:
+        boxes: (N, 6) tensor of x1, y1, x2, y2, conf, cls in frame coordinates
+        mask: Optional (H, W) ROI mask
+        iou_threshold: IoU threshold for cross-tile NMS (default from config)
+        nms: Run cross-tile NMS (not needed for a single tile, which the
+            model has already suppressed)
+
+    Returns:
+        (M, 6) tensor (sorted by descending confidence when nms is True)
+    """
+    if len(boxes) == 0:
+        return boxes
+    # Imported here so that ROI helpers do not pull torch into CLI startup
+    import torch
+    from torchvision.ops import batched_nms
+
+    iou = config.IOU_THRESHOLD if iou_threshold is None else iou_threshold
+
+    if mask is not None:
+        height, width = mask.shape
+        centers = ((boxes[:, :2] + boxes[:, 2:4]) / 2).cpu().numpy()
+        cx = centers[:, 0].astype(np.int64).clip(0, width - 1)
+        cy = centers[:, 1].astype(np.int64).clip(0, height - 1)
+        boxes = boxes[torch.from_numpy(mask[cy, cx].astype(bool)).to(boxes.device)]
+
+    if not nms:
+        return boxes
+    keep = batched_nms(boxes[:, :4], boxes[:, 4], boxes[:, 5].long(), iou)
+    return boxes[keep]
+
+
+def draw_roi(image, polygons, color=(0, 255, 255), thickness: int = 2):
+    """
+    Outline ROI polygons on an image in place
+
+    Args:
+        image: BGR image
+        polygons: Polygons with normalized (x, y) vertices
+        color: BGR line color
+        thickness: Line thickness
+
+    Returns:
+        The same image
+    """
+    height, width = image.shape[:2]
+    cv2.polylines(image, _to_pixels(polygons, width, height), True, color, thickness)
+    return image
@@ -0,0 +1,426 @@
+"""
+Columnar binary track store for GSE Detection v11
+
+A store is a directory (``<name>.tracks``) holding typed NumPy columns split
+into chunks of consecutive frames:
+
+    video_01.tracks/
+    ├── meta.json                 # column dtypes and per-chunk frame ranges
+    ├── chunk_000000/
+    │   ├── frame.npy             # int32   (N,)
+    │   ├── id.npy                # int32   (N,)
+    │   ├── bbox.npy              # float32 (N, 4) top-left x, y, width, height
+    │   ├── conf.npy              # float32 (N,)
+    │   └── cls.npy               # int16   (N,)
+    └── chunk_000001/ ...
+
+Every column is a plain ``.npy`` file, so readers can memory-map one column of
+one time window without touching the rest of the store.
+
+Usage:
+    python -m utils.track_store to-columnar video_01_gt.txt [video_01_gt.tracks]
+    python -m utils.track_store to-mot video_01_gt.tracks [video_01_gt.txt]
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.mot_io import format_mot_rows, read_mot, xywh_to_tlwh
+
+
+FORMAT_NAME = "gse-tracks"
+FORMAT_VERSION = 1
+
+COLUMNS = {
+    'frame': np.int32,
+    'id': np.int32,
+    'bbox': np.float32,
+    'conf': np.float32,
+    'cls': np.int16,
+}
+
+# Largest error float32 storage may introduce before 2-decimal MOT text would
+# no longer round-trip exactly
+_MOT_ROUNDTRIP_TOLERANCE = 0.005
+
+
+def _chunk_name(chunk_idx: int):
+    return f"chunk_{chunk_idx:06d}"
+
+
+class TrackStoreWriter:
+    """
+    Write tracks into a chunked columnar store, one frame at a time
+    """
+
+    def __init__(self, path, chunk_frames: int = None, state: dict = None):
+        """
+        Create (or overwrite) a store, or reopen one to continue writing
+
+        Args:
+            path: Store directory (conventionally ``*.tracks``)
+            chunk_frames: Frames per chunk (default from config)
+            state: Snapshot from state() to continue an interrupted store;
+                chunks written after the snapshot are discarded
+        """
+        self.path = Path(path)
+        self.chunk_frames = chunk_frames or config.TRACK_CHUNK_FRAMES
+        self.rows_written = 0
+
+        self._chunks = []
+        self._chunk_idx = None
+        self._pending = {name: [] for name in COLUMNS}
+        self._last_frame = 0
+        self._closed = False
+
+        if state is None:
+            if self.path.exists():
+                shutil.rmtree(self.path)
+            self.path.mkdir(parents=True)
+            return
+
+        self.chunk_frames = state['chunk_frames']
+        self.rows_written = state['rows_written']
+        self._chunks = list(state['chunks'])
+        self._chunk_idx = state['chunk_idx']
+        self._pending = {name: list(values) for name, values in state['pending'].items()}
+        self._last_frame = state['last_frame']
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        kept = {chunk['name'] for chunk in self._chunks}
+        for chunk_dir in self.path.glob("chunk_*"):
+            if chunk_dir.name not in kept:
+                shutil.rmtree(chunk_dir)
+        self._write_meta()
+
+    def state(self):
+        """
+        Snapshot the writer so an interrupted run can continue the store
+
+        Returns:
+            Picklable dict accepted by the ``state`` constructor argument
+        """
+        return {
+            'chunk_frames': self.chunk_frames,
+            'rows_written': self.rows_written,
+            'chunks': [dict(chunk) for chunk in self._chunks],
+            'chunk_idx': self._chunk_idx,
+            'pending': {name: [np.array(v) for v in values] for name, values in self._pending.items()},
+            'last_frame': self._last_frame,
+        }
+
+    def write_frame(self, frame_idx: int, xywh, track_ids, confidences, class_ids):
+        """
+        Append all objects of one frame (same arguments as MOTWriter.write_frame)
+
+        Args:
+            frame_idx: Frame number (1-based, MOT standard)
+            xywh: (N, 4) array of center x, center y, width, height
+            track_ids: (N,) array of track IDs
+            confidences: (N,) array of confidences
+            class_ids: (N,) array of class IDs
+
+        Returns:
+            Number of rows written for the frame
+        """
+        n = len(xywh)
+        if n == 0:
+            return 0
+        self.write_rows(np.full(n, frame_idx), track_ids,
+                        xywh_to_tlwh(np.asarray(xywh, dtype=np.float32)),
+                        confidences, class_ids)
+        return n
+
+    def write_rows(self, frame_ids, track_ids, tlwh, confidences, class_ids):
+        """
+        Append rows sorted by frame number
+
+        Args:
+            frame_ids: (N,) array of frame numbers (1-based, non-decreasing)
+            track_ids: (N,) array of track IDs
+            tlwh: (N, 4) array of top-left x, top-left y, width, height
+            confidences: (N,) array of confidences
+            class_ids: (N,) array of class IDs
+        """
+        frame_ids = np.asarray(frame_ids, dtype=np.int64)
+        if len(frame_ids) == 0:
+            return
+        if frame_ids[0] < self._last_frame or np.any(np.diff(frame_ids) < 0):
+            raise ValueError("Rows must be written in non-decreasing frame order")
+        if frame_ids[0] < 1:
+            raise ValueError(f"Frame numbers start at 1, got {frame_ids[0]}")
+
+        columns = {
+            'frame': frame_ids,
+            'id': np.asarray(track_ids),
+            'bbox': np.asarray(tlwh).reshape(-1, 4),
+            'conf': np.asarray(confidences),
+            'cls': np.asarray(class_ids),
+        }
+
+        # Split the rows at chunk boundaries
+        chunk_ids = (frame_ids - 1) // self.chunk_frames
+        bounds = np.flatnonzero(np.diff(chunk_ids)) + 1
+        for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(frame_ids)]):
+            chunk_idx = int(chunk_ids[start])
+            if chunk_idx != self._chunk_idx:
+                self._flush_chunk()
+                self._chunk_idx = chunk_idx
+            for name, values in columns.items():
+                self._pending[name].append(values[start:end])
+
+        self._last_frame = int(frame_ids[-1])
+        self.rows_written += len(frame_ids)
+
+    def _flush_chunk(self):
+        if self._chunk_idx is None or not self._pending['frame']:
+            return
+
+        name = _chunk_name(self._chunk_idx)
+        chunk_dir = self.path / name
+        chunk_dir.mkdir(exist_ok=True)
+
+        for column, dtype in COLUMNS.items():
+            values = np.concatenate(self._pending[column]).astype(dtype, copy=False)
+            np.save(chunk_dir / f"{column}.npy", values)
+
+        frames = np.concatenate(self._pending['frame'])
+        self._chunks.append({
+            'name': name,
+            'first_frame': int(frames[0]),
+            'last_frame': int(frames[-1]),
+            'rows': int(len(frames)),
+        })
+        self._pending = {column: [] for column in COLUMNS}
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'chunk_frames': self.chunk_frames,
+            'columns': {name: np.dtype(dtype).name for name, dtype in COLUMNS.items()},
+            'bbox': 'tlwh',
+            'rows': sum(chunk['rows'] for chunk in self._chunks),
+            'chunks': self._chunks,
+        }
+        tmp_path = self.path / "meta.json.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp_path, self.path / "meta.json")
+
+    def close(self):
+        """Write the last chunk and the metadata"""
+        if self._closed:
+            return
+        self._flush_chunk()
+        self._write_meta()
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TrackStore:
+    """
+    Read a columnar track store, optionally memory-mapped
+    """
+
+    def __init__(self, path, mmap: bool = True):
+        """
+        Open store
+
+        Args:
+            path: Store directory
+            mmap: Memory-map columns instead of reading them into memory
+        """
+        self.path = Path(path)
+        self.mmap = mmap
+
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Not a track store (missing meta.json): {self.path}")
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != FORMAT_NAME:
+            raise ValueError(f"Unknown track store format: {self.meta.get('format')}")
+
+        self.chunks = self.meta['chunks']
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def _load(self, chunk, column):
+        return np.load(self.path / chunk['name'] / f"{column}.npy",
+                       mmap_mode='r' if self.mmap else None)
+
+    def iter_chunks(self, columns=None, frame_range=None):
+        """
+        Iterate over chunks overlapping a frame window
+
+        Args:
+            columns: Column names to load (default: all)
+            frame_range: Inclusive (first_frame, last_frame), or None for all
+
+        Yields:
+            Dict of column name -> array, restricted to the frame window
+        """
+        columns = list(columns or COLUMNS)
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise KeyError(f"Unknown columns: {sorted(unknown)}")
+
+        for chunk in self.chunks:
+            if frame_range is not None:
+                first, last = frame_range
+                if chunk['last_frame'] < first or chunk['first_frame'] > last:
+                    continue
+
+            rows = slice(None)
+            if frame_range is not None and (chunk['first_frame'] < first or chunk['last_frame'] > last):
+                frames = self._load(chunk, 'frame')
+                rows = slice(int(np.searchsorted(frames, first, side='left')),
+                             int(np.searchsorted(frames, last, side='right')))
+
+            yield {column: self._load(chunk, column)[rows] for column in columns}
+
+    def read(self, columns=None, frame_range=None):
+        """
+        Read columns of a frame window into contiguous arrays
+
+        Args:
+            columns: Column names to load (default: all)
+            frame_range: Inclusive (first_frame, last_frame), or None for all
+
+        Returns:
+            Dict of column name -> array
+        """
+        columns = list(columns or COLUMNS)
+        parts = {column: [] for column in columns}
+        for chunk in self.iter_chunks(columns, frame_range):
+            for column in columns:
+                parts[column].append(chunk[column])
+
+        result = {}
+        for column in columns:
+            if parts[column]:
+                result[column] = np.concatenate(parts[column])
+            else:
+                shape = (0, 4) if column == 'bbox' else (0,)
+                result[column] = np.empty(shape, dtype=COLUMNS[column])
+        return result
+
+    def column(self, name: str, frame_range=None):
+        """
+        Read a single column of a frame window
+
+        Args:
+            name: Column name ('frame', 'id', 'bbox', 'conf' or 'cls')
+            frame_range: Inclusive (first_frame, last_frame), or None for all
+
+        Returns:
+            Array of the column values
+        """
+        return self.read([name], frame_range)[name]
+
+
+def mot_to_store(mot_path, store_path=None, chunk_frames: int = None):
+    """
+    Convert a MOT Challenge text file into a columnar track store
+
+    Args:
+        mot_path: Input MOT text file
+        store_path: Output store directory (default: ``<mot stem>.tracks``)
+        chunk_frames: Frames per chunk (default from config)
+
+    Returns:
+        Path of the store
+
+    Raises:
+        ValueError: If the file cannot be stored losslessly (placeholder columns
+            other than -1, rows not sorted by frame, or coordinates too large
+            for float32 to keep two decimals)
+    """
+    mot_path = Path(mot_path)
+    store_path = Path(store_path) if store_path else mot_path.with_suffix('.tracks')
+
+    mot = read_mot(mot_path)
+    if np.any(mot['extra'] != -1):
+        raise ValueError(f"{mot_path}: columns 9-10 must be -1 to convert losslessly")
+
+    order = np.argsort(mot['frame'], kind='stable')
+    if np.any(order != np.arange(len(order))):
+        raise ValueError(f"{mot_path}: rows are not sorted by frame")
+
+    for column, values in (('bbox', mot['tlwh']), ('conf', mot['conf'])):
+        if len(values) and np.max(np.abs(values.astype(np.float32) - values)) >= _MOT_ROUNDTRIP_TOLERANCE:
+            raise ValueError(f"{mot_path}: '{column}' values exceed float32 precision for 2 decimals")
+
+    with TrackStoreWriter(store_path, chunk_frames=chunk_frames) as writer:
+        writer.write_rows(mot['frame'], mot['id'], mot['tlwh'], mot['conf'], mot['cls'])
+
+    return store_path
+
+
+def store_to_mot(store_path, mot_path=None):
+    """
+    Convert a columnar track store back into MOT Challenge text
+
+    Args:
+        store_path: Input store directory
+        mot_path: Output MOT text file (default: ``<store stem>.txt``)
+
+    Returns:
+        Path of the MOT file
+    """
+    store_path = Path(store_path)
+    mot_path = Path(mot_path) if mot_path else store_path.with_suffix('.txt')
+
+    store = TrackStore(store_path)
+    with open(mot_path, 'w') as f:
+        for chunk in store.iter_chunks():
+            f.write(format_mot_rows(chunk['frame'], chunk['id'], chunk['bbox'],
+                                    chunk['conf'], chunk['cls']))
+
+    return mot_path
+
+
+def main():
+    """Command line converter between MOT text and the columnar store"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert between MOT Challenge text and the columnar track store"
+    )
+    parser.add_argument('direction', choices=['to-columnar', 'to-mot'],
+                        help='Conversion direction')
+    parser.add_argument('input', type=str, help='Input MOT file or *.tracks directory')
+    parser.add_argument('output', type=str, nargs='?', default=None,
+                        help='Output path (default: input with .tracks / .txt suffix)')
+    parser.add_argument('--chunk-frames', type=int, default=None,
+                        help=f'Frames per chunk (default: {config.TRACK_CHUNK_FRAMES})')
+
+    args = parser.parse_args()
+
+    if args.direction == 'to-columnar':
+        output = mot_to_store(args.input, args.output, chunk_frames=args.chunk_frames)
+    else:
+        output = store_to_mot(args.input, args.output)
+
+    print(f"✅ Written: {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Frame-by-frame tracking utilities for GSE Detection v11
+"""
+
+import pickle
+from pathlib import Path
+import sys
+
+import numpy as np
+import yaml
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.instrumentation import METRICS
+
+
+# tracker_cfg value selecting the project's vectorized ByteTrack (utils/bytetrack.py,
+# parameters from config.py) instead of an ultralytics tracker config
+NATIVE_TRACKER = "native"
+
+
+class FrameTracker:
+    """
+    YOLO detection + ByteTrack association driven one decoded frame at a time
+
+    Produces the same tracks as ``model.track(source=video, persist=True)``, but
+    the caller owns the decoding loop (so it can seek) and the tracker state can
+    be snapshotted and restored to continue a video with consistent track IDs.
+
+    With a MotionGate, frames without motion skip both the model and the
+    tracker update and re-emit the previous frame's tracks.
+
+    Detections can be recorded for utils.det_cache (the model then runs at the
+    cache's lower floor and only boxes above conf_threshold are tracked), and
+    cached detections can be replayed instead of running the model.
+    """
+
+    def __init__(self, model, conf_threshold: float = 0.1, tracker_cfg: str = "bytetrack.yaml",
+                 gate=None, detections=None, recorder=None, classes=None):
+        """
+        Initialize tracker
+
+        Args:
+            model: Loaded ultralytics YOLO model
+            conf_threshold: Detection confidence threshold
+            tracker_cfg: Ultralytics tracker config (name or path), or NATIVE_TRACKER
+                for utils.bytetrack.ByteTracker with the config.py parameters
+            gate: Optional utils.motion.MotionGate deciding which frames to infer
+            detections: utils.det_cache.CachedDetections replayed instead of running
+                the model (the frames passed to update are then ignored and may be None)
+            recorder: utils.det_cache.DetectionRecorder receiving every inferred
+                frame's detections above recorder.conf_floor
+            classes: Class IDs to detect and track (None: all); other classes
+                are dropped inside inference, before NMS
+        """
+        self.model = model
+        self.conf_threshold = conf_threshold
+        self.tracker_cfg = tracker_cfg
+        self.tracker = self._build_tracker(tracker_cfg)
+        self.gate = gate
+        self.detections = detections
+        self.recorder = recorder
+        self.classes = classes
+        self._frame_idx = 0
+        self._last_tracks = None
+
+    @staticmethod
+    def _build_tracker(tracker_cfg):
+        if tracker_cfg == NATIVE_TRACKER:
+            from utils.bytetrack import ByteTracker
+            return ByteTracker()
+
+        from ultralytics.trackers.byte_tracker import BYTETracker
+        from ultralytics.utils import IterableSimpleNamespace
+        from ultralytics.utils.checks import check_yaml
+
+        with open(check_yaml(tracker_cfg)) as f:
+            args = IterableSimpleNamespace(**yaml.safe_load(f))
+        return BYTETracker(args=args)
+
+    def update(self, frame):
+        """
+        Detect objects in a frame and associate them with existing tracks
+
+        Args:
+            frame: BGR image (numpy array; None when replaying cached detections)
+
+        Returns:
+            (xywh, track_ids, confidences, class_ids) arrays of the confirmed
+            tracks in this frame, or None when there are none
+        """
+        self._frame_idx += 1
+        if self.gate is not None:
+            with METRICS.timer('gating'):
+                infer = self.gate.should_infer(frame)
+            if not infer:
+                if self.recorder is not None:
+                    self.recorder.skip()
+                # Static scene: keep the tracker clock still and propagate the tracks
+                return self._last_tracks
+
+        self._last_tracks = self._track(frame)
+        return self._last_tracks
+
+    def _detect(self, frame):
+        """Boxes of a frame above conf_threshold (NumPy ultralytics Boxes) and the frame size"""
+        if self.detections is not None:
+            from ultralytics.engine.results import Boxes
+
+            xyxy, conf, cls = self.detections.frame_detections(self._frame_idx, self.conf_threshold)
+            shape = (self.detections.height, self.detections.width)
+            return Boxes(np.column_stack([xyxy, conf, cls]).astype(np.float32), shape), shape
+
+        predict_conf = self.conf_threshold if self.recorder is None else self.recorder.conf_floor
+        result = self.model.predict(frame, conf=predict_conf, classes=self.classes, verbose=False)[0]
+        METRICS.record_speed([result])
+        METRICS.count('inferred_frames')
+
+        boxes = result.boxes.cpu().numpy()
+        if self.recorder is not None:
+            self.recorder.add(boxes.xyxy, boxes.conf, boxes.cls)
+            # Same boxes predict(conf=conf_threshold) keeps: NMS never lets a
+            # lower-scored box suppress a higher-scored one
+            boxes = boxes[boxes.conf > self.conf_threshold]
+        return boxes, frame.shape[:2]
+
+    def _track(self, frame):
+        boxes, (height, width) = self._detect(frame)
+
+        with METRICS.timer('tracking'):
+            if self.tracker_cfg == NATIVE_TRACKER:
+                tracks = self.tracker.update(boxes.xyxy, boxes.conf, boxes.cls)
+            else:
+                tracks = self.tracker.update(boxes, frame)
+        if len(tracks) == 0:
+            return None
+
+        # Rows: x1, y1, x2, y2, track_id, score, cls, detection index.
+        # Kalman-predicted boxes may leave the image; clip like Results.update does
+        xyxy = tracks[:, :4].copy()
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, width)
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, height)
+        xywh = np.empty_like(xyxy)
+        xywh[:, :2] = (xyxy[:, :2] + xyxy[:, 2:]) / 2
+        xywh[:, 2:] = xyxy[:, 2:] - xyxy[:, :2]
+
+        return (
+            xywh,
+            tracks[:, 4].astype(np.int32),
+            tracks[:, 5],
+            tracks[:, 6].astype(np.int32),
+        )
+
+    def state_dict(self):
+        """
+        Snapshot the tracker state
+
+        Returns:
+            Opaque bytes accepted by load_state_dict
+        """
+        from ultralytics.trackers.basetrack import BaseTrack
+
+        return pickle.dumps({
+            'tracker_cfg': self.tracker_cfg,
+            'tracker': self.tracker,
+            # Older ultralytics releases draw track IDs from a class-level counter
+            'track_count': getattr(BaseTrack, '_count', None),
+            'gate': self.gate,
+            'frame_idx': self._frame_idx,
+            'last_tracks': self._last_tracks,
+        })
+
+    def load_state_dict(self, state: bytes):
+        """
+        Restore a snapshot taken by state_dict
+
+        Args:
+            state: Bytes returned by state_dict
+        """
+        from ultralytics.trackers.basetrack import BaseTrack
+
+        snapshot = pickle.loads(state)
+        if snapshot['tracker_cfg'] != self.tracker_cfg:
+            raise ValueError(
+                f"Snapshot was taken with tracker '{snapshot['tracker_cfg']}', not '{self.tracker_cfg}'"
+            )
+        self.tracker = snapshot['tracker']
+        if (snapshot['gate'] is None) != (self.gate is None):
+            raise ValueError("Snapshot and tracker disagree on motion gating")
+        self.gate = snapshot['gate']
+        self._frame_idx = snapshot.get('frame_idx', 0)
+        self._last_tracks = snapshot['last_tracks']
+        if snapshot['track_count'] is not None:
+            BaseTrack._count = snapshot['track_count']
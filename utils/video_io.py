@@ -0,0 +1,339 @@
+"""
+Video decoding for GSE Detection v11
+
+Wraps the available decoders behind one cv2.VideoCapture-like interface:
+
+- "opencv": cv2.VideoCapture, decoding into a ring of preallocated frame
+  buffers instead of a new array per frame, optionally with FFmpeg hardware
+  decoding (falls back to software when no device is available)
+- "pyav": FFmpeg through PyAV (optional dependency) with frame-threaded codec
+  decoding; scaling and the YUV->BGR conversion happen in one swscale pass
+
+Both can decode straight to the model input resolution (longest side
+max_side, same size and interpolation ultralytics' letterbox would produce),
+which skips the full-size resize inside predict. Detections are then in the
+decoded frame's coordinates; VideoReader.scale maps them back.
+"""
+
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+
+def available_backends():
+    """
+    Decoders usable in this environment
+
+    Returns:
+        List of backend names ('opencv' always, 'pyav' when PyAV is installed)
+    """
+    backends = ["opencv"]
+    try:
+        import av  # noqa: F401
+        backends.append("pyav")
+    except ImportError:
+        pass
+    return backends
+
+
+def decode_size(width: int, height: int, max_side: int = None):
+    """
+    Frame size after scaling the longest side down to max_side
+
+    Uses the same rounding as ultralytics' letterbox, so a frame decoded at
+    this size is fed to the model without another resize.
+
+    Args:
+        width: Source width
+        height: Source height
+        max_side: Longest side after scaling (None: keep source size; never upscales)
+
+    Returns:
+        (width, height)
+    """
+    if not max_side or max(width, height) <= max_side:
+        return width, height
+    ratio = max_side / max(width, height)
+    return int(round(width * ratio)), int(round(height * ratio))
+
+
+class FramePool:
+    """
+    Ring of preallocated frame buffers
+
+    A buffer handed out by next() is reused after `size` further calls, so
+    callers must be done with a frame (or copy it) by then.
+    """
+
+    def __init__(self, shape, size: int, dtype=np.uint8):
+        """
+        Allocate buffers
+
+        Args:
+            shape: Frame shape (height, width, channels)
+            size: Number of buffers
+            dtype: Buffer dtype
+        """
+        self.buffers = [np.empty(shape, dtype=dtype) for _ in range(size)]
+        self._next = 0
+
+    def next(self):
+        """Return the next buffer in the ring"""
+        buffer = self.buffers[self._next]
+        self._next = (self._next + 1) % len(self.buffers)
+        return buffer
+
+
+class VideoReader:
+    """
+    Common interface of the decoders (subset of cv2.VideoCapture)
+
+    Attributes:
+        source_width, source_height: Encoded frame size
+        width, height: Size of the returned frames
+        scale: width / source_width (1.0 unless decoding to a smaller size)
+        fps: Frame rate
+        frame_count: Frames reported by the container (may be approximate)
+    """
+
+    backend = None
+
+    def __init__(self, source, max_side: int = None, pool_size: int = None):
+        self.source = str(source)
+        self.max_side = max_side
+        self.pool_size = config.DECODE_POOL_SIZE if pool_size is None else pool_size
+        self.position = 0  # frames returned so far
+
+    def _init_size(self, width, height):
+        self.source_width, self.source_height = width, height
+        self.width, self.height = decode_size(width, height, self.max_side)
+        self.scale = self.width / width if width else 1.0
+        self._pool = (FramePool((self.height, self.width, 3), self.pool_size)
+                      if self.pool_size else None)
+
+    def _buffer(self):
+        return self._pool.next() if self._pool is not None else None
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        """
+        Decode the next frame
+
+        Returns:
+            (ok, frame) like cv2.VideoCapture.read; with a pool the frame is
+            overwritten after pool_size further reads
+        """
+        raise NotImplementedError
+
+    def grab(self):
+        """Decode and discard the next frame, returns success"""
+        return self.read()[0]
+
+    def get(self, prop):
+        """
+        cv2.VideoCapture.get for the common properties
+
+        Args:
+            prop: cv2.CAP_PROP_FRAME_COUNT, _FPS, _FRAME_WIDTH, _FRAME_HEIGHT or _POS_FRAMES
+
+        Returns:
+            Property value (frame size is the decoded size), 0.0 if unsupported
+        """
+        values = {
+            cv2.CAP_PROP_FRAME_COUNT: self.frame_count,
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_FRAME_WIDTH: self.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+            cv2.CAP_PROP_POS_FRAMES: self.position,
+        }
+        return float(values.get(prop, 0.0))
+
+    def set(self, prop, value):
+        """Seeking is not supported by default; returns False like cv2"""
+        return False
+
+    def release(self):
+        """Close the decoder"""
+
+    def __iter__(self):
+        while True:
+            ok, frame = self.read()
+            if not ok:
+                return
+            yield frame
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class OpenCVReader(VideoReader):
+    """
+    cv2.VideoCapture decoding into reusable buffers
+    """
+
+    backend = "opencv"
+
+    def __init__(self, source, max_side: int = None, pool_size: int = None, hw_accel: bool = None):
+        """
+        Open video
+
+        Args:
+            source: Video file or stream URL
+            max_side: Decode to this longest side (None: source size)
+            pool_size: Reused frame buffers (default config.DECODE_POOL_SIZE; 0: new array per frame)
+            hw_accel: Request FFmpeg hardware decoding (default config.DECODE_HW_ACCEL)
+
+        Raises:
+            IOError: The video cannot be opened
+        """
+        super().__init__(source, max_side, pool_size)
+        hw_accel = config.DECODE_HW_ACCEL if hw_accel is None else hw_accel
+        if hw_accel and hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            self._cap = cv2.VideoCapture(self.source, cv2.CAP_FFMPEG,
+                                         [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        else:
+            self._cap = cv2.VideoCapture(self.source)
+        if not self._cap.isOpened():
+            raise IOError(f"Failed to open video: {source}")
+
+        self.fps = self._cap.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._init_size(int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                        int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.resized = (self.width, self.height) != (self.source_width, self.source_height)
+        # Full-size decode target when the pooled frames are downscaled copies
+        self._scratch = None
+
+    def read(self):
+        if not self.resized:
+            ok, frame = self._cap.read(self._buffer())
+        else:
+            ok, self._scratch = self._cap.read(self._scratch)
+            frame = None
+            if ok:
+                # INTER_LINEAR: the interpolation letterbox would apply
+                frame = cv2.resize(self._scratch, (self.width, self.height), dst=self._buffer(),
+                                   interpolation=cv2.INTER_LINEAR)
+        if ok:
+            self.position += 1
+        return ok, frame
+
+    def grab(self):
+        ok = self._cap.grab()
+        if ok:
+            self.position += 1
+        return ok
+
+    def set(self, prop, value):
+        ok = self._cap.set(prop, value)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(self._cap.get(cv2.CAP_PROP_POS_FRAMES))
+        return ok
+
+    def get(self, prop):
+        if prop in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT, cv2.CAP_PROP_POS_FRAMES):
+            return super().get(prop)
+        return self._cap.get(prop)
+
+    def release(self):
+        self._cap.release()
+
+
+class PyAVReader(VideoReader):
+    """
+    FFmpeg decoding through PyAV with codec frame threading
+    """
+
+    backend = "pyav"
+
+    def __init__(self, source, max_side: int = None, pool_size: int = None, threads: int = None):
+        """
+        Open video
+
+        Args:
+            source: Video file or stream URL
+            max_side: Decode to this longest side (None: source size)
+            pool_size: Unused (PyAV allocates the converted frame itself); kept
+                for a uniform signature
+            threads: Codec threads (default config.DECODE_THREADS; 0: FFmpeg picks)
+
+        Raises:
+            ImportError: PyAV is not installed
+            IOError: The video cannot be opened
+        """
+        import av
+
+        super().__init__(source, max_side, 0)
+        try:
+            self._container = av.open(self.source)
+            self._stream = self._container.streams.video[0]
+        except (av.FFmpegError, IndexError) as e:
+            raise IOError(f"Failed to open video: {source} ({e})")
+        self._error = av.FFmpegError
+
+        # Decode several frames in parallel (the default decodes on one thread)
+        self._stream.thread_type = "AUTO"
+        threads = config.DECODE_THREADS if threads is None else threads
+        if threads:
+            self._stream.codec_context.thread_count = threads
+
+        rate = self._stream.average_rate or self._stream.guessed_rate
+        self.fps = float(rate) if rate else 0.0
+        self.frame_count = self._stream.frames
+        self._init_size(self._stream.codec_context.width, self._stream.codec_context.height)
+        self._frames = self._container.decode(self._stream)
+
+    def read(self):
+        try:
+            frame = next(self._frames)
+        except (StopIteration, self._error):
+            return False, None
+        image = frame.to_ndarray(width=self.width, height=self.height, format='bgr24',
+                                 interpolation='FAST_BILINEAR')
+        self.position += 1
+        return True, image
+
+    def release(self):
+        self._container.close()
+
+
+def open_video(source, backend: str = None, max_side: int = None, pool_size: int = None):
+    """
+    Open a video with the configured decoder
+
+    Args:
+        source: Video file or stream URL
+        backend: 'opencv', 'pyav' or 'auto' (pyav when installed; default config.DECODE_BACKEND)
+        max_side: Decode to this longest side, e.g. config.INPUT_SIZE (None: source size)
+        pool_size: Reused frame buffers (default config.DECODE_POOL_SIZE; 0 allocates
+            a new array per frame, needed when frames are kept beyond pool_size reads)
+
+    Returns:
+        VideoReader
+
+    Raises:
+        IOError: The video cannot be opened
+        ValueError: Unknown or unavailable backend
+    """
+    backend = backend or config.DECODE_BACKEND
+    if backend == "auto":
+        backend = available_backends()[-1]
+    if backend == "opencv":
+        return OpenCVReader(source, max_side, pool_size)
+    if backend == "pyav":
+        if "pyav" not in available_backends():
+            raise ValueError("Decode backend 'pyav' requires PyAV (pip install av)")
+        return PyAVReader(source, max_side, pool_size)
+    raise ValueError(f"Unknown decode backend '{backend}' (choose from opencv, pyav, auto)")
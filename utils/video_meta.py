@@ -0,0 +1,181 @@
+"""
+Video metadata probe with an on-disk cache for GSE Detection v11
+
+Container headers are not always right: .webm files in particular often
+report a wrong CAP_PROP_FRAME_COUNT, which breaks progress ETAs and the
+seqLength written to seqinfo.ini. The probe reads metadata from the reader
+that is about to decode the video (no second open), and after a full pass
+the decoded frame count replaces the header value. Entries are keyed by
+resolved path and invalidated when the file's size or mtime changes.
+"""
+
+from collections import namedtuple
+from pathlib import Path
+import sys
+import threading
+
+import cv2
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+from utils.jsonl_index import JsonlIndex
+
+
+# frame_count is exact once a full decode pass has counted the frames
+VideoInfo = namedtuple('VideoInfo', 'width height fps frame_count exact')
+
+
+def _file_key(video_path):
+    path = Path(video_path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_size, stat.st_mtime_ns
+
+
+class VideoMetaCache:
+    """
+    Index of video metadata, shared by runs (and worker processes)
+
+    Stored as an append-only JSON-lines file (utils.jsonl_index): parsed once
+    per process, one appended line per saved video.
+    """
+
+    def __init__(self, path=None):
+        """
+        Open index
+
+        Args:
+            path: Index file (default config.VIDEO_META_CACHE; created on first save)
+        """
+        self.path = Path(path or config.VIDEO_META_CACHE)
+        self._index = JsonlIndex(self.path)
+        self._lock = threading.Lock()
+        # Probed but not yet saved (written once the decode pass has counted the frames)
+        self._pending = {}
+
+    def get(self, video_path):
+        """
+        Cached metadata of a video
+
+        Args:
+            video_path: Video file
+
+        Returns:
+            VideoInfo, or None when not cached or the file changed since
+        """
+        key, size, mtime = _file_key(video_path)
+        with self._lock:
+            entry = self._pending.get(key)
+        if entry is None or entry['size'] != size or entry['mtime_ns'] != mtime:
+            entry = self._index.get(key)
+        if entry is None or entry['size'] != size or entry['mtime_ns'] != mtime:
+            return None
+        return VideoInfo(entry['width'], entry['height'], entry['fps'], entry['frame_count'],
+                         entry['exact'])
+
+    def put(self, video_path, info: VideoInfo, save: bool = True):
+        """
+        Store metadata of a video
+
+        Args:
+            video_path: Video file
+            info: Its metadata
+            save: Append it to the index file now (False: keep it in memory
+                until save())
+        """
+        key, size, mtime = _file_key(video_path)
+        entry = dict(info._asdict(), size=size, mtime_ns=mtime)
+        with self._lock:
+            if not save:
+                self._pending[key] = entry
+                return
+            self._pending.pop(key, None)
+        self._index.put(key, entry)
+
+    def save(self):
+        """Append the entries stored with save=False to the index file"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for key, entry in pending.items():
+            self._index.put(key, entry)
+
+
+_CACHE = None
+
+
+def default_cache():
+    """
+    Process-wide cache at config.VIDEO_META_CACHE
+
+    Returns:
+        VideoMetaCache, or None when config.VIDEO_META_CACHE is empty (caching disabled)
+    """
+    global _CACHE
+    if not config.VIDEO_META_CACHE:
+        return None
+    if _CACHE is None or _CACHE.path != Path(config.VIDEO_META_CACHE):
+        _CACHE = VideoMetaCache()
+    return _CACHE
+
+
+def probe_video(video_path, cap=None, cache=None):
+    """
+    Metadata of a video, from the cache or the open reader
+
+    Args:
+        video_path: Video file
+        cap: Reader already opened on the video at source resolution (VideoReader
+            or cv2.VideoCapture); opened and closed here only when not given and not cached
+        cache: VideoMetaCache (default: default_cache())
+
+    Returns:
+        VideoInfo (frame_count from the container header unless exact)
+
+    Raises:
+        IOError: Not cached and the video cannot be opened
+    """
+    cache = cache or default_cache()
+    if cache is not None:
+        info = cache.get(video_path)
+        if info is not None:
+            return info
+
+    own_cap = cap is None
+    if own_cap:
+        cap = cv2.VideoCapture(str(video_path))
+        if not cap.isOpened():
+            raise IOError(f"Failed to open video: {video_path}")
+    try:
+        info = VideoInfo(int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                         cap.get(cv2.CAP_PROP_FPS), int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), False)
+    finally:
+        if own_cap:
+            cap.release()
+
+    if cache is not None:
+        # Saved by record_frame_count() after the decode pass, in one write
+        cache.put(video_path, info, save=False)
+    return info
+
+
+def record_frame_count(video_path, frame_count: int, cache=None):
+    """
+    Store the frame count measured by a full decode pass
+
+    Args:
+        video_path: Video file
+        frame_count: Frames decoded until the end of the stream
+        cache: VideoMetaCache (default: default_cache())
+
+    Returns:
+        Updated VideoInfo (None when caching is disabled)
+    """
+    cache = cache or default_cache()
+    if cache is None:
+        return None
+    info = probe_video(video_path, cache=cache)
+    if info.exact and info.frame_count == frame_count:
+        return info
+    info = info._replace(frame_count=frame_count, exact=True)
+    cache.put(video_path, info)
+    return info